@@ -414,8 +414,9 @@ class PersonalAssistantCLI:
                     contact.remove_address()
                     self.print_success("Адресу видалено")
             
-            # Зберігаємо зміни
-            self.contact_manager.save_contacts()
+            # Зберігаємо зміни лише цього контакту
+            self.contact_manager.mark_dirty(contact.name.value)
+            self.contact_manager.flush()
             self.print_success("Контакт успішно оновлено!")
             print(f"\n{contact}")
             
@@ -649,8 +650,9 @@ class PersonalAssistantCLI:
                 
                 self.print_success("Теги оновлено")
             
-            # Зберігаємо зміни
-            self.note_manager.save_notes()
+            # Зберігаємо зміни лише цієї нотатки
+            self.note_manager.mark_dirty(note)
+            self.note_manager.flush()
             self.print_success("Нотатку успішно оновлено!")
             
         except ValueError as e:
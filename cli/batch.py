@@ -0,0 +1,300 @@
+"""
+Неінтерактивний пакетний режим: команди та результати у форматі JSON lines
+
+Кожен рядок вводу - окрема операція, наприклад:
+    
+    {"op": "add_contact", "name": "Іван", "phones": ["0501234567"]}
+    {"op": "add_note", "title": "Звіт", "content": "...", "tags": ["робота"]}
+    {"op": "find_notes_by_tags", "expression": "робота AND NOT архів"}
+
+Для кожної операції виводиться рядок з результатом ({"line": 1, "ok": true,
+"result": ...} або {"line": 2, "ok": false, "error": "..."}); поле "ref" з
+вводу повертається без змін для зіставлення. Усі зміни виконуються в блоках
+batch() менеджерів і записуються одним збереженням наприкінці; кожна операція
+виконується у власному savepoint(), тож зміни операції з помилкою не
+потрапляють у збереження.
+"""
+
+import json
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+try:
+    from models.contact import Contact
+    from models.note import Note
+    from managers.contact_manager import ContactManager
+    from managers.note_manager import NoteManager
+    from storage.file_storage import FileStorage
+except ImportError:
+    from dev_implementation.models.contact import Contact
+    from dev_implementation.models.note import Note
+    from dev_implementation.managers.contact_manager import ContactManager
+    from dev_implementation.managers.note_manager import NoteManager
+    from dev_implementation.storage.file_storage import FileStorage
+
+
+class BatchProcessor:
+    """
+    Виконує структуровані операції над контактами та нотатками без input()
+    
+    Помилка в одній операції повертається як її результат, відкочує лише
+    її зміни і не зупиняє обробку решти; дані зберігаються один раз після
+    останньої операції.
+    """
+
+    def __init__(self, contact_manager: ContactManager, note_manager: NoteManager):
+        """
+        Ініціалізує обробник з готовими менеджерами
+        
+        Args:
+            contact_manager (ContactManager): Менеджер контактів
+            note_manager (NoteManager): Менеджер нотаток
+        """
+        self.contact_manager = contact_manager
+        self.note_manager = note_manager
+        self.processed = 0
+        self.failed = 0
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'add_contact': self._add_contact,
+            'update_contact': self._update_contact,
+            'remove_contact': self._remove_contact,
+            'find_contact': self._find_contact,
+            'search_contacts': self._search_contacts,
+            'find_contacts_by_phone': self._find_contacts_by_phone,
+            'upcoming_birthdays': self._upcoming_birthdays,
+            'add_note': self._add_note,
+            'edit_note': self._edit_note,
+            'remove_note': self._remove_note,
+            'get_note': self._get_note,
+            'search_notes': self._search_notes,
+            'find_notes_by_tags': self._find_notes_by_tags,
+        }
+
+    @classmethod
+    def from_storage(cls, storage: Optional[FileStorage] = None) -> 'BatchProcessor':
+        """
+        Створює обробник з менеджерами поверх сховища
+        
+        Args:
+            storage (Optional[FileStorage]): Сховище (за замовчуванням FileStorage())
+            
+        Returns:
+            BatchProcessor: Новий обробник
+        """
+        storage = storage or FileStorage()
+        return cls(ContactManager(storage), NoteManager(storage))
+
+    @property
+    def operations(self) -> List[str]:
+        """Повертає назви підтримуваних операцій"""
+        return list(self._operations)
+
+    def execute(self, request: Dict[str, Any]) -> Any:
+        """
+        Виконує одну операцію
+        
+        Args:
+            request (Dict[str, Any]): Операція з полем "op" та її параметрами
+            
+        Returns:
+            Any: Результат операції, придатний для JSON
+            
+        Raises:
+            ValueError: Якщо операція невідома або параметри неправильні
+            KeyError: Якщо бракує обов'язкового параметра
+        """
+        handler = self._operations.get(request.get('op'))
+        if handler is None:
+            raise ValueError(f"Невідома операція: {request.get('op')}")
+        return handler(request)
+
+    def process(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Виконує операції з рядків JSON і повертає результати по одному
+        
+        Зміни групуються в batch() обох менеджерів, тому збереження
+        відбувається один раз після вичерпання вводу, а сховища, що це
+        підтримують, синхронізують обидва файли з диском разом.
+        
+        Args:
+            lines (Iterable[str]): Рядки JSON (порожні рядки пропускаються)
+            
+        Yields:
+            Dict[str, Any]: Результат кожної операції
+        """
+        with ExitStack() as stack:
+            storages = {id(manager.storage): manager.storage
+                        for manager in (self.contact_manager, self.note_manager)}
+            for storage in storages.values():
+                if hasattr(storage, 'group_commit'):
+                    stack.enter_context(storage.group_commit())
+            stack.enter_context(self.contact_manager.batch())
+            stack.enter_context(self.note_manager.batch())
+            
+            for line_number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                yield self._process_line(line_number, line)
+
+    def _process_line(self, line_number: int, line: str) -> Dict[str, Any]:
+        """Виконує один рядок і формує запис результату"""
+        self.processed += 1
+        response: Dict[str, Any] = {'line': line_number, 'ok': False}
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response['error'] = f"Некоректний JSON: {e}"
+            request = None
+        else:
+            if not isinstance(request, dict):
+                response['error'] = "Операція має бути об'єктом JSON"
+                request = None
+        
+        if request is not None:
+            if 'ref' in request:
+                response['ref'] = request['ref']
+            try:
+                # Операція з помилкою відкочує лише власні зміни
+                with self.contact_manager.savepoint(), self.note_manager.savepoint():
+                    response['result'] = self.execute(request)
+                response['ok'] = True
+            except KeyError as e:
+                response['error'] = f"Відсутній параметр {e}"
+            except Exception as e:
+                response['error'] = str(e) or type(e).__name__
+        
+        if not response['ok']:
+            self.failed += 1
+        return response
+
+    def run(self, input_stream: TextIO, output_stream: TextIO) -> bool:
+        """
+        Обробляє потік операцій і пише результати, завершуючи підсумком
+        
+        Args:
+            input_stream (TextIO): Джерело рядків JSON
+            output_stream (TextIO): Куди писати рядки результатів
+            
+        Returns:
+            bool: True, якщо всі операції виконано без помилок
+        """
+        for response in self.process(input_stream):
+            output_stream.write(json.dumps(response, ensure_ascii=False) + '\n')
+        
+        summary = {'processed': self.processed, 'failed': self.failed}
+        output_stream.write(json.dumps({'summary': summary}, ensure_ascii=False) + '\n')
+        output_stream.flush()
+        return self.failed == 0
+    
+    @staticmethod
+    def _string_list(request: Dict[str, Any], key: str) -> Optional[List[str]]:
+        """Повертає параметр-список рядків або None, якщо параметр не передано"""
+        value = request.get(key)
+        if value is not None and not (isinstance(value, list)
+                                      and all(isinstance(item, str) for item in value)):
+            raise ValueError(f"Параметр '{key}' має бути списком рядків")
+        return value
+    
+    # Операції з контактами
+
+    def _add_contact(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Додає контакт з усіма переданими полями"""
+        contact = Contact(request['name'])
+        for phone in request.get('phones', []):
+            contact.add_phone(phone)
+        for email in request.get('emails', []):
+            contact.add_email(email)
+        if request.get('birthday'):
+            contact.set_birthday(request['birthday'])
+        if request.get('address'):
+            contact.set_address(request['address'])
+        
+        if not self.contact_manager.add_contact(contact):
+            raise ValueError(f"Контакт '{contact.name.value}' вже існує")
+        return contact.to_dict()
+
+    def _update_contact(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Оновлює передані поля контакту"""
+        fields = {key: request[key] for key in ('phones', 'emails', 'birthday', 'address')
+                  if key in request}
+        contact = self.contact_manager.update_contact(request['name'], **fields)
+        if contact is None:
+            raise ValueError(f"Контакт '{request['name']}' не знайдено")
+        return contact.to_dict()
+
+    def _remove_contact(self, request: Dict[str, Any]) -> bool:
+        """Видаляє контакт"""
+        if not self.contact_manager.remove_contact(request['name']):
+            raise ValueError(f"Контакт '{request['name']}' не знайдено")
+        return True
+
+    def _find_contact(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Повертає контакт за точним ім'ям або None"""
+        contact = self.contact_manager.find_contact(request['name'])
+        return contact.to_dict() if contact else None
+
+    def _search_contacts(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Шукає контакти за частковим збігом"""
+        return [contact.to_dict() for contact in self.contact_manager.search_contacts(request['query'])]
+
+    def _find_contacts_by_phone(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Шукає контакти за повним номером, префіксом або останніми цифрами"""
+        if 'prefix' in request:
+            contacts = self.contact_manager.find_contacts_by_phone_prefix(request['prefix'])
+        elif 'suffix' in request:
+            contacts = self.contact_manager.find_contacts_by_phone_suffix(request['suffix'])
+        else:
+            contacts = self.contact_manager.find_contacts_by_phone(request['phone'])
+        return [contact.to_dict() for contact in contacts]
+
+    def _upcoming_birthdays(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Повертає контакти з найближчими днями народження"""
+        days = int(request.get('days', 7))
+        return [contact.to_dict() for contact in self.contact_manager.get_upcoming_birthdays(days)]
+    
+    # Операції з нотатками
+
+    def _add_note(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Створює нотатку"""
+        note = Note(request['title'], request.get('content', ''), self._string_list(request, 'tags'))
+        if not self.note_manager.add_note(note):
+            raise ValueError(f"Нотатка '{note.title}' вже існує")
+        return note.to_dict()
+
+    def _edit_note(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Редагує нотатку за ID"""
+        note_id = request['id']
+        if not self.note_manager.edit_note_by_id(note_id, request.get('title'), request.get('content'),
+                                                 self._string_list(request, 'tags')):
+            raise ValueError(f"Нотатку з ID {note_id} не знайдено")
+        return self.note_manager.get_note_by_id(note_id).to_dict()
+
+    def _remove_note(self, request: Dict[str, Any]) -> bool:
+        """Видаляє нотатку за ID або заголовком"""
+        if 'id' in request:
+            removed = self.note_manager.remove_note_by_id(request['id'])
+        else:
+            removed = self.note_manager.remove_note_by_title(request['title'])
+        if not removed:
+            raise ValueError("Нотатку не знайдено")
+        return True
+
+    def _get_note(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Повертає нотатку за ID або None"""
+        note = self.note_manager.get_note_by_id(request['id'])
+        return note.to_dict() if note else None
+
+    def _search_notes(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Шукає нотатки за текстом, від найрелевантніших"""
+        found = self.note_manager.search_notes(request['query'], bool(request.get('case_sensitive')))
+        return [note.to_dict() for _, note in found]
+
+    def _find_notes_by_tags(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Шукає нотатки за списком тегів або булевим виразом"""
+        if 'expression' in request:
+            found = self.note_manager.find_notes_by_tag_expression(request['expression'])
+        else:
+            found = self.note_manager.find_notes_by_tags(request['tags'],
+                                                         bool(request.get('match_all')),
+                                                         request.get('exclude_tags'))
+        return [note.to_dict() for _, note in found]
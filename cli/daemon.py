@@ -0,0 +1,364 @@
+"""
+Фоновий сервер, що тримає менеджери завантаженими, і тонкий клієнт до нього
+
+Сервер один раз створює PersonalAssistantCLI і виконує команди, що надходять
+через Unix-сокет, тому повторні виклики не платять за завантаження та
+валідацію всіх контактів і нотаток. Протокол - рядки JSON:
+
+    клієнт -> {"command": "додай нотатку", "answers": ["Заголовок", "теги"]}
+    сервер -> {"prompt": "Введіть ..."}      (якщо відповідей не вистачило)
+    клієнт -> {"answer": "..."}              (або null, якщо відповіді немає)
+    сервер -> {"result": "Нотатку ... створено"}
+
+Службові запити: {"op": "ping"} та {"op": "shutdown"}.
+
+Сокет за замовчуванням лежить у $XDG_RUNTIME_DIR або в особистій директорії
+користувача з правами 0700 у тимчасовій директорії. Клієнт і сервер
+відмовляються працювати з сокетом чи директорією іншого користувача.
+"""
+
+import builtins
+import json
+import os
+import socket
+import socketserver
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+# Скільки секунд сервер чекає на повідомлення клієнта; сервер обслуговує
+# з'єднання по одному, тому клієнт, що завис, не повинен блокувати решту
+REQUEST_TIMEOUT = 30.0
+
+
+def default_socket_path() -> str:
+    """
+    Повертає шлях до сокета за замовчуванням для поточного користувача
+    
+    Returns:
+        str: Шлях у $XDG_RUNTIME_DIR, а якщо його немає - в особистій
+            директорії користувача всередині тимчасової директорії
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'personal-assistant.sock')
+    user_id = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"personal-assistant-{user_id}", 'assistant.sock')
+
+
+def _check_owner(path: str) -> None:
+    """
+    Перевіряє, що файл або директорія належить поточному користувачу
+    
+    Args:
+        path (str): Шлях до сокета або його директорії
+        
+    Raises:
+        FileNotFoundError: Якщо шляху не існує
+        PermissionError: Якщо власник - інший користувач
+    """
+    if hasattr(os, 'getuid') and os.lstat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} належить іншому користувачу")
+
+
+def _prepare_directory(socket_path: str) -> None:
+    """
+    Створює директорію сокета з правами 0700, якщо її немає
+    
+    Args:
+        socket_path (str): Шлях до сокета
+        
+    Raises:
+        PermissionError: Якщо директорія належить іншому користувачу або
+            доступна іншим
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    if os.path.dirname(os.path.abspath(default_socket_path())) != directory:
+        return  # Директорію, вказану явно, обирає користувач
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    _check_owner(directory)
+    if os.stat(directory).st_mode & 0o077:
+        raise PermissionError(f"Директорія сокета {directory} доступна іншим користувачам")
+
+
+def _check_unix_sockets() -> None:
+    """Перевіряє, що платформа підтримує Unix-сокети"""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Режим сервера потребує підтримки Unix-сокетів")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Обробляє одне з'єднання: один запит і, можливо, кілька підказок"""
+
+    def setup(self) -> None:
+        """Встановлює тайм-аут читання з'єднання"""
+        self.timeout = self.server.assistant_daemon.request_timeout
+        super().setup()
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Читає наступне повідомлення клієнта або None при закритті з'єднання чи тайм-ауті"""
+        try:
+            line = self.rfile.readline()
+        except OSError:
+            return None  # socket.timeout теж є OSError
+        if not line:
+            return None
+        try:
+            message = json.loads(line.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        return message if isinstance(message, dict) else None
+
+    def _write(self, message: Dict[str, Any]) -> None:
+        """Надсилає повідомлення клієнту (клієнт, що відключився, ігнорується)"""
+        try:
+            self.wfile.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+        except OSError:
+            pass
+
+    def handle(self) -> None:
+        """Виконує запит клієнта"""
+        daemon = self.server.assistant_daemon
+        request = self._read()
+        if request is None:
+            self._write({'error': "Некоректний запит"})
+            return
+        
+        op = request.get('op', 'command')
+        if op == 'ping':
+            self._write({'result': 'pong'})
+        elif op == 'shutdown':
+            daemon.stop()
+            self._write({'result': 'stopped'})
+        elif op == 'command':
+            answers = [str(answer) for answer in request.get('answers') or []]
+
+            def answer(prompt: str) -> Optional[str]:
+                if answers:
+                    return answers.pop(0)
+                self._write({'prompt': prompt})
+                reply = self._read()
+                return None if reply is None else reply.get('answer')
+            
+            result = daemon.execute(str(request.get('command', '')), answer)
+            self._write({'result': result})
+        else:
+            self._write({'error': f"Невідома операція: {op}"})
+
+
+class AssistantDaemon:
+    """
+    Сервер, що обслуговує команди PersonalAssistantCLI через Unix-сокет
+    
+    Запити обробляються по одному, тому менеджери не потребують блокувань.
+    Команди, яким потрібні додаткові дані, отримують їх з поля "answers"
+    запиту, а якщо його не вистачає - запитують у клієнта. Клієнт, що не
+    надсилає даних довше request_timeout, відключається.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, cli: Any = None,
+                 request_timeout: float = REQUEST_TIMEOUT):
+        """
+        Ініціалізує сервер і завантажує дані
+        
+        Args:
+            socket_path (Optional[str]): Шлях до сокета (за замовчуванням default_socket_path())
+            cli (Any): Готовий PersonalAssistantCLI (за замовчуванням створюється новий)
+            request_timeout (float): Тайм-аут читання повідомлень клієнта в секундах
+        """
+        _check_unix_sockets()
+        if cli is None:
+            from .interface import PersonalAssistantCLI
+            cli = PersonalAssistantCLI()
+        
+        # Менеджери завантажують дані при першому зверненні; сервер існує саме
+        # для того, щоб тримати їх готовими, тому завантажуємо одразу
+        if not cli.contact_manager.loaded:
+            cli.contact_manager.load_contacts()
+        if not cli.note_manager.loaded:
+            cli.note_manager.load_notes()
+        
+        self.socket_path = socket_path or default_socket_path()
+        self.cli = cli
+        self.request_timeout = request_timeout
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self._stopping = False
+
+    def execute(self, command: str, answer: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Виконує команду так само, як інтерактивний режим
+        
+        Args:
+            command (str): Команда користувача
+            answer (Callable[[str], Optional[str]]): Повертає відповідь на підказку
+                команди або None, якщо відповіді немає
+                
+        Returns:
+            Optional[str]: Результат process_command
+        """
+        def daemon_input(prompt: str = '') -> str:
+            value = answer(str(prompt))
+            if value is None:
+                raise EOFError("Клієнт не надав відповіді")
+            return value
+        
+        # Обробники команд викликають input(), тому на час запиту підміняємо його
+        original_input = builtins.input
+        builtins.input = daemon_input
+        try:
+            return self.cli.process_command(command)
+        finally:
+            builtins.input = original_input
+            # Команда exit завершує сесію клієнта, а не сервер
+            self.cli.running = True
+
+    def _bind(self) -> None:
+        """
+        Створює сокет, прибираючи файл від попереднього сервера, що не працює
+        
+        Raises:
+            OSError: Якщо сервер уже працює або сокет чи його директорія
+                належать іншому користувачу (PermissionError)
+        """
+        _prepare_directory(self.socket_path)
+        if os.path.lexists(self.socket_path):
+            _check_owner(self.socket_path)
+            if ping(self.socket_path):
+                raise OSError(f"Сервер вже працює: {self.socket_path}")
+            os.unlink(self.socket_path)
+        
+        old_umask = os.umask(0o177)  # Сокет доступний лише власнику
+        try:
+            self._server = socketserver.UnixStreamServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.assistant_daemon = self
+        self._server.timeout = 0.5
+
+    def serve_forever(self) -> None:
+        """Обслуговує запити, доки не надійде запит shutdown або виклик stop()"""
+        self._bind()
+        self._stopping = False
+        try:
+            while not self._stopping:
+                self._server.handle_request()
+        finally:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.cli.contact_manager.flush()
+            self.cli.note_manager.flush()
+
+    def stop(self) -> None:
+        """Зупиняє сервер після поточного запиту"""
+        self._stopping = True
+
+
+def send_request(request: Dict[str, Any], socket_path: Optional[str] = None,
+                 ask: Optional[Callable[[str], Optional[str]]] = None,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Надсилає запит серверу та повертає його відповідь
+    
+    Args:
+        request (Dict[str, Any]): Запит, наприклад {"command": "показати нотатки"}
+        socket_path (Optional[str]): Шлях до сокета (за замовчуванням default_socket_path())
+        ask (Optional[Callable[[str], Optional[str]]]): Відповідає на підказки сервера;
+            якщо не вказано, команда отримає кінець вводу
+        timeout (Optional[float]): Тайм-аут з'єднання в секундах
+        
+    Returns:
+        Dict[str, Any]: Остання відповідь сервера ("result" або "error")
+        
+    Raises:
+        ConnectionError: Якщо сервер не запущено
+        PermissionError: Якщо сокет належить іншому користувачу
+    """
+    _check_unix_sockets()
+    path = socket_path or default_socket_path()
+    try:
+        # Чужий сокет міг би отримувати команди та підміняти відповіді
+        _check_owner(path)
+    except FileNotFoundError as e:
+        raise ConnectionError(f"Сервер не запущено ({path})") from e
+    
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        try:
+            client.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ConnectionError(f"Сервер не запущено ({path})") from e
+        
+        stream = client.makefile('rwb')
+        stream.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        stream.flush()
+        
+        for line in stream:
+            reply = json.loads(line.decode('utf-8'))
+            if 'prompt' not in reply:
+                return reply
+            answer = ask(reply['prompt']) if ask is not None else None
+            stream.write(json.dumps({'answer': answer}, ensure_ascii=False).encode('utf-8') + b'\n')
+            stream.flush()
+        raise ConnectionError("Сервер закрив з'єднання без відповіді")
+    finally:
+        client.close()
+
+
+def send_command(command: str, answers: Optional[List[str]] = None,
+                 socket_path: Optional[str] = None,
+                 ask: Optional[Callable[[str], Optional[str]]] = None) -> Optional[str]:
+    """
+    Виконує команду на сервері
+    
+    Args:
+        command (str): Команда користувача
+        answers (Optional[List[str]]): Відповіді на підказки команди по порядку
+        socket_path (Optional[str]): Шлях до сокета
+        ask (Optional[Callable[[str], Optional[str]]]): Відповідає на підказки,
+            для яких не вистачило answers
+            
+    Returns:
+        Optional[str]: Результат команди
+        
+    Raises:
+        ConnectionError: Якщо сервер не запущено або відповів помилкою
+    """
+    reply = send_request({'command': command, 'answers': answers or []}, socket_path, ask)
+    if 'error' in reply:
+        raise ConnectionError(reply['error'])
+    return reply.get('result')
+
+
+def ping(socket_path: Optional[str] = None) -> bool:
+    """
+    Перевіряє, чи працює сервер
+    
+    Args:
+        socket_path (Optional[str]): Шлях до сокета
+        
+    Returns:
+        bool: True, якщо сервер відповів
+    """
+    try:
+        return send_request({'op': 'ping'}, socket_path, timeout=1.0).get('result') == 'pong'
+    except (ConnectionError, OSError, ValueError):
+        return False
+
+
+def stop_daemon(socket_path: Optional[str] = None) -> bool:
+    """
+    Зупиняє сервер
+    
+    Args:
+        socket_path (Optional[str]): Шлях до сокета
+        
+    Returns:
+        bool: True, якщо сервер прийняв запит на зупинку
+    """
+    try:
+        return send_request({'op': 'shutdown'}, socket_path).get('result') == 'stopped'
+    except ConnectionError:
+        return False
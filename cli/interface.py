@@ -4,7 +4,7 @@
 
 import sys
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 # Імпорт наших реалізацій
 try:
@@ -13,7 +13,7 @@ try:
     from managers.contact_manager import ContactManager  
     from managers.note_manager import NoteManager
     from storage.file_storage import FileStorage
-    from utils.command_matcher import CommandMatcher
+    from utils.metrics import metrics
 except ImportError:
     # Fallback для тестування
     from dev_implementation.models.contact import Contact
@@ -21,7 +21,7 @@ except ImportError:
     from dev_implementation.managers.contact_manager import ContactManager  
     from dev_implementation.managers.note_manager import NoteManager
     from dev_implementation.storage.file_storage import FileStorage
-    from dev_implementation.utils.command_matcher import CommandMatcher
+    from dev_implementation.utils.metrics import metrics
 
 
 class PersonalAssistantCLI:
@@ -32,13 +32,27 @@ class PersonalAssistantCLI:
     та управління контактами і нотатками.
     """
 
-    def __init__(self):
-        """Ініціалізує CLI інтерфейс"""
-        # Ініціалізуємо сховище та менеджери
+    def __init__(self, write_behind: Optional[float] = None):
+        """
+        Ініціалізує CLI інтерфейс
+        
+        Args:
+            write_behind (Optional[float]): Затримка фонового запису в секундах;
+                якщо не задано, зміни зберігаються одразу після кожної команди
+        """
+        # Ініціалізуємо сховище та менеджери; дані завантажуються при першому
+        # зверненні, а розпізнавач команд - при першій команді
         self.storage = FileStorage()
-        self.contact_manager = ContactManager(self.storage)
-        self.note_manager = NoteManager(self.storage)
-        self.command_matcher = CommandMatcher()
+        self.write_behind = None
+        if write_behind is not None:
+            try:
+                from managers.write_behind import WriteBehind
+            except ImportError:
+                from dev_implementation.managers.write_behind import WriteBehind
+            self.write_behind = WriteBehind(self.storage, write_behind)
+        self.contact_manager = ContactManager(self.storage, self.write_behind)
+        self.note_manager = NoteManager(self.storage, self.write_behind)
+        self._command_matcher = None
         
         # Додаємо методи збереження для тестів
         self.contact_manager.save_data = self.contact_manager.save_contacts
@@ -48,6 +62,17 @@ class PersonalAssistantCLI:
         self.running = True
         self.show_welcome = True
 
+    @property
+    def command_matcher(self):
+        """Повертає розпізнавач команд, створюючи його при першому зверненні"""
+        if self._command_matcher is None:
+            try:
+                from utils.command_matcher import CommandMatcher
+            except ImportError:
+                from dev_implementation.utils.command_matcher import CommandMatcher
+            self._command_matcher = CommandMatcher()
+        return self._command_matcher
+
     def process_command(self, user_input: str) -> Optional[str]:
         """
         Обробляє команду користувача та повертає результат
@@ -118,6 +143,7 @@ class PersonalAssistantCLI:
   • delete note / видалити нотатку - Видалити нотатку
 
 Інші команди:
+  • statistics / статистика - Показати статистику
   • help / допомога - Показати цю довідку
   • exit / вихід - Вийти з програми
         """
@@ -148,6 +174,8 @@ class PersonalAssistantCLI:
                 return self._delete_note_command()
             elif command == 'birthdays':
                 return self._birthdays_command()
+            elif command == 'statistics':
+                return self._statistics_command()
             elif command == 'help':
                 return self._get_help_text()
             else:
@@ -342,8 +370,9 @@ class PersonalAssistantCLI:
                     contact.remove_address()
                     result_messages.append("✅ Адресу видалено")
             
-            # Зберігаємо зміни
-            self.contact_manager.save_data()
+            # Зберігаємо зміни лише цього контакту
+            self.contact_manager.mark_dirty(contact.name.value)
+            self.contact_manager.flush()
             result_messages.append(f"🎉 Контакт '{name}' успішно оновлено!")
             
             return "\n".join(result_messages)
@@ -494,9 +523,10 @@ class PersonalAssistantCLI:
                 return f"На найближчі {days_ahead} днів днів народження немає"
             
             result = f"Дні народження на найближчі {days_ahead} днів:\n\n"
+            today = date.today()
             
             for contact in upcoming_birthdays:
-                days_to_bd = contact.days_to_birthday()
+                days_to_bd = contact.days_to_birthday(today)
                 if days_to_bd == 0:
                     status = "СЬОГОДНІ!"
                 elif days_to_bd == 1:
@@ -519,6 +549,30 @@ class PersonalAssistantCLI:
         except Exception as e:
             return f"Помилка отримання днів народження: {e}"
 
+    def _statistics_command(self) -> str:
+        """Команда показу статистики та метрик часу операцій"""
+        try:
+            contact_stats = self.contact_manager.get_statistics()
+            note_stats = self.note_manager.get_statistics()
+            
+            result = "Статистика:\n\n"
+            result += f"📞 Контактів: {contact_stats['total_contacts']}\n"
+            result += f"   З телефонами: {contact_stats['with_phones']}\n"
+            result += f"   З email: {contact_stats['with_emails']}\n"
+            result += f"   З днями народження: {contact_stats['with_birthdays']}\n"
+            result += f"   Найближчі дні народження (7 днів): {contact_stats['upcoming_birthdays']}\n"
+            result += f"📝 Нотаток: {note_stats['total_notes']}\n"
+            result += f"   Унікальних тегів: {note_stats['total_tags']}\n"
+            
+            # Метрики збираються лише з опцією --metrics
+            if metrics.enabled:
+                result += f"\n⏱️ Час операцій:\n{metrics.format_table()}\n"
+            
+            return result.strip()
+            
+        except Exception as e:
+            return f"Помилка отримання статистики: {e}"
+
     def run(self) -> None:
         """Головний цикл програми"""
         try:
@@ -550,10 +604,16 @@ class PersonalAssistantCLI:
                     print(f"Помилка: {e}")
         
         finally:
-            # Зберігаємо дані
+            # Дописуємо лише незбережені зміни завантажених менеджерів і чергу
+            # фонового запису; незавантажені файли не читаються і не переписуються
             try:
-                self.contact_manager.save_data()
-                self.note_manager.save_data()
-                print("Дані збережено. До побачення!")
+                saved = all([manager.flush() for manager in (self.contact_manager, self.note_manager)
+                             if manager.loaded])
+                if self.write_behind is not None:
+                    saved = self.write_behind.close() and saved
+                if saved:
+                    print("Дані збережено. До побачення!")
+                else:
+                    print("Помилка збереження: не всі зміни записано")
             except Exception as e:
                 print(f"Помилка збереження: {e}")
\ No newline at end of file
@@ -2,7 +2,15 @@
 Managers implementation package
 """
 
-from .contact_manager import ContactManager
-from .note_manager import NoteManager
+__all__ = ['ContactManager', 'NoteManager']
 
-__all__ = ['ContactManager', 'NoteManager']
\ No newline at end of file
+
+def __getattr__(name):
+    """Імпортує менеджер лише при першому зверненні, щоб не завантажувати обидва"""
+    if name == 'ContactManager':
+        from .contact_manager import ContactManager
+        return ContactManager
+    if name == 'NoteManager':
+        from .note_manager import NoteManager
+        return NoteManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,15 +2,39 @@
 Менеджер для управління нотатками
 """
 
-from typing import List, Optional, Dict, Any, Set
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime
 
 try:
     from models.note import Note
-    from storage.file_storage import FileStorage
+    from storage.file_storage import Change, FileStorage
+    from utils.gc_utils import paused_gc
+    from utils.metrics import timed
 except ImportError:
     from dev_implementation.models.note import Note
-    from dev_implementation.storage.file_storage import FileStorage
+    from dev_implementation.storage.file_storage import Change, FileStorage
+    from dev_implementation.utils.gc_utils import paused_gc
+    from dev_implementation.utils.metrics import timed
+
+if TYPE_CHECKING:
+    from managers.write_behind import WriteBehind
+    from utils.search_index import FullTextIndex, TagIndex
+
+
+# Службовий файл сховища з верхньою межею виданих ID нотаток (ім'я з крапки
+# не потрапляє в list_data_files)
+NOTE_IDS_FILE = '.note_ids'
+
+
+def _search_index():
+    """Імпортує модуль пошукових індексів лише при першому пошуку"""
+    try:
+        from utils import search_index
+    except ImportError:
+        from dev_implementation.utils import search_index
+    return search_index
 
 
 class NoteManager:
@@ -21,50 +45,596 @@ class NoteManager:
     та сортування нотаток за тегами.
     """
 
-    def __init__(self, storage: FileStorage):
+    def __init__(self, storage: FileStorage, write_behind: Optional['WriteBehind'] = None):
         """
         Ініціалізує менеджер нотаток з вказаним сховищем
         
         Args:
             storage (FileStorage): Об'єкт для збереження даних
+            write_behind (Optional[WriteBehind]): Фоновий запис; якщо задано,
+                зміни після команд записуються ним із затримкою, а не одразу
         """
         self.storage = storage
-        self._notes: List[Note] = []
-        self.load_notes()
+        self._write_behind = write_behind
+        # _notes та словники пошуку (_by_id, _titles, _title_keys) з'являються
+        # при першому зверненні - див. __getattr__
+        # Кеш to_dict() за id(note): менеджер тримає посилання на нотатки,
+        # тому id залишаються унікальними, поки нотатка в колекції
+        self._serialized: Dict[int, Dict[str, Any]] = {}
+        self._pending: List[Tuple[str, int, Optional[Note]]] = []
+        self._batch_depth = 0
+        self._batch_preimages: Dict[int, Dict[str, Any]] = {}
+        self._batch_order: List[Note] = []
+        self._batch_flushed = False
+        # Стан savepoint(): знімки нотаток до зміни, журнал змін порядку списку
+        # (позиція, видалена нотатка або None для доданої) та кількість
+        # позиційних змін на початок блоку
+        self._savepoint: Optional[Tuple[Dict[int, Dict[str, Any]],
+                                        List[Tuple[int, Optional[Note]]], int]] = None
+        # Індекси будуються при першому пошуку і далі оновлюються
+        # лише для змінених нотаток
+        self._text_index: Optional['FullTextIndex'] = None
+        self._text_stale: Dict[int, Optional[Note]] = {}
+        self._tag_index: Optional['TagIndex'] = None
+        self._tag_stale: Dict[int, Optional[Note]] = {}
+        # Позиції нотаток за id(note) на момент побудови словника; видалення
+        # не перебудовують його, а додаються до відсортованого списку позицій
+        # видалених нотаток (див. _position)
+        self._positions: Optional[Dict[int, int]] = None
+        self._removed_positions: List[int] = []
+        self._next_position = 1
+        self._next_id = 1
+        # Верхня межа ID, уже записана у сховище (файл NOTE_IDS_FILE)
+        self._saved_next_id = 1
+        # Менеджер зберігає лише валідовані нотатки, тому незмінений файл
+        # можна завантажувати без повторної валідації
+        if hasattr(storage, 'register_schema'):
+            storage.register_schema('notes', Note.SCHEMA_VERSION)
 
+    def __getattr__(self, name: str) -> Any:
+        """
+        Завантажує нотатки при першому зверненні до колекції
+        
+        Викликається лише для атрибутів, яких ще немає, тому після
+        завантаження доступ до нотаток не має додаткових витрат.
+        """
+        if name in ('_notes', '_by_id', '_titles', '_title_keys'):
+            self.load_notes()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def loaded(self) -> bool:
+        """Повертає True, якщо нотатки вже завантажено зі сховища"""
+        return '_notes' in self.__dict__
+
+    @timed('notes.load_notes')
     def load_notes(self) -> None:
         """Завантажує нотатки з файлового сховища"""
+        if self._write_behind is not None:
+            self._write_behind.flush()  # Файл має містити всі відкладені зміни
         # Очищаємо поточні нотатки перед завантаженням
-        self._notes = []
+        self._notes: List[Note] = []
+        self._serialized = {}
+        self._pending = []
+        self._reset_indexes()
         
+        # Розбір JSON і створення об'єктів породжують лише довгоживучі об'єкти
+        with paused_gc():
+            try:
+                try:
+                    self._read_notes(hasattr(self.storage, 'stream_trusted'))
+                except ValueError:
+                    # Пошкодження помічено посеред потоку - повне завантаження
+                    # вміє відновлювати файл з резервної копії
+                    self._notes.clear()
+                    self._read_notes(False)
+            except Exception as e:
+                print(f"Помилка завантаження нотаток: {e}")
+                # Зберігаємо порожній список при помилці
+                self._notes = []
+        
+        self._load_id_mark()
+        migrated = self._rebuild_lookups()
+        if migrated:
+            # Нотатки без ID (старий формат файлу) зберігаємо одразу,
+            # щоб призначені ID не змінювались між запусками
+            for position in migrated:
+                self._record_change('set', position, self._notes[position])
+            self.flush()
+
+    def _load_id_mark(self) -> None:
+        """Читає верхню межу ID, щоб ID видалених нотаток не видавались повторно"""
         try:
-            notes_data = self.storage.load_data('notes')
-            if isinstance(notes_data, list):
-                for note_data in notes_data:
-                    try:
-                        note = Note.from_dict(note_data)
-                        self._notes.append(note)
-                    except (ValueError, KeyError) as e:
-                        print(f"Помилка завантаження нотатки: {e}")
-        except Exception as e:
-            print(f"Помилка завантаження нотаток: {e}")
-            # Зберігаємо порожній список при помилці
-            self._notes = []
+            data = self.storage.load_data(NOTE_IDS_FILE)
+            saved_next_id = int(data.get('next_id', 1)) if isinstance(data, dict) else 1
+        except Exception:
+            saved_next_id = 1  # Межа лише доповнює ID з файлу нотаток
+        self._saved_next_id = saved_next_id
+        self._next_id = max(self._next_id, saved_next_id)
+
+    def _id_mark_changes(self) -> List[Change]:
+        """
+        Повертає зміну верхньої межі ID, якщо її потрібно записати
+        
+        Після завантаження наступний ID рахується від найбільшого ID у файлі,
+        тож межу варто записувати лише тоді, коли нотатки з найбільшим
+        виданим ID уже немає. Перевірка коштує O(1).
+        
+        Returns:
+            List[Change]: Зміна для файлу NOTE_IDS_FILE або порожній список
+        """
+        if self._next_id > self._saved_next_id and self._next_id - 1 not in self._by_id:
+            return [('set', 'next_id', self._next_id)]
+        return []
+
+    def _save_id_mark(self) -> None:
+        """Записує верхню межу ID разом зі збереженням нотаток"""
+        changes = self._id_mark_changes()
+        if changes and self.storage.apply_changes(NOTE_IDS_FILE, changes):
+            self._saved_next_id = self._next_id
 
+    def _read_notes(self, stream: bool) -> None:
+        """
+        Створює нотатки з записів сховища
+        
+        Args:
+            stream (bool): Чи розбирати файл потоково, запис за записом
+            
+        Raises:
+            ValueError: Якщо файл пошкоджено посеред потокового розбору
+        """
+        if stream:
+            records, trusted = self.storage.stream_trusted('notes')
+        else:
+            if hasattr(self.storage, 'load_trusted'):
+                notes_data, trusted = self.storage.load_trusted('notes')
+            else:
+                notes_data, trusted = self.storage.load_data('notes'), False
+            records = enumerate(notes_data) if isinstance(notes_data, list) else ()
+        
+        from_dict = Note.from_trusted_dict if trusted else Note.from_dict
+        for position, note_data in records:
+            if not isinstance(position, int):
+                break  # Нотатки зберігаються лише у файлі-списку
+            try:
+                self._notes.append(from_dict(note_data))
+            except (ValueError, KeyError) as e:
+                print(f"Помилка завантаження нотатки: {e}")
+
+    @timed('notes.save_notes')
     def save_notes(self) -> bool:
         """
-        Зберігає нотатки у файлове сховище
+        Зберігає всю колекцію нотаток у файлове сховище
+        
+        Усі нотатки серіалізуються заново, тому метод підходить і після
+        прямої зміни об'єктів Note поза менеджером.
         
         Returns:
             bool: True, якщо збереження успішне
         """
         try:
-            notes_data = [note.to_dict() for note in self._notes]
-            return self.storage.save_data('notes', notes_data)
+            if self._write_behind is not None:
+                self._write_behind.flush()
+            self._serialized.clear()
+            notes_data = [self._serialize(note) for note in self._notes]
+            saved = self.storage.save_data('notes', notes_data)
+            if saved:
+                self._pending.clear()
+                self._save_id_mark()
+                if self._write_behind is not None:
+                    # Повний знімок новіший за зміни, яких не вдалося записати
+                    self._write_behind.discard('notes')
+                if self._batch_depth:
+                    self._batch_flushed = True
+            return saved
         except Exception as e:
             print(f"Помилка збереження нотаток: {e}")
             return False
 
+    @timed('notes.flush')
+    def flush(self) -> bool:
+        """
+        Зберігає лише нотатки, змінені з моменту останнього збереження
+        
+        Для сховищ з інкрементальним збереженням записуються тільки накопичені
+        позиційні зміни. Інакше список зберігається повністю, але незмінені
+        нотатки беруться з кешу серіалізованих словників. При відкладеному
+        записі метод чекає, доки фоновий запис передасть сховищу всі зміни.
+        
+        Returns:
+            bool: True, якщо збереження успішне
+        """
+        if self._write_behind is not None:
+            self._submit_changes()
+            return self._write_behind.flush()
+        if not self._pending:
+            return True
+        
+        try:
+            if getattr(self.storage, 'supports_incremental', False):
+                saved = self.storage.apply_changes('notes', self._changes())
+            else:
+                notes_data = [self._serialize(note) for note in self._notes]
+                saved = self.storage.save_data('notes', notes_data)
+        except Exception as e:
+            print(f"Помилка збереження нотаток: {e}")
+            return False
+        
+        if saved:
+            self._pending.clear()
+            self._save_id_mark()
+            if self._batch_depth:
+                self._batch_flushed = True
+        return saved
+
+    def _changes(self) -> List[Change]:
+        """Повертає накопичені позиційні зміни з серіалізованими нотатками"""
+        return [
+            (op, position, self._serialize(note) if note is not None else None)
+            for op, position, note in self._pending
+        ]
+
+    def _submit_changes(self) -> bool:
+        """Передає зміни фоновому запису; вартість залежить лише від кількості змін"""
+        if self._pending:
+            self._write_behind.submit('notes', self._changes())
+            self._pending.clear()
+            id_changes = self._id_mark_changes()
+            if id_changes:
+                self._write_behind.submit(NOTE_IDS_FILE, id_changes)
+                self._saved_next_id = self._next_id
+            if self._batch_depth:
+                self._batch_flushed = True
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator['NoteManager']:
+        """
+        Групує кілька змін в одне збереження
+        
+        Всередині блоку add_note, remove_note, edit_note, update_note та операції
+        з тегами не зберігають дані після кожного виклику; всі зміни записуються
+        один раз при виході з блоку. Якщо в блоці виникає виняток, стан нотаток
+        у пам'яті відкочується до початку блоку.
+        
+        Yields:
+            NoteManager: Цей менеджер
+        """
+        if self._batch_depth:
+            # Вкладений блок є частиною зовнішнього
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        self.flush()
+        self._batch_order = list(self._notes)
+        self._batch_preimages = {}
+        self._batch_flushed = False
+        self._batch_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth = 0
+            self._rollback_batch()
+            raise
+        else:
+            self._batch_depth = 0
+            self.flush()
+        finally:
+            self._batch_order = []
+            self._batch_preimages = {}
+
+    def _rollback_batch(self) -> None:
+        """Відновлює нотатки, змінені в межах блоку batch()"""
+        restored = {}
+        for note_id, data in self._batch_preimages.items():
+            restored[note_id] = Note.from_dict(data)
+            self._serialized.pop(note_id, None)
+        
+        self._notes = [restored.get(id(note), note) for note in self._batch_order]
+        self._pending = []
+        self._reset_indexes()
+        self._rebuild_lookups()
+        
+        if self._batch_flushed:
+            # Частину змін вже записано явним flush() - перезаписуємо весь список
+            self.save_notes()
+
+    @contextmanager
+    def savepoint(self) -> Iterator['NoteManager']:
+        """
+        Відкочує лише зміни цього блоку, якщо в ньому виникає виняток
+        
+        Всередині batch() зміни з блоку залишаються частиною пакета, але при
+        винятку нотатки повертаються до стану на початок блоку, не зачіпаючи
+        попередніх змін пакета. Вартість успішного блоку залежить лише від
+        кількості змін у ньому. Поза batch() працює як batch().
+        
+        Yields:
+            NoteManager: Цей менеджер
+        """
+        if not self._batch_depth:
+            with self.batch():
+                yield self
+            return
+        
+        outer = self._savepoint
+        flushed = self._batch_flushed
+        self._savepoint = ({}, [], len(self._pending))
+        self._batch_flushed = False
+        try:
+            yield self
+        except BaseException:
+            self._rollback_savepoint(*self._savepoint)
+            raise
+        else:
+            if outer is not None:
+                # Зміни вкладеного блоку стають частиною зовнішнього
+                for note_id, data in self._savepoint[0].items():
+                    outer[0].setdefault(note_id, data)
+                outer[1].extend(self._savepoint[1])
+        finally:
+            self._savepoint = outer
+            self._batch_flushed = self._batch_flushed or flushed
+
+    def _rollback_savepoint(self, preimages: Dict[int, Dict[str, Any]],
+                            order_log: List[Tuple[int, Optional[Note]]], pending: int) -> None:
+        """Відновлює нотатки, змінені в межах блоку savepoint()"""
+        if not preimages and not order_log:
+            return  # Операція завершилась помилкою, нічого не змінивши
+        # Відновлюємо порядок списку, скасовуючи додавання та видалення у
+        # зворотному порядку
+        for position, note in reversed(order_log):
+            if note is None:
+                del self._notes[position]
+            else:
+                self._notes.insert(position, note)
+        
+        restored = {}
+        for note_id, data in preimages.items():
+            restored[note_id] = Note.from_dict(data)
+            self._serialized.pop(note_id, None)
+        self._notes = [restored.get(id(note), note) for note in self._notes]
+        self._reset_indexes()
+        self._rebuild_lookups()
+        
+        if self._batch_flushed:
+            # Частину змін вже записано явним flush() - перезаписуємо весь список
+            self._pending = []
+            self.save_notes()
+        else:
+            # Позиційні зміни до початку блоку посилаються на ті самі позиції
+            self._pending = [
+                (op, position, restored.get(id(note), note) if note is not None else None)
+                for op, position, note in self._pending[:pending]
+            ]
+
+    def _before_change(self, note: Note) -> None:
+        """Запам'ятовує стан нотатки до зміни для відкату блоків batch() та savepoint()"""
+        if not self._batch_depth:
+            return
+        data = None
+        if id(note) not in self._batch_preimages:
+            data = self._batch_preimages[id(note)] = note.to_dict()
+        if self._savepoint is not None and id(note) not in self._savepoint[0]:
+            self._savepoint[0][id(note)] = data if data is not None else note.to_dict()
+
+    def _autosave(self) -> bool:
+        """
+        Зберігає зміни одразу (або передає фоновому запису), якщо менеджер
+        не знаходиться в блоці batch()
+        """
+        if self._batch_depth:
+            return True
+        if self._write_behind is not None:
+            return self._submit_changes()
+        return self.flush()
+
+    def mark_dirty(self, note: Note) -> None:
+        """
+        Позначає нотатку зміненою, щоб наступний flush() зберіг її
+        
+        Всередині batch() викликайте до зміни об'єкта, щоб відкат
+        відновив попередній стан.
+        
+        Args:
+            note (Note): Нотатка, змінена напряму поза менеджером
+        """
+        position = self._position(id(note))
+        if position is not None:
+            self._before_change(note)
+            self._record_change('set', position - 1, note)
+            self._reindex_title(note)
+
+    def _record_change(self, op: str, position: int, note: Optional[Note]) -> None:
+        """
+        Запам'ятовує позиційну зміну до наступного flush()
+        
+        Args:
+            op (str): Операція ('set' або 'delete')
+            position (int): Позиція нотатки у списку (починається з 0)
+            note (Optional[Note]): Змінена нотатка для 'set' або видалена для 'delete'
+        """
+        if note is not None:
+            self._serialized.pop(id(note), None)
+            self._text_stale[id(note)] = note if op == 'set' else None
+            self._tag_stale[id(note)] = note if op == 'set' else None
+            if self._positions is not None:
+                if op == 'delete':
+                    removed = self._positions.pop(id(note), None)
+                    if removed is not None:
+                        insort(self._removed_positions, removed)
+                elif id(note) not in self._positions:
+                    if position == len(self._notes) - 1:
+                        # Нова нотатка в кінці списку
+                        self._positions[id(note)] = self._next_position
+                        self._next_position += 1
+                    else:
+                        self._positions = None
+        self._pending.append((op, position, note if op == 'set' else None))
+
+    def _rebuild_lookups(self) -> List[int]:
+        """
+        Заново будує словники ID та заголовків для поточного списку нотаток
+        
+        Нотатки без ID або з повторюваним ID отримують новий.
+        
+        Returns:
+            List[int]: Позиції нотаток (починаючи з 0), яким було призначено новий ID
+        """
+        # Стабільні ID та індекс заголовків (у нижньому регістрі)
+        self._by_id: Dict[int, Note] = {}
+        self._titles: Dict[str, List[Note]] = {}
+        self._title_keys: Dict[int, str] = {}
+        self._next_id = max([self._next_id] + [note.id + 1 for note in self._notes
+                                               if note.id is not None])
+        
+        migrated = []
+        for position, note in enumerate(self._notes):
+            if note.id is None or note.id in self._by_id:
+                note.id = None
+                migrated.append(position)
+            self._index_note(note)
+        return migrated
+
+    def _index_note(self, note: Note) -> None:
+        """Призначає нотатці ID, якщо потрібно, і додає її до словників пошуку"""
+        if note.id is None or note.id in self._by_id:
+            note.id = self._next_id
+        self._next_id = max(self._next_id, note.id + 1)
+        self._by_id[note.id] = note
+        self._reindex_title(note)
+
+    def _unindex_note(self, note: Note) -> None:
+        """Видаляє нотатку зі словників ID та заголовків"""
+        self._by_id.pop(note.id, None)
+        title_key = self._title_keys.pop(note.id, None)
+        if title_key is not None:
+            self._drop_title(title_key, note)
+
+    def _drop_title(self, title_key: str, note: Note) -> None:
+        """Видаляє нотатку з кошика заголовків"""
+        bucket = self._titles.get(title_key, [])
+        for i, existing_note in enumerate(bucket):
+            if existing_note is note:
+                del bucket[i]
+                break
+        if not bucket:
+            self._titles.pop(title_key, None)
+
+    def _reindex_title(self, note: Note) -> None:
+        """Оновлює індекс заголовків після можливої зміни заголовка нотатки"""
+        title_key = note.title.lower()
+        old_key = self._title_keys.get(note.id)
+        if old_key == title_key:
+            return
+        if old_key is not None:
+            self._drop_title(old_key, note)
+        self._title_keys[note.id] = title_key
+        self._titles.setdefault(title_key, []).append(note)
+
+    def _remove_at(self, position: int) -> None:
+        """
+        Видаляє нотатку з вказаної позиції та зберігає зміну
+        
+        Словники ID, заголовків і позицій оновлюються за O(1) та O(log N);
+        лишається зсув хвоста списку в del, який виконується одним memmove
+        і на 100 тис. нотаток займає мікросекунди.
+        
+        Args:
+            position (int): Позиція нотатки у списку (починається з 0)
+        """
+        note = self._notes[position]
+        self._before_change(note)
+        del self._notes[position]
+        self._unindex_note(note)
+        self._record_change('delete', position, note)
+        if self._savepoint is not None:
+            self._savepoint[1].append((position, note))
+        self._autosave()
+
+    def _reset_indexes(self) -> None:
+        """Скидає індекси, щоб вони були побудовані заново при наступному пошуку"""
+        self._text_index = None
+        self._text_stale = {}
+        self._tag_index = None
+        self._tag_stale = {}
+        self._positions = None
+
+    def _position(self, key: int) -> Optional[int]:
+        """
+        Повертає поточний індекс нотатки (починається з 1) за id(note)
+        
+        Після видалень словник позицій не перебудовується: індекс дорівнює
+        збереженій позиції мінус кількість видалених нотаток, що стояли перед
+        нею (двійковий пошук). Повна побудова - лише після скидання індексів.
+        
+        Args:
+            key (int): id(note)
+            
+        Returns:
+            Optional[int]: Індекс нотатки або None, якщо її немає в колекції
+        """
+        if self._positions is None:
+            self._positions = {id(note): i for i, note in enumerate(self._notes, 1)}
+            self._removed_positions = []
+            self._next_position = len(self._notes) + 1
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        return position - bisect_left(self._removed_positions, position)
+
+    @staticmethod
+    def _text_fields(note: Note) -> List[Tuple[str, float]]:
+        """Повертає поля нотатки для повнотекстового індексу з їх вагами"""
+        return [(note.title, 2.0), (note.content, 1.0), (' '.join(note.tags), 1.5)]
+
+    def _refresh_text_index(self) -> None:
+        """Будує повнотекстовий індекс або оновлює в ньому змінені нотатки"""
+        if self._text_index is None:
+            self._text_index = _search_index().FullTextIndex()
+            for note in self._notes:
+                self._text_index.add(id(note), self._text_fields(note))
+        else:
+            for note_id, note in self._text_stale.items():
+                if note is not None and self._position(note_id) is not None:
+                    self._text_index.add(note_id, self._text_fields(note))
+                else:
+                    self._text_index.remove(note_id)
+        self._text_stale.clear()
+
+    def _refresh_tag_index(self) -> None:
+        """Будує індекс тегів або оновлює в ньому змінені нотатки"""
+        if self._tag_index is None:
+            self._tag_index = _search_index().TagIndex()
+            for note in self._notes:
+                self._tag_index.add(id(note), note.tags)
+        else:
+            for note_id, note in self._tag_stale.items():
+                if note is not None and self._position(note_id) is not None:
+                    self._tag_index.add(note_id, note.tags)
+                else:
+                    self._tag_index.remove(note_id)
+        self._tag_stale.clear()
+
+    def _with_positions(self, note_ids: List[int]) -> List[tuple[int, Note]]:
+        """Перетворює id нотаток з індексу на кортежі (індекс, нотатка)"""
+        positions = [self._position(note_id) for note_id in note_ids]
+        return [(position, self._notes[position - 1]) for position in positions]
+
+    def _serialize(self, note: Note) -> Dict[str, Any]:
+        """Повертає серіалізовану нотатку, використовуючи кеш для незмінених"""
+        data = self._serialized.get(id(note))
+        if data is None:
+            data = note.to_dict()
+            self._serialized[id(note)] = data
+        return data
+
+    @timed('notes.add_note')
     def add_note(self, note: Note) -> bool:
         """
         Додає нову нотатку до колекції
@@ -76,12 +646,18 @@ class NoteManager:
             bool: True, якщо нотатка була додана успішно
         """
         # Перевіряємо дублікати за точним заголовком
-        if any(existing_note.title == note.title for existing_note in self._notes):
+        bucket = self._titles.get(note.title.lower(), [])
+        if any(existing_note.title == note.title for existing_note in bucket):
             return False
-            
+        
         self._notes.append(note)
-        return self.save_notes()
+        self._index_note(note)
+        self._record_change('set', len(self._notes) - 1, note)
+        if self._savepoint is not None:
+            self._savepoint[1].append((len(self._notes) - 1, None))
+        return self._autosave()
 
+    @timed('notes.create_note')
     def create_note(self, title: str, content: str = "", tags: Optional[List[str]] = None) -> Note:
         """
         Створює та додає нову нотатку
@@ -101,6 +677,7 @@ class NoteManager:
         self.add_note(note)
         return note
 
+    @timed('notes.remove_note')
     def remove_note(self, index: int) -> bool:
         """
         Видаляє нотатку за індексом
@@ -112,11 +689,28 @@ class NoteManager:
             bool: True, якщо нотатку було видалено, False - якщо індекс неправильний
         """
         if 1 <= index <= len(self._notes):
-            del self._notes[index - 1]
-            self.save_notes()
+            self._remove_at(index - 1)
             return True
         return False
 
+    @timed('notes.remove_note_by_id')
+    def remove_note_by_id(self, note_id: int) -> bool:
+        """
+        Видаляє нотатку за стабільним ID
+        
+        Args:
+            note_id (int): ID нотатки
+            
+        Returns:
+            bool: True, якщо нотатку було видалено, False - якщо ID не знайдено
+        """
+        index = self.get_note_index(note_id)
+        if index is None:
+            return False
+        self._remove_at(index - 1)
+        return True
+
+    @timed('notes.remove_note_by_title')
     def remove_note_by_title(self, title: str) -> bool:
         """
         Видаляє першу нотатку з вказаним заголовком
@@ -127,13 +721,16 @@ class NoteManager:
         Returns:
             bool: True, якщо нотатку було видалено, False - якщо не знайдено
         """
-        for i, note in enumerate(self._notes):
-            if note.title.lower() == title.lower():
-                del self._notes[i]
-                self.save_notes()
-                return True
-        return False
+        bucket = self._titles.get(title.lower())
+        if not bucket:
+            return False
+        
+        # Перша за порядком у колекції нотатка з таким заголовком
+        position = min(self._position(id(note)) for note in bucket)
+        self._remove_at(position - 1)
+        return True
 
+    @timed('notes.edit_note')
     def edit_note(self, index: int, title: Optional[str] = None, 
                   content: Optional[str] = None, tags: Optional[List[str]] = None) -> bool:
         """
@@ -152,6 +749,8 @@ class NoteManager:
         if note is None:
             return False
         
+        self._before_change(note)
+        
         # Оновлюємо тільки ті поля, які передані
         if title is not None:
             note.title = title
@@ -160,7 +759,32 @@ class NoteManager:
         if tags is not None:
             note.tags = tags
         
-        return self.save_notes()
+        self._record_change('set', index - 1, note)
+        self._reindex_title(note)
+        return self._autosave()
+
+    @timed('notes.edit_note_by_id')
+    def edit_note_by_id(self, note_id: int, title: Optional[str] = None,
+                        content: Optional[str] = None, tags: Optional[List[str]] = None) -> bool:
+        """
+        Редагує нотатку за стабільним ID
+        
+        Args:
+            note_id (int): ID нотатки
+            title (Optional[str]): Новий заголовок (якщо не None)
+            content (Optional[str]): Новий контент (якщо не None)
+            tags (Optional[List[str]]): Нові теги (якщо не None)
+            
+        Returns:
+            bool: True, якщо нотатка була відредагована успішно
+            
+        Raises:
+            ValueError: Якщо заголовок або теги не пройшли валідацію
+        """
+        index = self.get_note_index(note_id)
+        if index is None:
+            return False
+        return self.update_note(index, title, content, tags) is not None
 
     def get_note(self, index: int) -> Optional[Note]:
         """
@@ -188,6 +812,52 @@ class NoteManager:
         """
         return self.get_note(index)
 
+    def get_note_by_id(self, note_id: int) -> Optional[Note]:
+        """
+        Повертає нотатку за стабільним ID
+        
+        На відміну від індексу, ID не змінюється після видалення інших нотаток.
+        
+        Args:
+            note_id (int): ID нотатки
+            
+        Returns:
+            Optional[Note]: Нотатка або None, якщо ID не знайдено
+        """
+        return self._by_id.get(note_id)
+
+    def get_note_index(self, note_id: int) -> Optional[int]:
+        """
+        Повертає поточний індекс нотатки з вказаним ID
+        
+        Args:
+            note_id (int): ID нотатки
+            
+        Returns:
+            Optional[int]: Індекс нотатки (починається з 1) або None, якщо ID не знайдено
+        """
+        note = self._by_id.get(note_id)
+        if note is None:
+            return None
+        return self._position(id(note))
+
+    @timed('notes.find_note_by_title')
+    def find_note_by_title(self, title: str) -> Optional[Note]:
+        """
+        Повертає першу нотатку з точно таким заголовком (без урахування регістру)
+        
+        Args:
+            title (str): Заголовок нотатки
+            
+        Returns:
+            Optional[Note]: Нотатка або None, якщо не знайдено
+        """
+        bucket = self._titles.get(title.lower())
+        if not bucket:
+            return None
+        return min(bucket, key=lambda note: self._position(id(note)))
+
+    @timed('notes.find_notes_by_title')
     def find_notes_by_title(self, title: str) -> List[tuple[int, Note]]:
         """
         Знаходить нотатки за заголовком (частковий збіг)
@@ -207,76 +877,112 @@ class NoteManager:
         
         return found_notes
 
+    @timed('notes.search_notes')
     def search_notes(self, query: str, case_sensitive: bool = False) -> List[tuple[int, Note]]:
         """
         Шукає нотатки за змістом, заголовком або тегами
         
+        Пошук іде по інвертованому індексу слів: нотатка знаходиться, якщо
+        містить слово, що починається з одного зі слів запиту (для запиту з
+        кількох слів досить одного з них). Результати впорядковані за
+        релевантністю (BM25), збіги в заголовку важать більше. Якщо за словами
+        нічого не знайдено, запит шукається як підрядок заголовка, змісту або
+        тегу, тож частина слова (тріч у "зустріч") теж знаходить нотатку.
+        
         Args:
             query (str): Пошуковий запит
-            case_sensitive (bool): Чи враховувати регістр
+            case_sensitive (bool): Чи враховувати регістр (тоді запит має
+                точно входити в заголовок, зміст або тег)
             
         Returns:
             List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
         """
+        if not query:
+            return []
+        
+        self._refresh_text_index()
         found_notes = []
         
-        for i, note in enumerate(self._notes):
-            # Шукаємо в змісті та заголовку
-            if note.search_in_content(query, case_sensitive):
-                found_notes.append((i + 1, note))
+        for note_id, _ in self._text_index.search(query):
+            position = self._position(note_id)
+            note = self._notes[position - 1]
+            if case_sensitive and not (note.search_in_content(query, True)
+                                       or any(query in tag for tag in note.tags)):
                 continue
-            
-            # Шукаємо в тегах
-            query_check = query if case_sensitive else query.lower()
-            for tag in note.tags:
-                tag_check = tag if case_sensitive else tag.lower()
-                if query_check in tag_check:
-                    found_notes.append((i + 1, note))
-                    break
+            found_notes.append((position, note))
         
+        if not found_notes:
+            found_notes = self._search_substring(query, case_sensitive)
+        return found_notes
+
+    def _search_substring(self, query: str, case_sensitive: bool) -> List[tuple[int, Note]]:
+        """Повільний пошук підрядка в усіх нотатках, коли індекс слів нічого не знайшов"""
+        query_check = query if case_sensitive else query.lower()
+        found_notes = []
+        for i, note in enumerate(self._notes):
+            if note.search_in_content(query, case_sensitive) or any(
+                    query_check in (tag if case_sensitive else tag.lower()) for tag in note.tags):
+                found_notes.append((i + 1, note))
         return found_notes
 
-    def find_notes_by_tags(self, tags: List[str], match_all: bool = False) -> List[tuple[int, Note]]:
+    @staticmethod
+    def _normalize_query_tags(tags: Optional[List[str]]) -> List[str]:
+        """Нормалізує теги запиту, пропускаючи порожні та некоректні"""
+        normalized_tags = []
+        for tag in tags or []:
+            try:
+                normalized_tag = tag.strip().lower()
+                if normalized_tag:
+                    normalized_tags.append(normalized_tag)
+            except:
+                continue
+        return normalized_tags
+
+    @timed('notes.find_notes_by_tags')
+    def find_notes_by_tags(self, tags: List[str], match_all: bool = False,
+                           exclude_tags: Optional[List[str]] = None) -> List[tuple[int, Note]]:
         """
         Знаходить нотатки за тегами
         
         Args:
             tags (List[str]): Список тегів для пошуку
             match_all (bool): Чи повинні збігатися всі теги (True) або хоча б один (False)
+            exclude_tags (Optional[List[str]]): Теги, яких у нотатки не повинно бути
             
         Returns:
             List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
         """
-        found_notes = []
-        
-        if not tags:
-            return found_notes
-        
-        # Нормалізуємо теги для пошуку
-        normalized_tags = []
-        for tag in tags:
-            try:
-                normalized_tag = tag.strip().lower()
-                if normalized_tag:
-                    normalized_tags.append(normalized_tag)
-            except:
-                continue
-        
+        normalized_tags = self._normalize_query_tags(tags)
         if not normalized_tags:
-            return found_notes
+            return []
         
-        for i, note in enumerate(self._notes):
-            if match_all:
-                # Всі теги повинні бути присутні
-                if all(tag in note.tags for tag in normalized_tags):
-                    found_notes.append((i + 1, note))
-            else:
-                # Хоча б один тег повинен бути присутній
-                if note.matches_tags(normalized_tags):
-                    found_notes.append((i + 1, note))
+        self._refresh_tag_index()
+        note_ids = self._tag_index.find(normalized_tags, match_all,
+                                        self._normalize_query_tags(exclude_tags))
+        return self._with_positions(note_ids)
+
+    @timed('notes.find_notes_by_tag_expression')
+    def find_notes_by_tag_expression(self, expression: str) -> List[tuple[int, Note]]:
+        """
+        Знаходить нотатки за булевим виразом над тегами
         
-        return found_notes
+        Підтримуються оператори AND/OR/NOT (І/ТА, АБО, НЕ або &, |, !) і дужки,
+        сусідні теги без оператора об'єднуються через AND. Тег, що збігається
+        з оператором (наприклад "та"), береться в подвійні лапки.
+        
+        Args:
+            expression (str): Вираз, наприклад "робота AND (важливо OR терміново) AND NOT архів"
+            
+        Returns:
+            List[tuple[int, Note]]: Список кортежів (індекс, нотатка)
+            
+        Raises:
+            ValueError: Якщо вираз порожній або має синтаксичну помилку
+        """
+        self._refresh_tag_index()
+        return self._with_positions(self._tag_index.query(expression))
 
+    @timed('notes.get_notes_by_tags')
     def get_notes_by_tags(self, tags: List[str], match_all: bool = False) -> List[tuple[int, Note]]:
         """
         Псевдонім для find_notes_by_tags() - для сумісності з тестами
@@ -290,6 +996,7 @@ class NoteManager:
         """
         return self.find_notes_by_tags(tags, match_all)
 
+    @timed('notes.get_all_notes')
     def get_all_notes(self, sort_by: str = 'created') -> List[tuple[int, Note]]:
         """
         Повертає всі нотатки, відсортовані за вказаним критерієм
@@ -313,6 +1020,7 @@ class NoteManager:
         
         return indexed_notes
 
+    @timed('notes.get_all_tags')
     def get_all_tags(self) -> Set[str]:
         """
         Повертає всі унікальні теги з усіх нотаток
@@ -325,6 +1033,7 @@ class NoteManager:
             all_tags.update(note.tags)
         return all_tags
 
+    @timed('notes.get_tag_statistics')
     def get_tag_statistics(self) -> Dict[str, int]:
         """
         Повертає статистику використання тегів
@@ -340,6 +1049,7 @@ class NoteManager:
         # Сортуємо за кількістю використань
         return dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True))
 
+    @timed('notes.update_note')
     def update_note(self, index: int, title: Optional[str] = None, 
                    content: Optional[str] = None, tags: Optional[List[str]] = None) -> Optional[Note]:
         """
@@ -361,8 +1071,12 @@ class NoteManager:
         if not note:
             return None
         
+        self._before_change(note)
+        self._record_change('set', index - 1, note)
+        
         if title is not None:
             note.set_title(title)
+            self._reindex_title(note)
         
         if content is not None:
             note.set_content(content)
@@ -372,9 +1086,10 @@ class NoteManager:
             for tag in tags:
                 note.add_tag(tag)
         
-        self.save_notes()
+        self._autosave()
         return note
 
+    @timed('notes.add_tag_to_note')
     def add_tag_to_note(self, index: int, tag: str) -> bool:
         """
         Додає тег до існуючої нотатки
@@ -393,10 +1108,13 @@ class NoteManager:
         if not note:
             return False
         
+        self._before_change(note)
         note.add_tag(tag)
-        self.save_notes()
+        self._record_change('set', index - 1, note)
+        self._autosave()
         return True
 
+    @timed('notes.remove_tag_from_note')
     def remove_tag_from_note(self, index: int, tag: str) -> bool:
         """
         Видаляє тег з нотатки
@@ -412,11 +1130,14 @@ class NoteManager:
         if not note:
             return False
         
+        self._before_change(note)
         if note.remove_tag(tag):
-            self.save_notes()
+            self._record_change('set', index - 1, note)
+            self._autosave()
             return True
         return False
 
+    @timed('notes.get_statistics')
     def get_statistics(self) -> Dict[str, Any]:
         """
         Повертає статистику по нотатках
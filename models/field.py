@@ -6,6 +6,10 @@ from typing import Optional
 class Field:
     """Базовий клас для всіх полів з базовою валідацією"""
     
+    # Поля створюються для кожного контакту, тому зберігаємо їх без __dict__;
+    # підкласи, що не додають атрибутів, оголошують порожні __slots__
+    __slots__ = ('value',)
+    
     def __init__(self, value: str):
         """
         Ініціалізує поле з валідацією
@@ -18,6 +22,24 @@ class Field:
         """
         self.value = self.validate(value)
 
+    @classmethod
+    def from_trusted(cls, value: str) -> 'Field':
+        """
+        Створює поле з уже валідованого та нормалізованого значення
+        
+        Використовується для даних, збережених самою програмою, щоб не
+        виконувати валідацію повторно при кожному завантаженні.
+        
+        Args:
+            value (str): Значення, отримане раніше з validate()
+            
+        Returns:
+            Field: Нове поле
+        """
+        field = object.__new__(cls)
+        field.value = value
+        return field
+
     def validate(self, value: str) -> str:
         """
         Базова валідація - перевіряє, що значення не порожнє
@@ -45,6 +67,8 @@ class Field:
 class Name(Field):
     """Клас для валідації імен"""
     
+    __slots__ = ()
+    
     def validate(self, value: str) -> str:
         """
         Валідація імені - має містити тільки літери та пробіли
@@ -78,6 +102,8 @@ class Name(Field):
 class Phone(Field):
     """Клас для валідації телефонних номерів"""
     
+    __slots__ = ()
+    
     def validate(self, value: str) -> str:
         """
         Валідація телефонного номера
@@ -121,6 +147,8 @@ class Phone(Field):
 class Email(Field):
     """Клас для валідації email адрес"""
     
+    __slots__ = ()
+    
     def validate(self, value: str) -> str:
         """
         Валідація email адреси
@@ -147,6 +175,9 @@ class Email(Field):
 class Birthday(Field):
     """Клас для валідації дат народження"""
     
+    # Розібрана дата разом з рядком, з якого її отримано (див. to_date)
+    __slots__ = ('_parsed',)
+    
     def validate(self, value: str) -> str:
         """
         Валідація дати народження
@@ -191,15 +222,32 @@ class Birthday(Field):
         """
         Конвертує дату з рядка у datetime об'єкт
         
+        Дата розбирається лише при першому виклику: результат кешується
+        разом з рядком, тому зміна value скидає кеш.
+        
         Returns:
             datetime: Дата як datetime об'єкт
         """
-        return datetime.strptime(self.value, '%d.%m.%Y')
+        value = self.value
+        parsed = getattr(self, '_parsed', None)  # Поля з from_trusted() кешу не мають
+        if parsed is None or parsed[0] != value:
+            # Значення вже нормалізоване до DD.MM.YYYY - розбираємо без strptime,
+            # який у кілька разів повільніший
+            parts = value.split('.')
+            if len(parts) == 3 and all(part.isdigit() for part in parts):
+                day, month, year = parts
+                result = datetime(int(year), int(month), int(day))
+            else:
+                result = datetime.strptime(value, '%d.%m.%Y')  # Кидає ту саму помилку формату
+            parsed = self._parsed = (value, result)
+        return parsed[1]
 
 
 class Address(Field):
     """Клас для валідації адрес"""
     
+    __slots__ = ()
+    
     def validate(self, value: str) -> str:
         """
         Валідація адреси - базова перевірка на мінімальну довжину
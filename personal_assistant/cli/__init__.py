@@ -2,6 +2,12 @@
 CLI interface package
 """
 
-from .interface import PersonalAssistantCLI
+__all__ = ['PersonalAssistantCLI']
 
-__all__ = ['PersonalAssistantCLI']
\ No newline at end of file
+
+def __getattr__(name):
+    """Імпортує інтерфейс лише при першому зверненні, щоб клієнт сервера запускався швидко"""
+    if name == 'PersonalAssistantCLI':
+        from .interface import PersonalAssistantCLI
+        return PersonalAssistantCLI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,19 +7,81 @@
     python main.py --help       # Показати довідку
     python main.py --demo       # Демонстраційний режим
     python main.py --test       # Швидкий тест функціональності
+    python main.py --serve      # Сервер, що тримає дані завантаженими
+    python main.py --send "показати нотатки"   # Команда запущеному серверу
+    python main.py --batch ops.jsonl            # Пакетні операції з JSON lines
+    python main.py --startup-report             # Час імпортів і запуску
+    python main.py --write-behind               # Зберігати зміни у фоні
+    python main.py --metrics metrics.json       # Метрики часу операцій
+    python main.py --profile-out session        # Профіль сесії (pstats і flamegraph)
+    python main.py --trace-alloc                # Виділення пам'яті при завантаженні
 """
 
 import sys
 import argparse
+import atexit
 import os
 
 # Додаємо поточну директорію до Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from .cli.interface import PersonalAssistantCLI
-except ImportError:
-    from cli.interface import PersonalAssistantCLI
+
+def _create_cli(write_behind=None):
+    """Створює PersonalAssistantCLI, імпортуючи інтерфейс лише коли він потрібен"""
+    try:
+        from .cli.interface import PersonalAssistantCLI
+    except ImportError:
+        from cli.interface import PersonalAssistantCLI
+    return PersonalAssistantCLI(write_behind)
+
+def _daemon_module():
+    """Імпортує модуль сервера без завантаження менеджерів"""
+    try:
+        from .cli import daemon
+    except ImportError:
+        from cli import daemon
+    return daemon
+
+def _batch_module():
+    """Імпортує пакетний режим без інтерфейсу CLI та розпізнавання команд"""
+    try:
+        from .cli import batch
+    except ImportError:
+        from cli import batch
+    return batch
+
+def _enable_metrics(path=None):
+    """Вмикає збирання метрик; з path записує їх у JSON при виході з програми"""
+    # Абсолютний імпорт: менеджери та сховище пишуть саме в цей реєстр
+    from utils.metrics import metrics
+    metrics.enable()
+    if path:
+        atexit.register(metrics.dump, path)
+
+def _profiling_module():
+    """Імпортує модуль профілювання лише з опціями --profile / --trace-alloc"""
+    try:
+        from .utils import profiling
+    except ImportError:
+        from utils import profiling
+    return profiling
+
+def _start_profiler(output):
+    """Профілює решту сесії; результати записуються при виході з програми"""
+    profiler = _profiling_module().SessionProfiler(output)
+    
+    def finish():
+        try:
+            pstats_path, collapsed_path = profiler.stop()
+        except OSError as e:
+            print(f"❌ Не вдалося записати профіль: {e}", file=sys.stderr)
+            return
+        print(profiler.summary(), file=sys.stderr)
+        print(f"📈 Профіль збережено: {pstats_path} (pstats), {collapsed_path} (flamegraph)",
+              file=sys.stderr)
+    
+    atexit.register(finish)
+    profiler.start()
 
 def show_help():
     """Показує довідку по використанню"""
@@ -42,6 +104,30 @@ def show_help():
 Показати цю довідку:
     python main.py --help
 
+Сервер, що завантажує дані один раз, і команди до нього:
+    python main.py --serve
+    python main.py --send "показати контакти"
+    python main.py --send "додати нотатку" --answer "Заголовок" --answer "теги"
+    python main.py --stop-server
+
+Пакетні операції з файлу або stdin (рядки JSON, один запис наприкінці):
+    python main.py --batch ops.jsonl
+    cat ops.jsonl | python main.py --batch - > results.jsonl
+
+Звіт про час запуску (імпорти модулів та відкладене завантаження даних):
+    python main.py --startup-report
+
+Метрики часу операцій (команда statistics, JSON при виході):
+    python main.py --metrics
+    python main.py --batch ops.jsonl --metrics metrics.json
+
+Профіль сесії (cProfile у .pstats, згорнуті стеки для flamegraph у .collapsed):
+    python main.py --profile
+    python main.py --batch ops.jsonl --profile-out batch
+
+Найбільші виділення пам'яті при завантаженні контактів і нотаток:
+    python main.py --trace-alloc 20
+
 ═══════════════════════════════════════════════════════════════
 🎂 ОСНОВНІ КОМАНДИ В ПРОГРАМІ
 ═══════════════════════════════════════════════════════════════
@@ -62,6 +148,7 @@ def show_help():
   • delete note       - Видалити нотатку
 
 Інші команди:
+  • statistics        - Статистика (і метрики з --metrics)
   • help              - Показати довідку в програмі
   • exit              - Вийти з програми
 
@@ -86,9 +173,92 @@ def run_demo():
     print("Спробуйте команду 'birthdays' для перегляду днів народження!")
     print("=" * 50)
     
-    cli = PersonalAssistantCLI()
+    cli = _create_cli()
     cli.run()
 
+def run_server(socket_path=None):
+    """Запускає сервер, що тримає менеджери завантаженими між викликами"""
+    daemon_module = _daemon_module()
+    try:
+        daemon = daemon_module.AssistantDaemon(socket_path)
+        print(f"🛰️ Сервер слухає {daemon.socket_path} (зупинка: --stop-server або Ctrl+C)")
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Сервер зупинено")
+    except OSError as e:
+        print(f"❌ Не вдалося запустити сервер: {e}")
+        sys.exit(1)
+
+def run_client(command, answers, socket_path=None):
+    """Виконує команду на запущеному сервері та друкує результат"""
+    daemon_module = _daemon_module()
+    
+    def ask(prompt):
+        try:
+            return input(prompt)
+        except EOFError:
+            return None
+    
+    try:
+        result = daemon_module.send_command(command, answers, socket_path, ask)
+    except (ConnectionError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if result:
+        print(result)
+
+def stop_server(socket_path=None):
+    """Зупиняє запущений сервер"""
+    try:
+        stopped = _daemon_module().stop_daemon(socket_path)
+    except OSError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if stopped:
+        print("✅ Сервер зупинено")
+    else:
+        print("❌ Сервер не запущено")
+        sys.exit(1)
+
+def show_startup_report():
+    """Друкує звіт про час імпортів та етапів запуску (як python -X importtime)"""
+    import subprocess
+    try:
+        from .utils import startup
+    except ImportError:
+        from utils import startup
+    try:
+        report = startup.startup_report()
+    except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+        print(f"❌ Не вдалося виміряти запуск: {e}")
+        sys.exit(1)
+    print(startup.format_report(report))
+
+def show_allocation_report(limit):
+    """Друкує місця найбільших виділень пам'яті в load_contacts / load_notes"""
+    profiling = _profiling_module()
+    report = profiling.allocation_report(_create_cli(), limit)
+    print(profiling.format_allocation_report(report))
+
+def run_batch(source):
+    """Виконує операції з файлу JSON lines (або stdin для '-') і друкує результати"""
+    batch_module = _batch_module()
+    processor = batch_module.BatchProcessor.from_storage()
+    
+    try:
+        if source == '-':
+            success = processor.run(sys.stdin, sys.stdout)
+        else:
+            with open(source, 'r', encoding='utf-8') as input_file:
+                success = processor.run(input_file, sys.stdout)
+    except OSError as e:
+        print(f"❌ Не вдалося прочитати {source}: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if not success:
+        sys.exit(1)
+
 def run_test():
     """Запускає швидкий тест функціональності"""
     print("🧪 ШВИДКИЙ ТЕСТ ФУНКЦІОНАЛЬНОСТІ")
@@ -102,7 +272,7 @@ def run_test():
         print("❌ Тестові файли не знайдено")
         print("Запускаємо базовий тест...")
         
-        cli = PersonalAssistantCLI()
+        cli = _create_cli()
         total_contacts = len(cli.contact_manager._contacts)
         contacts_with_birthdays = [c for c in cli.contact_manager._contacts if c.birthday]
         
@@ -130,9 +300,48 @@ def main():
                        help='Запустити тест функціональності')
     parser.add_argument('--help-full', action='store_true',
                        help='Показати повну довідку')
+    parser.add_argument('--serve', action='store_true',
+                       help='Запустити сервер, що тримає дані завантаженими між викликами')
+    parser.add_argument('--send', metavar='КОМАНДА',
+                       help='Виконати команду на запущеному сервері')
+    parser.add_argument('--answer', action='append', default=[], metavar='ТЕКСТ',
+                       help='Відповідь на підказку команди для --send (можна вказати кілька разів)')
+    parser.add_argument('--socket', metavar='ШЛЯХ',
+                       help='Шлях до сокета сервера')
+    parser.add_argument('--stop-server', action='store_true',
+                       help='Зупинити запущений сервер')
+    parser.add_argument('--batch', metavar='ФАЙЛ',
+                       help="Виконати операції з файлу JSON lines ('-' - зі stdin)")
+    parser.add_argument('--startup-report', action='store_true',
+                       help='Показати час імпортів і етапів запуску')
+    parser.add_argument('--write-behind', nargs='?', type=float, const=0.5, metavar='СЕКУНДИ',
+                       help='Зберігати зміни у фоновому потоці після паузи (за замовчуванням 0.5 с; '
+                            'лише в інтерактивному режимі)')
+    parser.add_argument('--metrics', nargs='?', const='', metavar='ФАЙЛ',
+                       help='Збирати метрики часу операцій (команда statistics); '
+                            'з ФАЙЛ - записати їх у JSON при виході')
+    parser.add_argument('--profile', action='store_true',
+                       help='Профілювати сесію (cProfile і вибірка стеків для flamegraph)')
+    parser.add_argument('--profile-out', metavar='ПРЕФІКС',
+                       help='Префікс файлів профілю: ПРЕФІКС.pstats і ПРЕФІКС.collapsed '
+                            '(вмикає --profile; за замовчуванням profile)')
+    parser.add_argument('--trace-alloc', nargs='?', type=int, const=10, metavar='N',
+                       help="Показати N найбільших місць виділення пам'яті при завантаженні "
+                            "контактів і нотаток (за замовчуванням 10)")
     
     args = parser.parse_args()
     
+    # Фоновий запис є лише в інтерактивному режимі; пакетний режим і сервер
+    # зберігають зміни самі
+    if args.write_behind is not None and (args.batch is not None or args.serve or args.send is not None):
+        parser.error("--write-behind працює лише в інтерактивному режимі")
+    
+    if args.metrics is not None:
+        _enable_metrics(args.metrics)
+    
+    if args.profile or args.profile_out:
+        _start_profiler(args.profile_out or 'profile')
+    
     # Обробляємо аргументи
     if args.help_full:
         show_help()
@@ -146,6 +355,30 @@ def main():
         run_demo()
         return
     
+    if args.serve:
+        run_server(args.socket)
+        return
+    
+    if args.send is not None:
+        run_client(args.send, args.answer, args.socket)
+        return
+    
+    if args.stop_server:
+        stop_server(args.socket)
+        return
+    
+    if args.startup_report:
+        show_startup_report()
+        return
+    
+    if args.trace_alloc is not None:
+        show_allocation_report(args.trace_alloc)
+        return
+    
+    if args.batch is not None:
+        run_batch(args.batch)
+        return
+    
     # За замовчуванням запускаємо інтерактивний режим
     print("🚀 ПЕРСОНАЛЬНИЙ ПОМІЧНИК")
     print("=" * 40)
@@ -154,7 +387,7 @@ def main():
     print("=" * 40)
     
     try:
-        cli = PersonalAssistantCLI()
+        cli = _create_cli(args.write_behind)
         cli.run()
     except KeyboardInterrupt:
         print("\n\n👋 Дякуємо за використання програми!")
@@ -2,8 +2,9 @@
 Менеджер для управління контактами
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import date
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Dict, Any, Set, Tuple
+from datetime import date, timedelta
 import sys
 from pathlib import Path
 
@@ -14,7 +15,20 @@ if str(dev_dir) not in sys.path:
     sys.path.insert(0, str(dev_dir))
 
 from models.contact import Contact
-from storage.file_storage import FileStorage
+from storage.file_storage import Change, FileStorage
+from utils.gc_utils import paused_gc
+from utils.metrics import timed
+from utils.validators import normalize_phone_for_search, normalize_phone_prefix_for_search
+
+if TYPE_CHECKING:
+    from managers.write_behind import WriteBehind
+    from utils.search_index import BirthdayIndex, PhoneIndex, TrigramIndex
+
+
+def _search_index():
+    """Імпортує модуль пошукових індексів лише при першому пошуку"""
+    from utils import search_index
+    return search_index
 
 
 class ContactManager:
@@ -25,48 +39,441 @@ class ContactManager:
     а також їх збереження на диску.
     """
 
-    def __init__(self, storage: FileStorage):
+    def __init__(self, storage: FileStorage, write_behind: Optional['WriteBehind'] = None):
         """
         Ініціалізує менеджер контактів з вказаним сховищем
         
         Args:
             storage (FileStorage): Об'єкт для збереження даних
+            write_behind (Optional[WriteBehind]): Фоновий запис; якщо задано,
+                зміни після команд записуються ним із затримкою, а не одразу
         """
         self.storage = storage
-        self._contacts: List[Contact] = []  # Змінюємо на список для тестів
-        self._contacts_by_name: Dict[str, Contact] = {}  # Для швидкого пошуку
-        self.load_contacts()
+        self._write_behind = write_behind
+        # _contacts (список) та _contacts_by_name (для швидкого пошуку) з'являються
+        # при першому зверненні - див. __getattr__
+        self._serialized: Dict[str, Dict[str, Any]] = {}  # Кеш to_dict() за ключем імені
+        self._dirty: Set[str] = set()  # Ключі контактів, змінених після збереження
+        self._batch_depth = 0
+        self._batch_preimages: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._batch_order: List[Contact] = []
+        self._batch_flushed = False
+        # Стан savepoint(): знімки контактів до зміни та журнал змін порядку
+        # списку (позиція, видалений контакт або None для доданого)
+        self._savepoint: Optional[Tuple[Dict[str, Optional[Dict[str, Any]]],
+                                        List[Tuple[int, Optional[Contact]]]]] = None
+        # Пошукові індекси будуються при першому пошуку
+        self._search_index: Optional['TrigramIndex'] = None
+        self._phone_index: Optional['PhoneIndex'] = None
+        self._index_stale: Set[str] = set()
+        self._birthday_index: Optional['BirthdayIndex'] = None
+        self._birthday_stale: Set[str] = set()
+        # Менеджер зберігає лише валідовані контакти, тому незмінений файл
+        # можна завантажувати без повторної валідації
+        if hasattr(storage, 'register_schema'):
+            storage.register_schema('contacts', Contact.SCHEMA_VERSION)
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Завантажує контакти при першому зверненні до колекції
+        
+        Викликається лише для атрибутів, яких ще немає, тому після
+        завантаження доступ до контактів не має додаткових витрат.
+        """
+        if name in ('_contacts', '_contacts_by_name'):
+            self.load_contacts()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def loaded(self) -> bool:
+        """Повертає True, якщо контакти вже завантажено зі сховища"""
+        return '_contacts' in self.__dict__
 
+    @timed('contacts.load_contacts')
     def load_contacts(self) -> None:
         """Завантажує контакти з файлового сховища"""
-        try:
-            contacts_data = self.storage.load_data('contacts')
-            if isinstance(contacts_data, dict):
-                for contact_data in contacts_data.values():
-                    try:
-                        contact = Contact.from_dict(contact_data)
-                        name_key = contact.name.value.lower()
-                        if name_key not in self._contacts_by_name:
-                            self._contacts.append(contact)
-                            self._contacts_by_name[name_key] = contact
-                    except (ValueError, KeyError) as e:
-                        print(f"Помилка завантаження контакту: {e}")
-        except Exception as e:
-            print(f"Помилка завантаження контактів: {e}")
-            # Залишаємо порожні списки при помилці - вже ініціалізовані
+        if self._write_behind is not None:
+            self._write_behind.flush()  # Файл має містити всі відкладені зміни
+        if not self.loaded:
+            self._contacts: List[Contact] = []  # Змінюємо на список для тестів
+            self._contacts_by_name: Dict[str, Contact] = {}
+        self._reset_indexes()
+        # Розбір JSON і створення об'єктів породжують лише довгоживучі об'єкти
+        with paused_gc():
+            try:
+                try:
+                    self._read_contacts(hasattr(self.storage, 'stream_trusted'))
+                except ValueError:
+                    # Пошкодження помічено посеред потоку - повне завантаження
+                    # вміє відновлювати файл з резервної копії
+                    self._contacts.clear()
+                    self._contacts_by_name.clear()
+                    self._read_contacts(False)
+            except Exception as e:
+                print(f"Помилка завантаження контактів: {e}")
+                # Залишаємо порожні списки при помилці - вже ініціалізовані
+
+    def _read_contacts(self, stream: bool) -> None:
+        """
+        Створює контакти з записів сховища
+        
+        Args:
+            stream (bool): Чи розбирати файл потоково, запис за записом
+            
+        Raises:
+            ValueError: Якщо файл пошкоджено посеред потокового розбору
+        """
+        if stream:
+            records, trusted = self.storage.stream_trusted('contacts')
+        else:
+            if hasattr(self.storage, 'load_trusted'):
+                contacts_data, trusted = self.storage.load_trusted('contacts')
+            else:
+                contacts_data, trusted = self.storage.load_data('contacts'), False
+            records = contacts_data.items() if isinstance(contacts_data, dict) else ()
+        
+        from_dict = Contact.from_trusted_dict if trusted else Contact.from_dict
+        for key, contact_data in records:
+            if not isinstance(key, str):
+                break  # Контакти зберігаються лише у файлі-словнику
+            try:
+                contact = from_dict(contact_data)
+                name_key = contact.name.value.lower()
+                if name_key not in self._contacts_by_name:
+                    self._contacts.append(contact)
+                    self._contacts_by_name[name_key] = contact
+            except (ValueError, KeyError) as e:
+                print(f"Помилка завантаження контакту: {e}")
 
+    @timed('contacts.save_contacts')
     def save_contacts(self) -> bool:
-        """Зберігає контакти у файлове сховище"""
+        """
+        Зберігає всю колекцію контактів у файлове сховище
+        
+        Усі контакти серіалізуються заново, тому метод підходить і після
+        прямої зміни об'єктів Contact поза менеджером.
+        
+        Returns:
+            bool: True, якщо збереження успішне
+        """
         try:
+            if self._write_behind is not None:
+                self._write_behind.flush()
+            self._serialized.clear()
             contacts_data = {
-                contact.name.value.lower(): contact.to_dict() 
+                contact.name.value.lower(): self._serialize(contact)
                 for contact in self._contacts
             }
-            return self.storage.save_data('contacts', contacts_data)
+            saved = self.storage.save_data('contacts', contacts_data)
+            if saved:
+                self._dirty.clear()
+                if self._write_behind is not None:
+                    # Повний знімок новіший за зміни, яких не вдалося записати
+                    self._write_behind.discard('contacts')
+                if self._batch_depth:
+                    self._batch_flushed = True
+            return saved
         except Exception as e:
             print(f"Помилка збереження контактів: {e}")
             return False
 
+    @timed('contacts.flush')
+    def flush(self) -> bool:
+        """
+        Зберігає лише контакти, змінені з моменту останнього збереження
+        
+        Для сховищ з інкрементальним збереженням записуються тільки змінені
+        контакти. Інакше файл зберігається повністю, але незмінені контакти
+        беруться з кешу серіалізованих словників. При відкладеному записі
+        метод чекає, доки фоновий запис передасть сховищу всі зміни.
+        
+        Returns:
+            bool: True, якщо збереження успішне
+        """
+        if self._write_behind is not None:
+            self._submit_changes()
+            return self._write_behind.flush()
+        if not self._dirty:
+            return True
+        
+        try:
+            if getattr(self.storage, 'supports_incremental', False):
+                saved = self.storage.apply_changes('contacts', self._changes())
+            else:
+                contacts_data = {
+                    contact.name.value.lower(): self._serialize(contact)
+                    for contact in self._contacts
+                }
+                saved = self.storage.save_data('contacts', contacts_data)
+        except Exception as e:
+            print(f"Помилка збереження контактів: {e}")
+            return False
+        
+        if saved:
+            self._dirty.clear()
+            if self._batch_depth:
+                self._batch_flushed = True
+        return saved
+
+    def _changes(self) -> List[Change]:
+        """Повертає зміни для контактів, позначених зміненими"""
+        changes = []
+        for name_key in self._dirty:
+            contact = self._contacts_by_name.get(name_key)
+            if contact is None:
+                changes.append(('delete', name_key, None))
+            else:
+                changes.append(('set', name_key, self._serialize(contact)))
+        return changes
+
+    def _submit_changes(self) -> bool:
+        """Передає зміни фоновому запису; вартість залежить лише від кількості змін"""
+        if self._dirty:
+            self._write_behind.submit('contacts', self._changes())
+            self._dirty.clear()
+            if self._batch_depth:
+                self._batch_flushed = True
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator['ContactManager']:
+        """
+        Групує кілька змін в одне збереження
+        
+        Всередині блоку add_contact, remove_contact та update_contact не
+        зберігають дані після кожного виклику; всі зміни записуються один раз
+        при виході з блоку. Якщо в блоці виникає виняток, стан контактів
+        у пам'яті відкочується до початку блоку.
+        
+        Yields:
+            ContactManager: Цей менеджер
+        """
+        if self._batch_depth:
+            # Вкладений блок є частиною зовнішнього
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        self.flush()
+        self._batch_order = list(self._contacts)
+        self._batch_preimages = {}
+        self._batch_flushed = False
+        self._batch_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth = 0
+            self._rollback_batch()
+            raise
+        else:
+            self._batch_depth = 0
+            self.flush()
+        finally:
+            self._batch_order = []
+            self._batch_preimages = {}
+
+    def _rollback_batch(self) -> None:
+        """Відновлює контакти, змінені в межах блоку batch()"""
+        restored = {}
+        for name_key, data in self._batch_preimages.items():
+            if data is not None:
+                restored[name_key] = Contact.from_dict(data)
+            self._serialized.pop(name_key, None)
+        
+        self._contacts = [
+            restored.get(contact.name.value.lower(), contact)
+            for contact in self._batch_order
+        ]
+        self._contacts_by_name = {
+            contact.name.value.lower(): contact for contact in self._contacts
+        }
+        self._reset_indexes()
+        
+        if self._batch_flushed:
+            # Частину змін вже записано явним flush() - перезаписуємо відновлені
+            self._dirty = set(self._batch_preimages)
+            self.flush()
+        else:
+            self._dirty.clear()
+
+    @contextmanager
+    def savepoint(self) -> Iterator['ContactManager']:
+        """
+        Відкочує лише зміни цього блоку, якщо в ньому виникає виняток
+        
+        Всередині batch() зміни з блоку залишаються частиною пакета, але при
+        винятку контакти повертаються до стану на початок блоку, не зачіпаючи
+        попередніх змін пакета. Вартість успішного блоку залежить лише від
+        кількості змін у ньому. Поза batch() працює як batch().
+        
+        Yields:
+            ContactManager: Цей менеджер
+        """
+        if not self._batch_depth:
+            with self.batch():
+                yield self
+            return
+        
+        outer = self._savepoint
+        self._savepoint = ({}, [])
+        try:
+            yield self
+        except BaseException:
+            self._rollback_savepoint(*self._savepoint)
+            raise
+        else:
+            if outer is not None:
+                # Зміни вкладеного блоку стають частиною зовнішнього
+                for name_key, data in self._savepoint[0].items():
+                    outer[0].setdefault(name_key, data)
+                outer[1].extend(self._savepoint[1])
+        finally:
+            self._savepoint = outer
+
+    def _rollback_savepoint(self, preimages: Dict[str, Optional[Dict[str, Any]]],
+                            order_log: List[Tuple[int, Optional[Contact]]]) -> None:
+        """Відновлює контакти, змінені в межах блоку savepoint()"""
+        if not preimages and not order_log:
+            return  # Операція завершилась помилкою, нічого не змінивши
+        # Відновлюємо порядок списку, скасовуючи додавання та видалення у
+        # зворотному порядку
+        for position, contact in reversed(order_log):
+            if contact is None:
+                del self._contacts[position]
+            else:
+                self._contacts.insert(position, contact)
+        
+        restored = {}
+        for name_key, data in preimages.items():
+            if data is None:
+                self._contacts_by_name.pop(name_key, None)
+            else:
+                restored[name_key] = self._contacts_by_name[name_key] = Contact.from_dict(data)
+            self._serialized.pop(name_key, None)
+        if restored:
+            self._contacts = [
+                restored.get(contact.name.value.lower(), contact)
+                for contact in self._contacts
+            ]
+        
+        # Відновлені контакти записуються заново при виході з batch()
+        self._dirty.update(preimages)
+        self._index_stale.update(preimages)
+        self._birthday_stale.update(preimages)
+
+    def _autosave(self) -> bool:
+        """
+        Зберігає зміни одразу (або передає фоновому запису), якщо менеджер
+        не знаходиться в блоці batch()
+        """
+        if self._batch_depth:
+            return True
+        if self._write_behind is not None:
+            return self._submit_changes()
+        return self.flush()
+
+    def mark_dirty(self, name: str) -> None:
+        """
+        Позначає контакт зміненим, щоб наступний flush() зберіг його
+        
+        Всередині batch() викликайте до зміни об'єкта, щоб відкат
+        відновив попередній стан.
+        
+        Args:
+            name (str): Ім'я контакту, зміненого напряму через об'єкт Contact
+        """
+        name_key = name.lower()
+        if self._batch_depth and (
+                name_key not in self._batch_preimages
+                or (self._savepoint is not None and name_key not in self._savepoint[0])):
+            # Запам'ятовуємо стан до зміни для відкату блоку batch() та savepoint()
+            contact = self._contacts_by_name.get(name_key)
+            data = contact.to_dict() if contact else None
+            self._batch_preimages.setdefault(name_key, data)
+            if self._savepoint is not None:
+                self._savepoint[0].setdefault(name_key, data)
+        self._dirty.add(name_key)
+        self._serialized.pop(name_key, None)
+        self._index_stale.add(name_key)
+        self._birthday_stale.add(name_key)
+
+    def _reset_indexes(self) -> None:
+        """Скидає пошукові індекси; вони перебудуються при наступному запиті"""
+        self._search_index = None
+        self._phone_index = None
+        self._index_stale.clear()
+        self._birthday_index = None
+        self._birthday_stale.clear()
+
+    @staticmethod
+    def _search_fields(contact: Contact) -> List[str]:
+        """Повертає поля контакту для пошуку у нижньому регістрі"""
+        fields = [contact.name.value.lower()]
+        fields.extend(phone.value for phone in contact.phones)
+        fields.extend(email.value.lower() for email in contact.emails)
+        if contact.email:
+            fields.append(contact.email.value.lower())
+        if contact.address:
+            fields.append(contact.address.value.lower())
+        return fields
+
+    def _refresh_indexes(self) -> None:
+        """Будує пошукові індекси або оновлює в них змінені контакти"""
+        if self._search_index is None:
+            indexes = _search_index()
+            self._search_index = indexes.TrigramIndex()
+            self._phone_index = indexes.PhoneIndex()
+            stale = [contact.name.value.lower() for contact in self._contacts]
+        else:
+            stale = self._index_stale
+        
+        for name_key in stale:
+            contact = self._contacts_by_name.get(name_key)
+            if contact is None:
+                self._search_index.remove(name_key)
+                self._phone_index.remove(name_key)
+            else:
+                self._search_index.add(name_key, self._search_fields(contact))
+                self._phone_index.add(
+                    name_key,
+                    [normalize_phone_for_search(phone.value) for phone in contact.phones]
+                )
+        self._index_stale.clear()
+
+    def _refresh_birthday_index(self) -> None:
+        """Будує індекс днів народження або оновлює в ньому змінені контакти"""
+        if self._birthday_index is None:
+            self._birthday_index = _search_index().BirthdayIndex()
+            stale = [contact.name.value.lower() for contact in self._contacts]
+        else:
+            stale = self._birthday_stale
+        
+        for name_key in stale:
+            contact = self._contacts_by_name.get(name_key)
+            if contact is None:
+                self._birthday_index.forget(name_key)
+            elif contact.birthday is None:
+                self._birthday_index.remove(name_key)
+            else:
+                # Дата вже нормалізована до DD.MM.YYYY, strptime не потрібен
+                day, month, _ = contact.birthday.value.split('.')
+                self._birthday_index.add(name_key, int(month), int(day))
+        self._birthday_stale.clear()
+
+    def _serialize(self, contact: Contact) -> Dict[str, Any]:
+        """Повертає серіалізований контакт, використовуючи кеш для незмінених"""
+        name_key = contact.name.value.lower()
+        data = self._serialized.get(name_key)
+        if data is None:
+            data = contact.to_dict()
+            self._serialized[name_key] = data
+        return data
+
+    @timed('contacts.add_contact')
     def add_contact(self, contact: Contact) -> bool:
         """
         Додає новий контакт до колекції
@@ -82,11 +489,15 @@ class ContactManager:
         if name_key in self._contacts_by_name:
             return False  # Тихо ігноруємо дублікати замість exception
         
+        self.mark_dirty(name_key)
         self._contacts.append(contact)
         self._contacts_by_name[name_key] = contact
-        self.save_contacts()
+        if self._savepoint is not None:
+            self._savepoint[1].append((len(self._contacts) - 1, None))
+        self._autosave()
         return True
 
+    @timed('contacts.remove_contact')
     def remove_contact(self, name: str) -> bool:
         """
         Видаляє контакт з колекції
@@ -100,13 +511,18 @@ class ContactManager:
         name_key = name.lower()
         
         if name_key in self._contacts_by_name:
+            self.mark_dirty(name_key)
             contact = self._contacts_by_name[name_key]
-            self._contacts.remove(contact)
+            position = self._contacts.index(contact)
+            del self._contacts[position]
             del self._contacts_by_name[name_key]
-            self.save_contacts()
+            if self._savepoint is not None:
+                self._savepoint[1].append((position, contact))
+            self._autosave()
             return True
         return False
 
+    @timed('contacts.find_contact')
     def find_contact(self, name: str) -> Optional[Contact]:
         """
         Знаходить контакт за точним ім'ям
@@ -119,6 +535,7 @@ class ContactManager:
         """
         return self._contacts_by_name.get(name.lower())
 
+    @timed('contacts.search_contacts')
     def search_contacts(self, query: str) -> List[Contact]:
         """
         Шукає контакти за частковим збігом у різних полях
@@ -132,42 +549,67 @@ class ContactManager:
         if not query:
             return self._contacts.copy()
         
-        query_lower = query.lower()
-        found_contacts = []
+        # Шукаємо в імені, телефонах, emails та адресі через індекс триграм.
+        # Телефони містять лише цифри та '+', тому запит у нижньому регістрі
+        # дає той самий результат, що й порівняння з оригінальним запитом.
+        self._refresh_indexes()
+        name_keys = self._search_index.search(query.lower())
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
+
+    @timed('contacts.find_contacts_by_phone')
+    def find_contacts_by_phone(self, phone: str) -> List[Contact]:
+        """
+        Знаходить контакти за повним номером телефону в будь-якому форматі
+        
+        Args:
+            phone (str): Номер телефону (+380XXXXXXXXX, 380XXXXXXXXX або 0XXXXXXXXX)
+            
+        Returns:
+            List[Contact]: Список контактів з цим номером
+        """
+        self._refresh_indexes()
+        name_keys = self._phone_index.find_exact(normalize_phone_for_search(phone))
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
+
+    @timed('contacts.find_contacts_by_phone_prefix')
+    def find_contacts_by_phone_prefix(self, prefix: str) -> List[Contact]:
+        """
+        Знаходить контакти, номер яких починається з вказаних цифр
         
-        for contact in self._contacts:
-            # Пошук в імені
-            if query_lower in contact.name.value.lower():
-                found_contacts.append(contact)
-                continue
+        Args:
+            prefix (str): Початок номера, наприклад "050" або "+38067"
             
-            # Пошук у телефонах
-            for phone in contact.phones:
-                if query in phone.value:
-                    found_contacts.append(contact)
-                    break
-            else:
-                # Пошук в emails (список)
-                found_in_emails = False
-                for email in contact.emails:
-                    if query_lower in email.value.lower():
-                        found_contacts.append(contact)
-                        found_in_emails = True
-                        break
-                
-                if not found_in_emails:
-                    # Пошук в одиночному email (для сумісності з тестами)
-                    if (contact.email and 
-                        query_lower in contact.email.value.lower()):
-                        found_contacts.append(contact)
-                    else:
-                        # Пошук в адресі
-                        if (contact.address and 
-                            query_lower in contact.address.value.lower()):
-                            found_contacts.append(contact)
-        
-        return found_contacts
+        Returns:
+            List[Contact]: Список контактів, відсортований за номером
+        """
+        normalized = normalize_phone_prefix_for_search(prefix)
+        if not normalized:
+            return []
+        
+        self._refresh_indexes()
+        name_keys = self._phone_index.find_prefix(normalized)
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
 
+    @timed('contacts.find_contacts_by_phone_suffix')
+    def find_contacts_by_phone_suffix(self, digits: str) -> List[Contact]:
+        """
+        Знаходить контакти за останніми цифрами номера
+        
+        Args:
+            digits (str): Останні цифри номера, наприклад "4567"
+            
+        Returns:
+            List[Contact]: Список контактів з номером, що закінчується цими цифрами
+        """
+        digits = ''.join(char for char in digits if char.isdigit())
+        if not digits:
+            return []
+        
+        self._refresh_indexes()
+        name_keys = self._phone_index.find_suffix(digits)
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
+
+    @timed('contacts.get_all_contacts')
     def get_all_contacts(self, sort_by: str = 'name') -> List[Contact]:
         """
         Повертає всі контакти, відсортовані за вказаним критерієм
@@ -184,16 +626,19 @@ class ContactManager:
             contacts.sort(key=lambda c: c.name.value.lower())
         elif sort_by == 'birthday':
             # Спочатку контакти з днями народження, потім без
+            today = date.today()
+            
             def birthday_key(contact):
                 if contact.birthday is None:
                     return (1, contact.name.value.lower())  # Без дня народження - в кінець
-                days = contact.days_to_birthday()
+                days = contact.days_to_birthday(today)
                 return (0, days if days is not None else 365, contact.name.value.lower())
             
             contacts.sort(key=birthday_key)
         
         return contacts
 
+    @timed('contacts.get_upcoming_birthdays')
     def get_upcoming_birthdays(self, days_ahead: int = 7) -> List[Contact]:
         """
         Повертає контакти з днями народження в найближчі дні
@@ -204,19 +649,17 @@ class ContactManager:
         Returns:
             List[Contact]: Список контактів з найближчими днями народження
         """
-        upcoming_contacts = []
+        if days_ahead < 0:
+            return []
         
-        for contact in self._contacts:
-            if contact.birthday:
-                days_to_bd = contact.days_to_birthday()
-                if days_to_bd is not None and days_to_bd <= days_ahead:
-                    upcoming_contacts.append(contact)
-        
-        # Сортуємо за кількістю днів до дня народження
-        upcoming_contacts.sort(key=lambda c: c.days_to_birthday() or 0)
-        
-        return upcoming_contacts
+        # Індекс повертає контакти вже в порядку наближення дня народження
+        self._refresh_birthday_index()
+        today = date.today()
+        end = today + timedelta(days=min(days_ahead, 366))
+        name_keys = self._birthday_index.between(today, end)
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
 
+    @timed('contacts.get_contacts_by_birthday')
     def get_contacts_by_birthday(self, date_str: str) -> List[Contact]:
         """
         Знаходить контакти за конкретною датою народження (день.місяць)
@@ -227,23 +670,18 @@ class ContactManager:
         Returns:
             List[Contact]: Список контактів з таким днем народження
         """
-        matching_contacts = []
-        
         try:
             # Парсимо дату з строки
             day, month = map(int, date_str.split('.'))
-            
-            for contact in self._contacts:
-                if contact.birthday:
-                    bday_obj = contact.birthday.to_date()
-                    if (bday_obj.day == day and bday_obj.month == month):
-                        matching_contacts.append(contact)
         except (ValueError, AttributeError):
             # Неправильний формат дати або проблеми з парсингом
-            pass
-            
-        return matching_contacts
+            return []
+        
+        self._refresh_birthday_index()
+        name_keys = self._birthday_index.on_day(month, day)
+        return [self._contacts_by_name[name_key] for name_key in name_keys]
 
+    @timed('contacts.update_contact')
     def update_contact(self, name: str, **kwargs) -> Optional[Contact]:
         """
         Оновлює інформацію про контакт
@@ -262,6 +700,8 @@ class ContactManager:
         if not contact:
             return None
         
+        self.mark_dirty(name)
+        
         # Оновлюємо телефони
         if 'phones' in kwargs:
             contact.phones.clear()
@@ -288,9 +728,10 @@ class ContactManager:
             else:
                 contact.remove_address()
         
-        self.save_contacts()
+        self._autosave()
         return contact
 
+    @timed('contacts.get_statistics')
     def get_statistics(self) -> Dict[str, Any]:
         """
         Повертає статистику по контактах
@@ -0,0 +1,168 @@
+"""
+Відкладений запис змін менеджерів у фоновому потоці
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+try:
+    from storage.file_storage import Change
+except ImportError:
+    from dev_implementation.storage.file_storage import Change
+
+
+class WriteBehind:
+    """
+    Фоновий потік, що записує зміни менеджерів у сховище із затримкою
+    
+    Менеджери передають у submit() вже серіалізовані зміни записів, тому
+    команда користувача не чекає на запис файлу. Зміни, що надійшли протягом
+    вікна delay після останньої, записуються разом одним викликом
+    apply_changes() для кожного файлу; max_delay обмежує затримку при
+    безперервному потоці змін. flush() записує все негайно в потоці, що
+    його викликав.
+    
+    Невдалий запис повертає зміни в чергу, і вони записуються наступного разу.
+    """
+
+    def __init__(self, storage: Any, delay: float = 0.5, max_delay: Optional[float] = None):
+        """
+        Ініціалізує відкладений запис поверх сховища
+        
+        Args:
+            storage (Any): Сховище з методом apply_changes (FileStorage, SqliteStorage)
+            delay (float): Скільки секунд без нових змін чекати перед записом
+            max_delay (Optional[float]): Найбільша затримка запису від першої
+                незаписаної зміни (за замовчуванням 10 * delay)
+        """
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else delay * 10
+        self.last_error: Optional[str] = None
+        self._pending: Dict[str, List[Change]] = {}
+        self._first_submit = 0.0
+        self._last_submit = 0.0
+        self._condition = threading.Condition()
+        # Упорядковує записи фонового потоку та flush()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+    @property
+    def pending(self) -> bool:
+        """Чи є зміни, ще не передані сховищу"""
+        with self._condition:
+            return bool(self._pending)
+
+    def submit(self, filename: str, changes: List[Change]) -> None:
+        """
+        Ставить зміни файлу в чергу на запис
+        
+        Args:
+            filename (str): Ім'я файлу сховища
+            changes (List[Change]): Зміни у вигляді (операція, ключ, значення);
+                значення не повинні змінюватись після передачі
+        """
+        if not changes:
+            return
+        with self._condition:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_submit = now
+            self._last_submit = now
+            self._pending.setdefault(filename, []).extend(changes)
+            if self._thread is None:
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self) -> bool:
+        """
+        Негайно записує всі зміни з черги
+        
+        Returns:
+            bool: True, якщо всі зміни записано
+        """
+        with self._write_lock:
+            return self._write()
+
+    def discard(self, filename: str) -> None:
+        """
+        Видаляє з черги зміни файлу, який щойно збережено повністю
+        
+        Args:
+            filename (str): Ім'я файлу сховища
+        """
+        with self._write_lock, self._condition:
+            self._pending.pop(filename, None)
+
+    def close(self) -> bool:
+        """
+        Записує чергу та зупиняє фоновий потік
+        
+        Returns:
+            bool: True, якщо всі зміни записано
+        """
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._closing = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+        return self.flush()
+
+    def _run(self) -> None:
+        """Цикл фонового потоку: чекає вікно без змін і записує чергу"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closing:
+                    self._condition.wait()
+                if self._closing:
+                    return
+                
+                # Вікно продовжується з кожною новою зміною, але не довше max_delay
+                while not self._closing:
+                    deadline = min(self._last_submit + self.delay,
+                                   self._first_submit + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closing:
+                    return
+            
+            with self._write_lock:
+                if not self._write():
+                    # Повторюємо після наступного вікна, а не одразу
+                    with self._condition:
+                        self._first_submit = self._last_submit = time.monotonic()
+
+    def _write(self) -> bool:
+        """Передає чергу сховищу; викликається під _write_lock"""
+        with self._condition:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return True
+        
+        failed: Dict[str, List[Change]] = {}
+        group_commit = getattr(self.storage, 'group_commit', None)
+        with group_commit() if group_commit is not None else nullcontext():
+            for filename, changes in pending.items():
+                try:
+                    if not self.storage.apply_changes(filename, changes):
+                        raise OSError("сховище не зберегло зміни")
+                except Exception as e:
+                    failed[filename] = changes
+                    self.last_error = f"Помилка відкладеного запису {filename}: {e}"
+        
+        if failed:
+            with self._condition:
+                # Зміни, що надійшли під час запису, йдуть після невдалих
+                for filename, changes in failed.items():
+                    self._pending[filename] = changes + self._pending.get(filename, [])
+            return False
+        self.last_error = None
+        return True
@@ -3,7 +3,7 @@
 """
 
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .field import Name, Phone, Email, Birthday, Address
 
 
@@ -19,6 +19,13 @@ class Contact:
         address (Optional[Address]): Адреса
     """
 
+    # Без __dict__ контакт займає помітно менше пам'яті на великих колекціях
+    __slots__ = ('name', 'phones', 'emails', 'email', 'birthday', 'address', '_days_cache')
+
+    # Версія формату to_dict() та правил валідації полів. Збільшуйте її при
+    # зміні нормалізації, щоб раніше збережені файли пройшли валідацію знову
+    SCHEMA_VERSION = 1
+
     def __init__(self, name):
         """
         Ініціалізує новий контакт з обов'язковим ім'ям
@@ -39,6 +46,8 @@ class Contact:
         self.email: Optional[Email] = None  # Для сумісності з тестами
         self.birthday: Optional[Birthday] = None
         self.address: Optional[Address] = None
+        # (дата, день народження, днів до нього) - див. days_to_birthday
+        self._days_cache: Optional[Tuple[date, str, int]] = None
 
     def add_phone(self, phone) -> None:
         """
@@ -195,10 +204,12 @@ class Contact:
             ValueError: Якщо дата не пройшла валідацію
         """
         self.birthday = Birthday(birthday)
+        self._days_cache = None
 
     def remove_birthday(self) -> None:
         """Видаляє день народження з контакту"""
         self.birthday = None
+        self._days_cache = None
 
     def set_address(self, address: str) -> None:
         """
@@ -275,6 +286,46 @@ class Contact:
         
         return contact
 
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> 'Contact':
+        """
+        Створює контакт зі словника, записаного to_dict(), без повторної валідації
+        
+        Args:
+            data (Dict[str, Any]): Словник, збережений програмою у версії SCHEMA_VERSION
+            
+        Returns:
+            Contact: Новий об'єкт контакту
+            
+        Raises:
+            KeyError: Якщо відсутнє ім'я
+        """
+        # Цей шлях виконується для кожного запису при запуску, тому об'єкти
+        # створюються напряму, без викликів конструкторів
+        new = object.__new__
+        contact = new(cls)
+        name = new(Name)
+        name.value = data['name']
+        contact.name = name
+        
+        contact.phones = phones = []
+        for value in data.get('phones') or ():
+            phone = new(Phone)
+            phone.value = value
+            phones.append(phone)
+        
+        contact.emails = emails = []
+        for value in data.get('emails') or ():
+            email = new(Email)
+            email.value = value
+            emails.append(email)
+        
+        contact.email = Email.from_trusted(data['email']) if data.get('email') else None
+        contact.birthday = Birthday.from_trusted(data['birthday']) if data.get('birthday') else None
+        contact.address = Address.from_trusted(data['address']) if data.get('address') else None
+        contact._days_cache = None
+        return contact
+
     def __str__(self) -> str:
         """
         Повертає рядкове представлення контакту для виводу користувачу
@@ -352,31 +403,61 @@ class Contact:
         else:
             self.birthday = Birthday(birthday)
 
-    def days_to_birthday(self) -> Optional[int]:
+    def days_to_birthday(self, today: Optional[date] = None) -> Optional[int]:
         """
         Розраховує кількість днів до наступного дня народження
         
+        Результат запам'ятовується на поточний календарний день. Кеш
+        прив'язаний до дати та значення дня народження, тому після півночі
+        або зміни дати народження кількість днів обчислюється заново.
+        
+        Args:
+            today (Optional[date]): Поточна дата (за замовчуванням date.today());
+                передайте її один раз, обробляючи багато контактів
+        
         Returns:
             Optional[int]: Кількість днів до дня народження або None, якщо не встановлено
         """
         if self.birthday is None:
             return None
         
-        today = date.today()
-        birthday_datetime = self.birthday.to_date()
-        birthday_date = birthday_datetime.date()
+        if today is None:
+            today = date.today()
+        cached = self._days_cache
+        if cached is not None and cached[0] == today and cached[1] == self.birthday.value:
+            return cached[2]
+        
+        birthday_date = self.birthday.to_date().date()
         
         # Створюємо дату дня народження для поточного року
-        current_year_birthday = birthday_date.replace(year=today.year)
+        current_year_birthday = self._birthday_in_year(birthday_date, today.year)
         
         # Якщо день народження вже пройшов цього року, беремо наступний рік
         if current_year_birthday < today:
-            current_year_birthday = birthday_date.replace(year=today.year + 1)
+            current_year_birthday = self._birthday_in_year(birthday_date, today.year + 1)
         
         # Розраховуємо кількість днів
         days_until = (current_year_birthday - today).days
+        self._days_cache = (today, self.birthday.value, days_until)
         return days_until
 
+    @staticmethod
+    def _birthday_in_year(birthday_date: date, year: int) -> date:
+        """
+        Повертає дату дня народження у вказаному році
+        
+        Args:
+            birthday_date (date): Дата народження
+            year (int): Рік
+            
+        Returns:
+            date: День народження у цьому році (29 лютого у невисокосний рік - 28 лютого)
+        """
+        try:
+            return birthday_date.replace(year=year)
+        except ValueError:
+            return date(year, 2, 28)
+
     def matches_search(self, query: str) -> bool:
         """
         Перевіряє чи відповідає контакт пошуковому запиту
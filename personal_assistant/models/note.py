@@ -5,6 +5,7 @@
 from datetime import datetime
 from typing import List, Set, Dict, Any, Optional
 import re
+import sys
 
 
 class Note:
@@ -17,8 +18,16 @@ class Note:
         tags (Set[str]): Множина тегів, пов'язаних з нотаткою
         created_at (datetime): Дата та час створення нотатки
         updated_at (datetime): Дата та час останнього оновлення
+        id (Optional[int]): Стабільний ідентифікатор, який призначає NoteManager
     """
 
+    # Без __dict__ нотатка займає помітно менше пам'яті на великих колекціях
+    __slots__ = ('title', 'content', 'tags', 'created_at', 'updated_at', 'id')
+
+    # Версія формату to_dict() та правил валідації. Збільшуйте її при зміні
+    # нормалізації, щоб раніше збережені файли пройшли валідацію знову
+    SCHEMA_VERSION = 1
+
     def __init__(self, title: str, content: str = "", tags: Optional[List[str]] = None):
         """
         Ініціалізує нову нотатку
@@ -36,6 +45,7 @@ class Note:
         self.tags: List[str] = []  # Змінюємо на список для сумісності з тестами
         self.created_at = datetime.now()
         self.updated_at = self.created_at
+        self.id: Optional[int] = None
         
         # Додаємо теги якщо вони передані
         if tags:
@@ -90,7 +100,9 @@ class Note:
         if len(tag) > 30:
             raise ValueError("Тег не може бути довшим за 30 символів")
         
-        return tag
+        # Тегів небагато, а повторюються вони в тисячах нотаток - зберігаємо
+        # один екземпляр рядка на тег
+        return sys.intern(tag)
 
     def set_title(self, title: str) -> None:
         """
@@ -233,13 +245,18 @@ class Note:
         Returns:
             Dict[str, Any]: Словник з даними нотатки
         """
-        return {
+        data = {
             'title': self.title,
             'content': self.content,
             'tags': list(self.tags),
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
+        
+        if self.id is not None:
+            data = {'id': self.id, **data}
+        
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Note':
@@ -278,6 +295,37 @@ class Note:
             except ValueError:
                 note.updated_at = note.created_at
         
+        # Некоректний ID ігноруємо - менеджер призначить новий
+        note_id = data.get('id')
+        if isinstance(note_id, int) and not isinstance(note_id, bool) and note_id > 0:
+            note.id = note_id
+        
+        return note
+
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> 'Note':
+        """
+        Створює нотатку зі словника, записаного to_dict(), без повторної валідації
+        
+        Args:
+            data (Dict[str, Any]): Словник, збережений програмою у версії SCHEMA_VERSION
+            
+        Returns:
+            Note: Новий об'єкт нотатки
+            
+        Raises:
+            KeyError: Якщо відсутній заголовок
+            ValueError: Якщо дата має неправильний формат
+        """
+        note = cls.__new__(cls)
+        note.title = data['title']
+        note.content = data.get('content', '')
+        note.tags = [sys.intern(tag) for tag in data.get('tags') or ()]
+        created_at = data.get('created_at')
+        note.created_at = datetime.fromisoformat(created_at) if created_at else datetime.now()
+        updated_at = data.get('updated_at')
+        note.updated_at = datetime.fromisoformat(updated_at) if updated_at else note.created_at
+        note.id = data.get('id')
         return note
 
     def __str__(self) -> str:
@@ -4,27 +4,93 @@
 
 import json
 import os
-from typing import Any, Dict
+import shutil
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
 from pathlib import Path
 
+from .json_stream import iter_json_records
+
+try:
+    from utils.metrics import metrics, timed
+except ImportError:
+    from dev_implementation.utils.metrics import metrics, timed
+
+
+# Зміна запису: (операція, ключ, значення). Операції: 'set' та 'delete'.
+# Ключ - рядок для файлів-словників або позиція для файлів-списків.
+Change = Tuple[str, Any, Any]
+
 
 class FileStorage:
     """
     Клас для збереження та завантаження даних у файли JSON
     
     Забезпечує персистентність даних між сесіями роботи з програмою.
+    
+    У журнальному режимі (journal=True) окремі зміни записів дописуються
+    у файл журналу <ім'я>.journal замість повного перезапису JSON файлу.
+    Журнал відтворюється під час load_data і періодично ущільнюється
+    у базовий знімок.
+    
+    Для файлів, власник яких зареєстрував версію схеми (register_schema),
+    поруч зберігається маніфест <ім'я>.meta з версією та контрольними сумами
+    знімка і журналу. load_trusted повідомляє, що файли не змінювались поза
+    сховищем, і тоді записи можна відновлювати без повторної валідації.
+    
+    iter_records і stream_trusted повертають записи по одному під час
+    розбору файлу, не створюючи в пам'яті повну копію його вмісту.
+    
+    Знімки записуються в тимчасовий файл і атомарно замінюють основний, тому
+    після збою на диску лишається або стара, або нова версія цілком.
+    Рівень durability визначає, коли дані гарантовано потрапляють на диск:
+    'none' - без fsync (захист лише від збою процесу), 'file' - fsync файлу
+    перед заміною, 'dir' - також fsync директорії після заміни. У блоці
+    group_commit() fsync відкладається до виходу з блоку і виконується один
+    раз для кожного зміненого файлу; заміни знімків теж відкладаються, щоб
+    і в блоці на диску лишалась стара або нова версія цілком.
     """
+    
+    DURABILITY_LEVELS = ('none', 'file', 'dir')
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", journal: bool = False,
+                 compact_threshold: int = 1000, durability: str = 'file'):
         """
         Ініціалізує файлове сховище
         
         Args:
             data_dir (str): Шлях до папки для збереження даних
+            journal (bool): Чи вмикати журнальний режим для інкрементальних змін
+            compact_threshold (int): Кількість записів журналу, після якої
+                журнал ущільнюється у базовий JSON файл
+            durability (str): Рівень гарантій запису: 'none', 'file' або 'dir'
+            
+        Raises:
+            ValueError: Якщо рівень durability невідомий
         """
+        if durability not in self.DURABILITY_LEVELS:
+            raise ValueError(f"Невідомий рівень durability: {durability}")
         self.data_dir = Path(data_dir)
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.durability = durability
+        self._group_depth = 0
+        self._unsynced: Set[Path] = set()
+        self._directory_unsynced = False
+        # Основний файл -> тимчасовий файл з новою версією, заміна якого
+        # відкладена до виходу з group_commit()
+        self._deferred: Dict[Path, Path] = {}
+        self._journal_lengths: Dict[str, int] = {}
+        self._schemas: Dict[str, int] = {}
+        self._manifests: Dict[str, Dict[str, int]] = {}
         self.ensure_data_directory()
 
+    @property
+    def supports_incremental(self) -> bool:
+        """Чи зберігає сховище окремі зміни без перезапису всього файлу"""
+        return self.journal
+
     def ensure_data_directory(self) -> None:
         """Створює папку для даних, якщо вона не існує"""
         try:
@@ -50,13 +116,56 @@ class FileStorage:
         
         return self.data_dir / filename
 
-    def save_data(self, filename: str, data: Any) -> bool:
+    def get_journal_path(self, filename: str) -> Path:
+        """
+        Повертає шлях до файлу журналу для файлу даних
+        
+        Args:
+            filename (str): Ім'я файлу даних
+            
+        Returns:
+            Path: Шлях до файлу журналу
+        """
+        return self.get_file_path(filename).with_suffix('.journal')
+
+    def get_manifest_path(self, filename: str) -> Path:
+        """
+        Повертає шлях до маніфесту (версія схеми та контрольна сума) файлу даних
+        
+        Args:
+            filename (str): Ім'я файлу даних
+            
+        Returns:
+            Path: Шлях до файлу маніфесту
+        """
+        return self.get_file_path(filename).with_suffix('.meta')
+
+    def register_schema(self, filename: str, version: int) -> None:
+        """
+        Оголошує, що записи файлу зберігаються вже валідованими у вказаній версії схеми
+        
+        Після реєстрації save_data записує маніфест, а load_trusted визнає
+        файл довіреним, лише якщо версія збігається і файл не змінювався.
+        Версію слід збільшувати при зміні правил валідації або формату записів.
+        
+        Args:
+            filename (str): Ім'я файлу даних
+            version (int): Версія схеми записів
+        """
+        self._schemas[self.get_file_path(filename).name] = version
+
+    @timed('storage.save_data')
+    def save_data(self, filename: str, data: Any, trusted: bool = True,
+                  backup: bool = True) -> bool:
         """
         Зберігає дані у файл JSON
         
         Args:
             filename (str): Ім'я файлу
             data (Any): Дані для збереження
+            trusted (bool): Чи записувати маніфест для зареєстрованої схеми;
+                False для даних з зовнішніх джерел (резервні копії тощо)
+            backup (bool): Чи зберегти попередню версію файлу як резервну копію
             
         Returns:
             bool: True якщо збереження успішне, False інакше
@@ -64,31 +173,185 @@ class FileStorage:
         file_path = self.get_file_path(filename)
         
         try:
-            # Створюємо резервну копію, якщо файл існує
-            if file_path.exists():
-                backup_path = file_path.with_suffix('.json.backup')
-                try:
-                    file_path.replace(backup_path)
-                except Exception:
-                    pass  # Ігноруємо помилки створення резервної копії
-            
             # Зберігаємо дані з красивим форматуванням
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
+            content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+            
+            # Резервна копія - друге посилання на поточний файл, тому основний
+            # файл існує весь час і замінюється новим атомарно
+            if backup and file_path.exists():
+                self._keep_backup(file_path)
+            # Журнал видаляється одразу, тому знімок, що його замінює,
+            # не можна відкладати
+            self._write_atomic(file_path, content,
+                               defer=not self.get_journal_path(filename).exists())
             
+            # Повний знімок містить усі зміни з журналу
+            self._drop_journal(filename)
+            schema = self._schemas.get(file_path.name)
+            self._write_manifest(filename, {'schema': schema, 'checksum': zlib.crc32(content)}
+                                 if trusted and schema is not None else None)
             return True  # Успішне збереження
                 
-        except Exception as e:
-            # Відновлюємо з резервної копії, якщо можливо
-            backup_path = file_path.with_suffix('.json.backup')
-            if backup_path.exists():
-                try:
-                    backup_path.replace(file_path)
-                except Exception:
-                    pass
-            
+        except Exception:
+            # Основний файл не змінено - заміна або відбулась повністю, або ні
             return False  # Помилка збереження
 
+    def _keep_backup(self, file_path: Path) -> None:
+        """Робить поточну версію файлу резервною копією, не чіпаючи сам файл"""
+        backup_path = file_path.with_suffix('.json.backup')
+        temp_path = backup_path.with_name(backup_path.name + '.tmp')
+        try:
+            # У group_commit() основний файл до заміни лишається тим самим, і
+            # rename між двома посиланнями на один файл нічого б не зробив
+            if backup_path.exists() and os.path.samefile(file_path, backup_path):
+                return
+            if temp_path.exists():
+                temp_path.unlink()
+            try:
+                os.link(file_path, temp_path)
+            except OSError:
+                shutil.copyfile(file_path, temp_path)  # ФС без жорстких посилань
+            os.replace(temp_path, backup_path)
+        except OSError:
+            # Ігноруємо помилки створення резервної копії
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+    def _write_atomic(self, path: Path, content: bytes, durable: bool = True,
+                      defer: bool = True) -> None:
+        """
+        Записує файл через тимчасовий файл і атомарну заміну
+        
+        У блоці group_commit() тимчасовий файл не синхронізується, а заміна
+        відкладається до sync(): спершу синхронізуються всі тимчасові файли,
+        потім вони замінюють основні. Читання через сховище до того часу
+        бачать тимчасовий файл.
+        
+        Args:
+            path (Path): Шлях до файлу
+            content (bytes): Новий вміст
+            durable (bool): Чи застосовувати рівень durability (False для
+                службових файлів, втрата яких нічого не ламає)
+            defer (bool): Чи можна в group_commit() відкласти заміну
+            
+        Raises:
+            OSError: Якщо записати не вдалося (основний файл лишається без змін)
+        """
+        temp_path = path.with_name(path.name + '.tmp')
+        deferred = durable and defer and self.durability != 'none' and bool(self._group_depth)
+        sync_now = durable and self.durability != 'none' and not deferred
+        # Відкладена версія лишається цілою, поки нова не записана повністю
+        write_path = (temp_path.with_name(temp_path.name + '.part')
+                      if path in self._deferred else temp_path)
+        try:
+            with open(write_path, 'wb') as file:
+                file.write(content)
+                if metrics.enabled:
+                    metrics.increment('storage.bytes_written', len(content))
+                if sync_now:
+                    file.flush()
+                    os.fsync(file.fileno())
+            if write_path != temp_path:
+                os.replace(write_path, temp_path)
+            if deferred:
+                self._deferred[path] = temp_path
+                return
+            self._deferred.pop(path, None)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                write_path.unlink()
+            except OSError:
+                pass
+            raise
+        if durable:
+            self._after_write(path, created=True)
+
+    def _current_path(self, path: Path) -> Path:
+        """Повертає файл з актуальною версією: відкладений тимчасовий або основний"""
+        return self._deferred.get(path, path)
+
+    def _after_write(self, path: Path, created: bool) -> None:
+        """
+        Завершує запис згідно з рівнем durability
+        
+        Args:
+            path (Path): Змінений файл (вміст уже синхронізовано поза group_commit)
+            created (bool): Чи змінився запис файлу в директорії
+        """
+        if self.durability == 'none':
+            return
+        if self._group_depth:
+            self._unsynced.add(path)
+            self._directory_unsynced = self._directory_unsynced or created
+        elif created and self.durability == 'dir':
+            self._sync_directory()
+
+    def _sync_directory(self) -> None:
+        """Синхронізує записи директорії даних (створення та перейменування)"""
+        if os.name == 'nt':
+            return  # Windows не дозволяє fsync директорії
+        descriptor = os.open(self.data_dir, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    @contextmanager
+    def group_commit(self) -> Iterator[None]:
+        """
+        Об'єднує fsync усіх записів у блоці в один на кожен змінений файл
+        
+        Нові версії знімків пишуться в тимчасові файли, які замінюють основні
+        лише при виході з блоку, після fsync усіх тимчасових файлів. Після
+        збою в блоці кожен файл лишається у старій або новій версії цілком.
+        Читання через сховище в блоці бачать нові дані, але гарантія
+        durability настає лише при виході з блоку. Дописи в журнал пишуться
+        одразу, а їх fsync теж виконується при виході. Блоки можуть бути
+        вкладеними - синхронізує зовнішній.
+        
+        Yields:
+            None
+        """
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if not self._group_depth:
+                self.sync()
+
+    @timed('storage.sync')
+    def sync(self) -> None:
+        """
+        Синхронізує з диском усі файли, записані в group_commit()
+        
+        Raises:
+            OSError: Якщо відкладену заміну не вдалося виконати (основний
+                файл лишається у попередній версії)
+        """
+        deferred, self._deferred = self._deferred, {}
+        for temp_path in deferred.values():
+            with open(temp_path, 'rb') as file:
+                os.fsync(file.fileno())
+        for path, temp_path in deferred.items():
+            os.replace(temp_path, path)
+        self._directory_unsynced = self._directory_unsynced or bool(deferred)
+        
+        unsynced, self._unsynced = self._unsynced, set()
+        for path in unsynced:
+            try:
+                with open(path, 'rb') as file:
+                    os.fsync(file.fileno())
+            except FileNotFoundError:
+                pass  # Файл уже замінено або видалено
+        if self._directory_unsynced and self.durability == 'dir':
+            self._sync_directory()
+        self._directory_unsynced = False
+
+    @timed('storage.load_data')
     def load_data(self, filename: str) -> Any:
         """
         Завантажує дані з файлу JSON
@@ -103,25 +366,33 @@ class FileStorage:
             FileNotFoundError: Якщо файл не існує
             Exception: Якщо не вдалося завантажити дані
         """
-        file_path = self.get_file_path(filename)
+        file_path = self._current_path(self.get_file_path(filename))
+        journal_path = self.get_journal_path(filename)
         
         if not file_path.exists():
+            if journal_path.exists():
+                return self._replay_journal(filename, None)
             return {}  # Повертаємо порожній словник для неіснуючих файлів
         
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
+                data = json.load(file)
+            
+            if journal_path.exists():
+                data = self._replay_journal(filename, data)
+            return data
         
         except json.JSONDecodeError as e:
             # Спробуємо відновити з резервної копії
-            backup_path = file_path.with_suffix('.json.backup')
+            backup_path = self.get_file_path(filename).with_suffix('.json.backup')
             if backup_path.exists():
                 try:
                     with open(backup_path, 'r', encoding='utf-8') as file:
                         data = json.load(file)
                     
-                    # Відновлюємо основний файл з резервної копії
-                    self.save_data(filename, data)
+                    # Відновлюємо основний файл з резервної копії, не замінюючи її
+                    # пошкодженим файлом
+                    self.save_data(filename, data, trusted=False, backup=False)
                     return data
                 
                 except Exception:
@@ -132,6 +403,335 @@ class FileStorage:
         except Exception as e:
             raise Exception(f"Помилка завантаження даних з файлу {filename}: {e}")
 
+    @timed('storage.load_trusted')
+    def load_trusted(self, filename: str) -> Tuple[Any, bool]:
+        """
+        Завантажує дані та перевіряє, чи їх можна відновлювати без валідації
+        
+        Файл довірений, якщо для нього зареєстровано схему, а маніфест містить
+        ту саму версію та контрольні суми поточних знімка і журналу.
+        
+        Args:
+            filename (str): Ім'я файлу
+            
+        Returns:
+            Tuple[Any, bool]: Завантажені дані та ознака довіри
+            
+        Raises:
+            Exception: Якщо не вдалося завантажити дані
+        """
+        file_path = self._current_path(self.get_file_path(filename))
+        journal_path = self.get_journal_path(filename)
+        schema = self._schemas.get(self.get_file_path(filename).name)
+        if schema is None or not file_path.exists():
+            return self.load_data(filename), False
+        
+        try:
+            content = file_path.read_bytes()
+            journal = journal_path.read_bytes() if journal_path.exists() else b''
+            manifest = self._read_manifest(filename)
+            data = json.loads(content)
+            journal_lines = journal.decode('utf-8', errors='replace').splitlines(keepends=True)
+        except (OSError, ValueError):
+            # Пошкоджений знімок - звичайний шлях з відновленням з резервної копії
+            return self.load_data(filename), False
+        
+        if journal_lines:
+            data = self._replay_journal(filename, data, journal_lines)
+        trusted = (manifest.get('schema') == schema
+                   and manifest.get('checksum') == zlib.crc32(content)
+                   and manifest.get('journal', 0) == zlib.crc32(journal))
+        return data, trusted
+
+    def iter_records(self, filename: str) -> Iterator[Tuple[Any, Any]]:
+        """
+        Повертає записи файлу по одному під час розбору
+        
+        Для файлу-словника повертаються пари (ключ, запис), для файлу-списку -
+        (позиція, запис). Якщо для файлу є журнал змін, дані завантажуються
+        повністю через load_data: позиційні зміни списків не можна застосувати
+        до потоку, а журнал однаково регулярно ущільнюється.
+        
+        Args:
+            filename (str): Ім'я файлу
+            
+        Yields:
+            Tuple[Any, Any]: Ключ або позиція запису та сам запис
+            
+        Raises:
+            json.JSONDecodeError: Якщо файл пошкоджено (записи до місця
+                пошкодження вже повернуті; відновлення з резервної копії
+                виконує load_data)
+        """
+        file_path = self._current_path(self.get_file_path(filename))
+        if self.get_journal_path(filename).exists() or not file_path.exists():
+            data = self.load_data(filename)
+            if isinstance(data, dict):
+                yield from data.items()
+            elif isinstance(data, list):
+                yield from enumerate(data)
+            return
+        
+        with open(file_path, 'r', encoding='utf-8') as file:
+            yield from iter_json_records(file)
+
+    def stream_trusted(self, filename: str) -> Tuple[Iterator[Tuple[Any, Any]], bool]:
+        """
+        Повертає потік записів (як iter_records) та ознаку довіри (як load_trusted)
+        
+        Контрольні суми рахуються окремим послідовним читанням файлів до
+        початку розбору, тож ознака відома ще до першого запису.
+        
+        Args:
+            filename (str): Ім'я файлу
+            
+        Returns:
+            Tuple[Iterator[Tuple[Any, Any]], bool]: Записи та ознака довіри
+        """
+        file_path = self._current_path(self.get_file_path(filename))
+        journal_path = self.get_journal_path(filename)
+        schema = self._schemas.get(self.get_file_path(filename).name)
+        
+        trusted = False
+        if schema is not None and file_path.exists():
+            manifest = self._read_manifest(filename)
+            try:
+                trusted = (manifest.get('schema') == schema
+                           and manifest.get('checksum') == self._checksum(file_path)
+                           and manifest.get('journal', 0) == self._checksum(journal_path))
+            except OSError:
+                trusted = False
+        return self.iter_records(filename), trusted
+
+    @staticmethod
+    def _checksum(path: Path) -> int:
+        """Рахує CRC32 файлу частинами (0 для відсутнього файлу)"""
+        checksum = 0
+        if path.exists():
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    checksum = zlib.crc32(chunk, checksum)
+        return checksum
+
+    def _read_manifest(self, filename: str) -> Dict[str, int]:
+        """Повертає маніфест файлу (з кешу або з диска) або порожній словник"""
+        name = self.get_file_path(filename).name
+        if name not in self._manifests:
+            try:
+                manifest = json.loads(self.get_manifest_path(filename).read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                manifest = None
+            self._manifests[name] = manifest if isinstance(manifest, dict) else {}
+        return self._manifests[name]
+
+    def _write_manifest(self, filename: str, manifest: Optional[Dict[str, int]]) -> None:
+        """
+        Записує маніфест файлу або видаляє його для недовірених даних
+        
+        Args:
+            filename (str): Ім'я файлу даних
+            manifest (Optional[Dict[str, int]]): Версія схеми та контрольні суми або None
+        """
+        name = self.get_file_path(filename).name
+        manifest_path = self.get_manifest_path(filename)
+        self._manifests[name] = manifest or {}
+        try:
+            if manifest:
+                # Застарілий маніфест лише вимикає довіру, тому без fsync
+                self._write_atomic(manifest_path, json.dumps(manifest).encode('utf-8'),
+                                   durable=False)
+            elif manifest_path.exists():
+                manifest_path.unlink()
+        except OSError:
+            # Без маніфесту файл просто завантажиться з валідацією
+            self._manifests[name] = {}
+
+    @timed('storage.apply_changes')
+    def apply_changes(self, filename: str, changes: Iterable[Change]) -> bool:
+        """
+        Зберігає окремі зміни записів у файлі даних
+        
+        У журнальному режимі зміни дописуються в кінець журналу, тому вартість
+        залежить лише від розміру змін. Без журналу дані завантажуються,
+        змінюються в пам'яті та зберігаються повністю.
+        
+        Args:
+            filename (str): Ім'я файлу
+            changes (Iterable[Change]): Зміни у вигляді (операція, ключ, значення)
+            
+        Returns:
+            bool: True якщо збереження успішне, False інакше
+        """
+        changes = list(changes)
+        if not changes:
+            return True
+        
+        if not self.journal:
+            try:
+                data = self.load_data(filename)
+                if not data and isinstance(changes[0][1], int):
+                    data = []
+                for op, key, value in changes:
+                    self._apply_change(data, op, key, value)
+            except Exception:
+                return False
+            return self.save_data(filename, data)
+        
+        try:
+            lines = []
+            for op, key, value in changes:
+                record = {'op': op, 'key': key}
+                if op == 'set':
+                    record['value'] = value
+                lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            
+            appended = ('\n'.join(lines) + '\n').encode('utf-8')
+            if self.get_file_path(filename) in self._deferred:
+                # Журнал доповнює новий знімок, тому той має бути на місці
+                self.sync()
+            manifest = self._read_manifest(filename)
+            journal_path = self.get_journal_path(filename)
+            created = not journal_path.exists()
+            with open(journal_path, 'ab') as file:
+                file.write(appended)
+                if metrics.enabled:
+                    metrics.increment('storage.bytes_written', len(appended))
+                if self.durability != 'none' and not self._group_depth:
+                    file.flush()
+                    os.fsync(file.fileno())
+            self._after_write(journal_path, created)
+        except Exception:
+            return False
+        
+        if manifest:
+            # Продовжуємо контрольну суму журналу, не перечитуючи його
+            manifest = dict(manifest, journal=zlib.crc32(appended, manifest.get('journal', 0)))
+            self._write_manifest(filename, manifest)
+        
+        length = self._journal_lengths.get(filename, 0) + len(changes)
+        self._journal_lengths[filename] = length
+        
+        if length >= self.compact_threshold:
+            return self.compact(filename)
+        return True
+
+    @timed('storage.compact')
+    def compact(self, filename: str) -> bool:
+        """
+        Ущільнює журнал змін у базовий JSON файл
+        
+        Args:
+            filename (str): Ім'я файлу
+            
+        Returns:
+            bool: True якщо ущільнення успішне
+        """
+        if not self.get_journal_path(filename).exists():
+            return True
+        
+        try:
+            # Довіра зберігається, лише якщо знімок і журнал не змінювались ззовні
+            data, trusted = self.load_trusted(filename)
+        except Exception:
+            return False
+        return self.save_data(filename, data, trusted)
+
+    def _replay_journal(self, filename: str, data: Any,
+                        lines: Optional[Iterable[str]] = None) -> Any:
+        """
+        Відтворює журнал змін поверх базового знімка
+        
+        Args:
+            filename (str): Ім'я файлу
+            data (Any): Дані базового знімка або None, якщо знімка немає
+            lines (Optional[Iterable[str]]): Вже прочитані рядки журналу
+                (за замовчуванням журнал читається з файлу)
+            
+        Returns:
+            Any: Дані з застосованими змінами
+        """
+        if lines is None:
+            with open(self.get_journal_path(filename), 'r', encoding='utf-8',
+                      errors='replace', newline='') as file:
+                return self._replay_journal(filename, data, file)
+        
+        length = 0
+        complete = 0  # Розмір у байтах повністю записаних рядків
+        for raw in lines:
+            line = raw.strip()
+            if line:
+                # Запис завершений, лише якщо дописано і його перевід рядка
+                try:
+                    record = json.loads(line) if raw.endswith('\n') else None
+                except json.JSONDecodeError:
+                    record = None
+                if not isinstance(record, dict):
+                    # Обірваний останній запис після збою: відрізаємо його, інакше
+                    # наступні зміни допишуться в той самий рядок і теж загубляться
+                    self._truncate_journal(filename, complete)
+                    break
+                
+                if data is None:
+                    data = [] if isinstance(record.get('key'), int) else {}
+                self._apply_change(data, record.get('op'), record.get('key'),
+                                   record.get('value'))
+                length += 1
+            complete += len(raw.encode('utf-8'))
+        
+        self._journal_lengths[filename] = length
+        return data if data is not None else {}
+
+    def _truncate_journal(self, filename: str, size: int) -> None:
+        """
+        Обрізає журнал змін до заданого розміру
+        
+        Args:
+            filename (str): Ім'я файлу
+            size (int): Розмір у байтах повністю записаних рядків журналу
+        """
+        try:
+            with open(self.get_journal_path(filename), 'r+b') as file:
+                file.truncate(size)
+                if self.durability != 'none':
+                    file.flush()
+                    os.fsync(file.fileno())
+        except OSError:
+            pass  # Журнал лишиться з обірваним рядком до наступного ущільнення
+
+    @staticmethod
+    def _apply_change(data: Any, op: str, key: Any, value: Any) -> None:
+        """
+        Застосовує одну зміну до словника або списку записів
+        
+        Args:
+            data (Any): Словник або список записів
+            op (str): Операція ('set' або 'delete')
+            key (Any): Ключ словника або позиція у списку
+            value (Any): Нове значення для операції 'set'
+        """
+        if isinstance(data, list):
+            if op == 'set':
+                if key == len(data):
+                    data.append(value)
+                else:
+                    data[key] = value
+            elif op == 'delete' and 0 <= key < len(data):
+                del data[key]
+        elif op == 'set':
+            data[key] = value
+        elif op == 'delete':
+            data.pop(key, None)
+
+    def _drop_journal(self, filename: str) -> None:
+        """Видаляє журнал змін після збереження повного знімка"""
+        journal_path = self.get_journal_path(filename)
+        try:
+            if journal_path.exists():
+                journal_path.unlink()
+        except Exception:
+            pass
+        self._journal_lengths.pop(filename, None)
+
     def file_exists(self, filename: str) -> bool:
         """
         Перевіряє, чи існує файл
@@ -142,7 +742,7 @@ class FileStorage:
         Returns:
             bool: True, якщо файл існує
         """
-        file_path = self.get_file_path(filename)
+        file_path = self._current_path(self.get_file_path(filename))
         return file_path.exists()
 
     def delete_file(self, filename: str) -> bool:
@@ -158,6 +758,8 @@ class FileStorage:
         file_path = self.get_file_path(filename)
         
         try:
+            if self._deferred:
+                self.sync()  # Спершу завершуємо відкладені заміни
             if file_path.exists():
                 file_path.unlink()
                 
@@ -166,6 +768,8 @@ class FileStorage:
                 if backup_path.exists():
                     backup_path.unlink()
                 
+                self._drop_journal(filename)
+                self._write_manifest(filename, None)
                 return True
             return False
         
@@ -183,7 +787,7 @@ class FileStorage:
         Returns:
             int: Розмір файлу в байтах, або 0 якщо файл не існує
         """
-        file_path = self.get_file_path(filename)
+        file_path = self._current_path(self.get_file_path(filename))
         
         try:
             if file_path.exists():
@@ -192,17 +796,23 @@ class FileStorage:
         except Exception:
             return 0
 
-    def list_data_files(self) -> list[str]:
+    def list_data_files(self, include_internal: bool = False) -> list[str]:
         """
         Повертає список всіх файлів даних
         
+        Args:
+            include_internal (bool): Чи включати службові файли (ім'я з крапки)
+        
         Returns:
             list[str]: Список імен файлів без розширення .json
         """
         try:
+            if self._deferred:
+                self.sync()  # Файли, створені в group_commit(), ще не на місці
             json_files = []
             for file_path in self.data_dir.glob("*.json"):
-                if not file_path.name.endswith('.backup'):
+                if not file_path.name.endswith('.backup') and (
+                        include_internal or not file_path.name.startswith('.')):
                     # Зберігаємо повне ім'я з розширенням .json
                     filename = file_path.name
                     json_files.append(filename)
@@ -250,7 +860,7 @@ class FileStorage:
         """
         try:
             files_deleted = 0
-            files = self.list_data_files()
+            files = self.list_data_files(include_internal=True)
             
             for filename in files:
                 if self.delete_file(filename):
@@ -262,6 +872,7 @@ class FileStorage:
             print(f"Помилка очищення всіх даних: {e}")
             return False
 
+    @timed('storage.create_backup')
     def create_backup(self, filename: str) -> str:
         """
         Створює резервну копію файлу
@@ -287,12 +898,14 @@ class FileStorage:
         
         # Зберігаємо backup
         try:
-            with open(backup_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
+            self._write_atomic(backup_path,
+                               json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'),
+                               defer=False)
             return str(backup_path)
         except Exception:
             return ""
 
+    @timed('storage.restore_backup')
     def restore_backup(self, filename: str, backup_file: str) -> bool:
         """
         Відновлює файл з резервної копії
@@ -310,7 +923,7 @@ class FileStorage:
                 data = json.load(file)
             
             # Зберігаємо в оригінальний файл
-            return self.save_data(filename, data)
+            return self.save_data(filename, data, trusted=False)
         except Exception:
             return False
 
@@ -344,4 +957,4 @@ class FileStorage:
 
     def __repr__(self) -> str:
         """Повертає технічне представлення сховища"""
-        return f"FileStorage(data_dir='{self.data_dir}')"
\ No newline at end of file
+        return f"FileStorage(data_dir='{self.data_dir}')"
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Потоковий розбір JSON файлів: записи верхнього рівня по одному
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+_SCAN = json.JSONDecoder().scan_once
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Ключ без екранованих символів разом з двокрапкою після нього
+_KEY = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*')
+# Роздільник разом з пробілами навколо нього
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,:\]}])[ \t\n\r]*')
+# Символи, якими може продовжуватись число, обрізане на межі буфера
+_NUMBER_TAIL = re.compile(r'[0-9eE.+-]*\Z')
+
+
+class _Reader:
+    """Буфер над текстовим файлом, з якого вже розібрані символи відкидаються"""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """
+        Дочитує наступну частину файлу в буфер
+        
+        Розмір частини не менший за нерозібраний залишок, тому запис, більший
+        за chunk_size, дочитується за логарифмічну кількість спроб.
+        
+        Returns:
+            bool: False, якщо файл закінчився
+        """
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Пропускає пробіли та повертає наступний символ ('' в кінці файлу)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def skip(self) -> bool:
+        """Пропускає пробіли або дочитує файл; False, якщо просуватись нікуди"""
+        end = _WHITESPACE.match(self.buffer, self.pos).end()
+        if end != self.pos:
+            self.pos = end
+            return True
+        return self.fill()
+
+    def expect(self, allowed: str) -> str:
+        """Приймає один із дозволених символів-роздільників"""
+        match = _SEPARATOR.match(self.buffer, self.pos)
+        if match is not None and match.group(1) in allowed:
+            self.pos = match.end()
+            return match.group(1)
+        
+        # Роздільник на межі буфера або помилка у файлі
+        char = self.peek()
+        if not char or char not in allowed:
+            raise self.error(f"Очікувався один із символів {allowed!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Розбирає одне значення JSON, дочитуючи файл за потреби"""
+        while True:
+            try:
+                value, end = _SCAN(self.buffer, self.pos)
+            except StopIteration:
+                if self.skip():
+                    continue
+                raise self.error("Очікувалось значення") from None
+            except json.JSONDecodeError:
+                # Значення, обрізане на межі буфера
+                if self.skip():
+                    continue
+                raise
+            # Число в кінці буфера могло бути обрізане посередині
+            if (isinstance(value, (int, float)) and _NUMBER_TAIL.match(self.buffer, end)
+                    and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+    def key(self) -> str:
+        """Розбирає ключ об'єкта разом з двокрапкою після нього"""
+        match = _KEY.match(self.buffer, self.pos)
+        if match is not None:
+            self.pos = match.end()
+            return match.group(1)
+        
+        # Ключ з екрануванням або на межі буфера
+        key = self.value()
+        if not isinstance(key, str):
+            raise self.error("Ключ об'єкта має бути рядком")
+        self.expect(':')
+        return key
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        """Створює помилку розбору для поточної позиції буфера"""
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def iter_json_records(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Tuple[Any, Any]]:
+    """
+    Розбирає об'єкт або масив верхнього рівня по одному запису
+    
+    У пам'яті одночасно перебувають лише поточний запис і непрочитаний
+    залишок буфера, тому споживач може перетворювати записи на об'єкти,
+    не тримаючи поруч повну копію файлу у вигляді словників.
+    
+    Args:
+        file (TextIO): Відкритий текстовий файл
+        chunk_size (int): Розмір частини, що читається за раз (у символах)
+        
+    Yields:
+        Tuple[Any, Any]: (ключ, запис) для об'єкта або (позиція, запис) для масиву
+        
+    Raises:
+        json.JSONDecodeError: Якщо файл пошкоджено; записи до місця
+            пошкодження на цей момент уже повернуті
+    """
+    reader = _Reader(file, chunk_size)
+    opening = reader.expect('{[')
+    closing = '}' if opening == '{' else ']'
+    
+    if reader.peek() == closing:
+        reader.pos += 1
+    else:
+        position = 0
+        while True:
+            if opening == '{':
+                key = reader.key()
+            else:
+                key = position
+                position += 1
+            yield key, reader.value()
+            if reader.expect(',' + closing) == closing:
+                break
+    
+    if reader.peek():
+        raise reader.error("Зайві дані після кінця JSON")
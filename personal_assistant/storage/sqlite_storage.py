@@ -0,0 +1,478 @@
+"""
+Модуль для збереження даних у локальній базі даних SQLite
+
+Сховище використовується як бібліотека (SqliteStorage(data_dir) замість
+FileStorage для менеджерів); main.py та CLI працюють з FileStorage.
+"""
+
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List
+from pathlib import Path
+
+from .file_storage import Change
+
+
+class SqliteStorage:
+    """
+    Клас для збереження та завантаження даних у базі даних SQLite
+    
+    Має той самий інтерфейс, що й FileStorage, але зберігає кожен запис
+    словника або списку окремим рядком таблиці. Тому зміна одного контакту
+    чи нотатки є окремим upsert, а не перезаписом усієї колекції.
+    
+    Стовпець pos елементів списку - лише ключ порядку: видалення не
+    перенумеровує наступні рядки, а позиція в списку перетворюється на rowid
+    через кеш rowid у порядку елементів. Кеш будується при першій зміні
+    списку, тому базу не повинні одночасно змінювати інші з'єднання.
+    """
+    
+    # Види даних у таблиці files: словник записів, список записів або одне значення
+    KIND_OBJECT = 'object'
+    KIND_ARRAY = 'array'
+    KIND_VALUE = 'value'
+
+    def __init__(self, data_dir: str = "data", db_name: str = "assistant.db"):
+        """
+        Ініціалізує сховище SQLite
+        
+        Args:
+            data_dir (str): Шлях до папки для збереження даних
+            db_name (str): Ім'я файлу бази даних у цій папці
+        """
+        self.data_dir = Path(data_dir)
+        self.ensure_data_directory()
+        self.db_path = self.data_dir / db_name
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # Файл-список -> rowid його елементів у порядку списку
+        self._array_rows: Dict[str, List[int]] = {}
+        self._create_schema()
+
+    @property
+    def supports_incremental(self) -> bool:
+        """Чи зберігає сховище окремі зміни без перезапису всього файлу"""
+        return True
+
+    def ensure_data_directory(self) -> None:
+        """Створює папку для даних, якщо вона не існує"""
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            print(f"Помилка створення папки для даних: {e}")
+            self.data_dir = Path(".")
+
+    def _create_schema(self) -> None:
+        """Створює таблиці та індекси, якщо їх ще немає"""
+        with self._lock, self._connection:
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    name TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    body TEXT
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    file TEXT NOT NULL,
+                    key TEXT,
+                    pos INTEGER NOT NULL,
+                    value TEXT NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS records_file_key ON records(file, key);
+                CREATE INDEX IF NOT EXISTS records_file_pos ON records(file, pos);
+            """)
+
+    @staticmethod
+    def _normalize_name(filename: str) -> str:
+        """Приводить ім'я до вигляду FileStorage (з розширенням .json)"""
+        if not filename.endswith('.json'):
+            filename += '.json'
+        return filename
+
+    def _get_kind(self, name: str) -> Any:
+        """Повертає вид даних файлу або None, якщо файлу немає"""
+        row = self._connection.execute(
+            "SELECT kind FROM files WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        """Серіалізує значення запису у компактний JSON"""
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+    def save_data(self, filename: str, data: Any) -> bool:
+        """
+        Зберігає дані, повністю замінюючи попередній вміст файлу
+        
+        Args:
+            filename (str): Ім'я файлу
+            data (Any): Дані для збереження
+        
+        Returns:
+            bool: True якщо збереження успішне, False інакше
+        """
+        name = self._normalize_name(filename)
+        
+        try:
+            with self._lock, self._connection:
+                self._array_rows.pop(name, None)
+                self._connection.execute("DELETE FROM records WHERE file = ?", (name,))
+                
+                if isinstance(data, dict):
+                    self._connection.executemany(
+                        "INSERT INTO records (file, key, pos, value) VALUES (?, ?, ?, ?)",
+                        ((name, str(key), pos, self._dumps(value))
+                         for pos, (key, value) in enumerate(data.items()))
+                    )
+                    kind, body = self.KIND_OBJECT, None
+                elif isinstance(data, list):
+                    self._connection.executemany(
+                        "INSERT INTO records (file, key, pos, value) VALUES (?, NULL, ?, ?)",
+                        ((name, pos, self._dumps(value)) for pos, value in enumerate(data))
+                    )
+                    kind, body = self.KIND_ARRAY, None
+                else:
+                    kind, body = self.KIND_VALUE, self._dumps(data)
+                
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO files (name, kind, body) VALUES (?, ?, ?)",
+                    (name, kind, body)
+                )
+            return True
+        except Exception:
+            return False
+
+    def load_data(self, filename: str) -> Any:
+        """
+        Завантажує дані файлу
+        
+        Args:
+            filename (str): Ім'я файлу
+        
+        Returns:
+            Any: Завантажені дані або порожній словник, якщо файлу немає
+        
+        Raises:
+            Exception: Якщо не вдалося завантажити дані
+        """
+        name = self._normalize_name(filename)
+        
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT kind, body FROM files WHERE name = ?", (name,)
+                ).fetchone()
+                if row is None:
+                    return {}
+                
+                kind, body = row
+                if kind == self.KIND_VALUE:
+                    return json.loads(body)
+                
+                rows = self._connection.execute(
+                    "SELECT key, value FROM records WHERE file = ? ORDER BY pos", (name,)
+                ).fetchall()
+        except Exception as e:
+            raise Exception(f"Помилка завантаження даних з файлу {filename}: {e}")
+        
+        if kind == self.KIND_ARRAY:
+            return [json.loads(value) for _, value in rows]
+        return {key: json.loads(value) for key, value in rows}
+
+    def apply_changes(self, filename: str, changes: Iterable[Change]) -> bool:
+        """
+        Зберігає окремі зміни записів як upsert/delete рядків таблиці
+        
+        Args:
+            filename (str): Ім'я файлу
+            changes (Iterable[Change]): Зміни у вигляді (операція, ключ, значення)
+        
+        Returns:
+            bool: True якщо збереження успішне, False інакше
+        """
+        changes = list(changes)
+        if not changes:
+            return True
+        
+        name = self._normalize_name(filename)
+        
+        try:
+            with self._lock, self._connection:
+                kind = self._get_kind(name)
+                if kind is None:
+                    kind = self.KIND_ARRAY if isinstance(changes[0][1], int) else self.KIND_OBJECT
+                    self._connection.execute(
+                        "INSERT INTO files (name, kind, body) VALUES (?, ?, NULL)", (name, kind)
+                    )
+                elif kind == self.KIND_VALUE:
+                    return False
+                
+                for op, key, value in changes:
+                    if kind == self.KIND_ARRAY:
+                        self._apply_array_change(name, op, key, value)
+                    else:
+                        self._apply_object_change(name, op, str(key), value)
+            return True
+        except Exception:
+            # Транзакцію відкочено, тож кеш rowid міг розійтися з таблицею
+            self._array_rows.pop(name, None)
+            return False
+
+    def _apply_object_change(self, name: str, op: str, key: str, value: Any) -> None:
+        """Застосовує зміну запису словника за ключем"""
+        if op == 'set':
+            updated = self._connection.execute(
+                "UPDATE records SET value = ? WHERE file = ? AND key = ?",
+                (self._dumps(value), name, key)
+            ).rowcount
+            if not updated:
+                self._connection.execute(
+                    "INSERT INTO records (file, key, pos, value) "
+                    "SELECT ?, ?, COALESCE(MAX(pos) + 1, 0), ? FROM records WHERE file = ?",
+                    (name, key, self._dumps(value), name)
+                )
+        elif op == 'delete':
+            self._connection.execute(
+                "DELETE FROM records WHERE file = ? AND key = ?", (name, key)
+            )
+
+    def _array_rowids(self, name: str) -> List[int]:
+        """Повертає rowid елементів списку в порядку списку, читаючи їх один раз"""
+        rows = self._array_rows.get(name)
+        if rows is None:
+            rows = self._array_rows[name] = [row[0] for row in self._connection.execute(
+                "SELECT rowid FROM records WHERE file = ? ORDER BY pos", (name,)
+            )]
+        return rows
+
+    def _apply_array_change(self, name: str, op: str, pos: int, value: Any) -> None:
+        """Застосовує зміну елемента списку за позицією, змінюючи лише один рядок"""
+        rows = self._array_rowids(name)
+        if op == 'set':
+            if 0 <= pos < len(rows):
+                self._connection.execute(
+                    "UPDATE records SET value = ? WHERE rowid = ?", (self._dumps(value), rows[pos])
+                )
+            else:
+                # Новий елемент стає в кінець списку, як у FileStorage
+                cursor = self._connection.execute(
+                    "INSERT INTO records (file, key, pos, value) "
+                    "SELECT ?, NULL, COALESCE(MAX(pos) + 1, 0), ? FROM records WHERE file = ?",
+                    (name, self._dumps(value), name)
+                )
+                rows.append(cursor.lastrowid)
+        elif op == 'delete' and 0 <= pos < len(rows):
+            self._connection.execute("DELETE FROM records WHERE rowid = ?", (rows.pop(pos),))
+
+    def file_exists(self, filename: str) -> bool:
+        """
+        Перевіряє, чи існує файл
+        
+        Args:
+            filename (str): Ім'я файлу
+        
+        Returns:
+            bool: True, якщо файл існує
+        """
+        with self._lock:
+            return self._get_kind(self._normalize_name(filename)) is not None
+
+    def delete_file(self, filename: str) -> bool:
+        """
+        Видаляє файл даних
+        
+        Args:
+            filename (str): Ім'я файлу
+        
+        Returns:
+            bool: True, якщо файл було видалено успішно
+        """
+        name = self._normalize_name(filename)
+        
+        try:
+            with self._lock, self._connection:
+                self._array_rows.pop(name, None)
+                self._connection.execute("DELETE FROM records WHERE file = ?", (name,))
+                return self._connection.execute(
+                    "DELETE FROM files WHERE name = ?", (name,)
+                ).rowcount > 0
+        except Exception as e:
+            print(f"Помилка видалення файлу {filename}: {e}")
+            return False
+
+    def get_file_size(self, filename: str) -> int:
+        """
+        Повертає розмір серіалізованих даних файлу в байтах
+        
+        Args:
+            filename (str): Ім'я файлу
+        
+        Returns:
+            int: Розмір даних у байтах, або 0 якщо файл не існує
+        """
+        name = self._normalize_name(filename)
+        
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT COALESCE(SUM(LENGTH(CAST(value AS BLOB))), 0) "
+                    "FROM records WHERE file = ?", (name,)
+                ).fetchone()
+                body = self._connection.execute(
+                    "SELECT COALESCE(LENGTH(CAST(body AS BLOB)), 0) FROM files WHERE name = ?",
+                    (name,)
+                ).fetchone()
+            return row[0] + (body[0] if body else 0)
+        except Exception:
+            return 0
+
+    def list_data_files(self, include_internal: bool = False) -> List[str]:
+        """
+        Повертає список всіх файлів даних
+        
+        Args:
+            include_internal (bool): Чи включати службові файли (ім'я з крапки)
+        
+        Returns:
+            List[str]: Відсортований список імен файлів з розширенням .json
+        """
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT name FROM files ORDER BY name"
+                ).fetchall()
+            return [row[0] for row in rows if include_internal or not row[0].startswith('.')]
+        except Exception:
+            return []
+
+    def get_storage_info(self) -> Dict[str, Any]:
+        """
+        Повертає інформацію про сховище
+        
+        Returns:
+            Dict[str, Any]: Інформація про сховище
+        """
+        try:
+            files = self.list_data_files()
+            total_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+            with self._lock:
+                total_records = self._connection.execute(
+                    "SELECT COUNT(*) FROM records"
+                ).fetchone()[0]
+            
+            return {
+                'data_directory': str(self.data_dir.absolute()),
+                'database': str(self.db_path.absolute()),
+                'total_files': len(files),
+                'files': files,
+                'total_records': total_records,
+                'total_size_bytes': total_size,
+                'total_size_kb': round(total_size / 1024, 2)
+            }
+        
+        except Exception as e:
+            return {
+                'error': f"Помилка отримання інформації про сховище: {e}",
+                'data_directory': str(self.data_dir.absolute()),
+                'database': str(self.db_path.absolute()),
+                'total_files': 0,
+                'files': [],
+                'total_records': 0,
+                'total_size_bytes': 0,
+                'total_size_kb': 0
+            }
+
+    def clear_all_data(self) -> bool:
+        """
+        Видаляє всі файли даних
+        
+        Returns:
+            bool: True, якщо всі файли було видалено успішно
+        """
+        try:
+            with self._lock, self._connection:
+                self._array_rows.clear()
+                self._connection.execute("DELETE FROM records")
+                self._connection.execute("DELETE FROM files")
+            return True
+        except Exception as e:
+            print(f"Помилка очищення всіх даних: {e}")
+            return False
+
+    def create_backup(self, filename: str) -> str:
+        """
+        Створює резервну копію файлу у вигляді JSON, сумісного з FileStorage
+        
+        Args:
+            filename (str): Ім'я файлу для резервного копіювання
+        
+        Returns:
+            str: Шлях до створеного backup файлу
+        """
+        try:
+            data = self.load_data(filename)
+        except Exception:
+            return ""
+        
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = self.data_dir / f"{filename}_backup_{timestamp}.json"
+        
+        try:
+            with open(backup_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False, indent=2)
+            return str(backup_path)
+        except Exception:
+            return ""
+
+    def restore_backup(self, filename: str, backup_file: str) -> bool:
+        """
+        Відновлює файл з резервної копії
+        
+        Args:
+            filename (str): Ім'я файлу для відновлення
+            backup_file (str): Шлях до backup файлу
+        
+        Returns:
+            bool: True якщо відновлення успішне
+        """
+        try:
+            with open(backup_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return self.save_data(filename, data)
+        except Exception:
+            return False
+
+    def list_backups(self, filename: str) -> list:
+        """
+        Повертає список backup файлів для заданого файлу
+        
+        Args:
+            filename (str): Ім'я файлу для пошуку backup
+        
+        Returns:
+            list: Список шляхів до backup файлів
+        """
+        try:
+            backup_files = [
+                str(path) for path in self.data_dir.glob(f"{filename}_backup_*.json")
+                if path.is_file()
+            ]
+            return sorted(backup_files, reverse=True)
+        except Exception:
+            return []
+
+    def close(self) -> None:
+        """Закриває з'єднання з базою даних"""
+        with self._lock:
+            self._connection.close()
+
+    def __str__(self) -> str:
+        """Повертає рядкове представлення сховища"""
+        info = self.get_storage_info()
+        return f"SqliteStorage(database='{info['database']}', files={info['total_files']})"
+
+    def __repr__(self) -> str:
+        """Повертає технічне представлення сховища"""
+        return f"SqliteStorage(db_path='{self.db_path}')"
@@ -0,0 +1,290 @@
+"""
+Реєстр метрик: лічильники та гістограми тривалості гарячих шляхів
+
+Збирання вимкнене за замовчуванням. Методи, позначені timed(), поки метрики
+вимкнені, залишаються в класі без обгортки, тому позначка нічого не коштує
+навіть для методів, що виконуються тисячі разів за одну команду.
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Скільки останніх значень гістограми використовується для перцентилів
+DEFAULT_WINDOW = 4096
+
+
+def _nearest_rank(ordered: List[float], fraction: float) -> float:
+    """Повертає перцентиль відсортованого непорожнього списку за найближчим рангом"""
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+
+class Histogram:
+    """
+    Гістограма значень
+    
+    Кількість, сума, мінімум і максимум рахуються за всі спостереження,
+    перцентилі - за останніми window значеннями, тому пам'ять не зростає
+    в довгих сесіях.
+    """
+    
+    __slots__ = ('count', 'total', 'min', 'max', '_recent')
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Додає одне спостереження"""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._recent.append(value)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Повертає перцентиль останніх значень за найближчим рангом
+        
+        Args:
+            fraction (float): Частка від 0 до 1 (0.95 - p95)
+            
+        Returns:
+            float: Значення перцентиля (0.0 для порожньої гістограми)
+        """
+        if not self._recent:
+            return 0.0
+        return _nearest_rank(sorted(self._recent), fraction)
+
+    def summary(self) -> Dict[str, float]:
+        """Повертає підсумок: кількість, сума, середнє, межі та p50/p95/p99"""
+        if not self.count:
+            return {'count': 0, 'total': 0.0, 'mean': 0.0, 'min': 0.0, 'max': 0.0,
+                    'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        ordered = sorted(self._recent)
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count,
+            'min': self.min,
+            'max': self.max,
+            'p50': _nearest_rank(ordered, 0.50),
+            'p95': _nearest_rank(ordered, 0.95),
+            'p99': _nearest_rank(ordered, 0.99),
+        }
+
+
+class MetricsRegistry:
+    """
+    Іменовані лічильники та гістограми
+    
+    Методи безпечні для виклику з кількох потоків (фоновий запис, сервер).
+    Тривалості записуються в мілісекундах.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Ініціалізує порожній вимкнений реєстр
+        
+        Args:
+            window (int): Кількість останніх значень гістограми для перцентилів
+        """
+        self.enabled = False
+        self.window = window
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        # (клас, атрибут, оригінальний метод, обгортка) для методів з timed()
+        self._instrumented: List[Tuple[type, str, Callable, Callable]] = []
+
+    def enable(self) -> None:
+        """
+        Вмикає збирання метрик і ставить обгортки timed() на методи класів
+        
+        Методи, вже отримані з об'єкта раніше (збережені bound-методи),
+        залишаються без вимірювання.
+        """
+        self.enabled = True
+        for owner, attribute, _, wrapper in self._instrumented:
+            setattr(owner, attribute, wrapper)
+
+    def disable(self) -> None:
+        """Вимикає збирання метрик і знімає обгортки; зібрані значення залишаються"""
+        self.enabled = False
+        for owner, attribute, func, _ in self._instrumented:
+            setattr(owner, attribute, func)
+
+    def instrument(self, owner: type, attribute: str, func: Callable, wrapper: Callable) -> None:
+        """
+        Реєструє метод, який вимірюється, поки збирання ввімкнене
+        
+        Args:
+            owner (type): Клас, якому належить метод
+            attribute (str): Ім'я методу
+            func (Callable): Оригінальна функція
+            wrapper (Callable): Функція з вимірюванням
+        """
+        self._instrumented.append((owner, attribute, func, wrapper))
+        setattr(owner, attribute, wrapper if self.enabled else func)
+
+    def reset(self) -> None:
+        """Видаляє всі зібрані значення"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Збільшує лічильник
+        
+        Args:
+            name (str): Назва лічильника
+            value (float): Приріст
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Додає значення до гістограми
+        
+        Args:
+            name (str): Назва гістограми
+            value (float): Значення (для тривалостей - мілісекунди)
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Вимірює тривалість блоку коду, якщо збирання ввімкнене
+        
+        Args:
+            name (str): Назва гістограми
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Повертає копію всіх метрик
+        
+        Returns:
+            Dict[str, Any]: {'counters': {назва: значення},
+                'histograms': {назва: підсумок Histogram.summary()}}
+        """
+        with self._lock:
+            return {
+                'counters': dict(sorted(self._counters.items())),
+                'histograms': {name: histogram.summary()
+                               for name, histogram in sorted(self._histograms.items())},
+            }
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """
+        Серіалізує метрики у JSON
+        
+        Args:
+            path (Optional[str]): Файл, у який записати результат
+            
+        Returns:
+            str: Метрики у форматі JSON
+        """
+        content = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content + '\n')
+        return content
+
+    def format_table(self) -> str:
+        """
+        Форматує гістограми та лічильники для показу користувачу
+        
+        Returns:
+            str: Таблиця метрик або повідомлення, що їх немає
+        """
+        snapshot = self.snapshot()
+        if not snapshot['histograms'] and not snapshot['counters']:
+            return "Метрик ще немає"
+        
+        lines = []
+        if snapshot['histograms']:
+            width = max(len(name) for name in snapshot['histograms'])
+            lines.append(f"{'Операція':<{width}}  {'викл.':>7}{'p50, мс':>10}"
+                         f"{'p95, мс':>10}{'p99, мс':>10}{'сума, мс':>11}")
+            for name, summary in snapshot['histograms'].items():
+                lines.append(f"{name:<{width}}  {summary['count']:>7}{summary['p50']:>10.3f}"
+                             f"{summary['p95']:>10.3f}{summary['p99']:>10.3f}"
+                             f"{summary['total']:>11.1f}")
+        for name, value in snapshot['counters'].items():
+            lines.append(f"{name}: {value:g}")
+        return '\n'.join(lines)
+
+
+# Спільний реєстр процесу
+metrics = MetricsRegistry()
+
+
+class _Timed:
+    """Позначка методу, яку клас при створенні замінює на метод або обгортку"""
+
+    def __init__(self, name: str, func: Callable):
+        self.name = name
+        self.func = func
+
+    def __set_name__(self, owner: type, attribute: str) -> None:
+        name, func = self.name, self.func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                metrics.increment(name + '.errors')
+                raise
+            finally:
+                metrics.observe(name, (time.perf_counter() - started) * 1000)
+        
+        metrics.instrument(owner, attribute, func, wrapper)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """
+    Декоратор методу, що записує тривалість виклику в гістограму name
+    
+    Поки метрики вимкнені, у класі лежить сам метод без обгортки; enable()
+    замінює його на обгортку з вимірюванням. Виклик, що завершився винятком,
+    також збільшує лічильник name + '.errors'.
+    
+    Args:
+        name (str): Назва гістограми, наприклад 'contacts.search_contacts'
+        
+    Returns:
+        Callable[[F], F]: Декоратор (лише для методів у тілі класу)
+    """
+    def decorator(func: F) -> F:
+        return _Timed(name, func)  # type: ignore[return-value]
+    return decorator
@@ -0,0 +1,141 @@
+"""
+Звіт про час запуску: імпорти модулів (як у python -X importtime) та етапи ініціалізації
+
+Вимірювання виконується в окремому процесі, щоб модулі, вже імпортовані
+поточним процесом, не спотворювали результат. Власний час кожного модуля
+не залежить від того, хто імпортував його першим. Дані читаються з тієї ж
+директорії, що й при звичайному запуску, тому звіт показує, чи залежить
+холодний старт від розміру даних.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def measure_phases() -> List[Dict[str, Any]]:
+    """
+    Виконує етапи запуску CLI в поточному процесі та вимірює їх тривалість
+    
+    Перші два етапи - холодний старт (до першої команди); решта показують
+    відкладену роботу, яку виконує перше звернення до даних.
+    
+    Returns:
+        List[Dict[str, Any]]: Етапи з назвою, тривалістю в мс та ознакою startup
+    """
+    phases = []
+    started = time.perf_counter()
+
+    def mark(name: str, startup: bool) -> None:
+        nonlocal started
+        now = time.perf_counter()
+        phases.append({'phase': name, 'ms': (now - started) * 1000, 'startup': startup})
+        started = now
+    
+    from cli.interface import PersonalAssistantCLI
+    mark('імпорт cli.interface', True)
+    cli = PersonalAssistantCLI()
+    mark('створення PersonalAssistantCLI', True)
+    len(cli.contact_manager)
+    mark('завантаження контактів (перше звернення)', False)
+    len(cli.note_manager)
+    mark('завантаження нотаток (перше звернення)', False)
+    cli.command_matcher.find_best_command('help')
+    mark('розпізнавач команд (перша команда)', False)
+    return phases
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Розбирає вивід python -X importtime
+    
+    Args:
+        output (str): Вміст stderr процесу, запущеного з -X importtime
+        
+    Returns:
+        List[Dict[str, Any]]: Модулі з власним і сумарним часом імпорту (мкс)
+            та глибиною вкладеності
+    """
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            modules.append({
+                'module': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': (len(match.group(3)) - 1) // 2,
+            })
+    return modules
+
+
+def startup_report(timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+    """
+    Запускає окремий процес з -X importtime і збирає звіт про запуск
+    
+    Args:
+        timeout (Optional[float]): Максимальний час вимірювання в секундах
+        
+    Returns:
+        Dict[str, Any]: Етапи ('phases'), імпорти ('imports'), сумарний час
+            імпортів ('import_ms') і холодного старту ('startup_ms')
+            
+    Raises:
+        RuntimeError: Якщо процес вимірювання завершився з помилкою
+    """
+    import subprocess  # Потрібен лише батьківському процесу
+    
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PROJECT_DIR), env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         'import json, utils.startup as s; print(json.dumps(s.measure_phases()))'],
+        capture_output=True, text=True, env=env, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip()
+                           else f"Код завершення {result.returncode}")
+    
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    # Сам модуль звіту не є частиною запуску програми
+    imports = [module for module in parse_importtime(result.stderr)
+               if module['module'] != 'utils.startup']
+    return {
+        'phases': phases,
+        'imports': imports,
+        'import_ms': sum(module['self_us'] for module in imports) / 1000,
+        'startup_ms': sum(phase['ms'] for phase in phases if phase['startup']),
+    }
+
+
+def format_report(report: Dict[str, Any], top: int = 15) -> str:
+    """
+    Форматує звіт про запуск для виводу в консоль
+    
+    Args:
+        report (Dict[str, Any]): Результат startup_report()
+        top (int): Кількість найповільніших модулів у таблиці
+        
+    Returns:
+        str: Текст звіту
+    """
+    lines = ["⏱️ ЗВІТ ПРО ЗАПУСК", "", "Етапи:"]
+    for phase in report['phases']:
+        marker = '' if phase['startup'] else '  (відкладено)'
+        lines.append(f"  {phase['ms']:9.1f} мс  {phase['phase']}{marker}")
+    lines.append(f"  {report['startup_ms']:9.1f} мс  холодний старт до першої команди")
+    
+    slowest = sorted(report['imports'], key=lambda module: module['self_us'], reverse=True)[:top]
+    lines += ["", f"Найповільніші імпорти (усього {report['import_ms']:.1f} мс):",
+              f"  {'власний, мкс':>13} | {'сумарний, мкс':>13} | модуль"]
+    for module in slowest:
+        lines.append(f"  {module['self_us']:>13} | {module['cumulative_us']:>13} | {module['module']}")
+    return '\n'.join(lines)
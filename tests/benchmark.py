@@ -0,0 +1,487 @@
+"""
+Бенчмарки масштабування на синтетичних даних
+
+Генерує детермінований набір контактів і нотаток заданого розміру, зберігає
+його у тимчасовий каталог і вимірює основні операції менеджерів, сховища та
+розпізнавання команд: затримку (p50/p95/p99), пропускну здатність і пікове
+виділення пам'яті. Мережа та зовнішні пакети не потрібні.
+
+Використання:
+    python tests/benchmark.py                            # 1k та 10k записів
+    python tests/benchmark.py --sizes 1000 100000 1000000
+    python tests/benchmark.py --json results.json        # машинозчитуваний звіт
+    python tests/benchmark.py --save-baseline            # оновити benchmark_baseline.json
+    python tests/benchmark.py --compare                  # перевірка регресій відносно нього
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Додаємо dev_implementation до шляху
+dev_path = Path(__file__).parent.parent
+sys.path.insert(0, str(dev_path))
+
+from managers.contact_manager import ContactManager
+from managers.note_manager import NoteManager
+from storage.file_storage import FileStorage
+from utils.command_matcher import CommandMatcher
+
+
+DEFAULT_SIZES = (1000, 10000)
+# Скільки запитів виконується для кожної швидкої операції
+QUERY_REPEATS = 200
+BASELINE_FILE = Path(__file__).parent / 'benchmark_baseline.json'
+# Гарячі шляхи, уповільнення яких зупиняє перевірку --compare
+GATED_OPERATIONS = ('search_contacts', 'save_notes', 'find_best_command', 'load_data')
+# Допустиме відносне уповільнення медіани
+DEFAULT_THRESHOLD = 0.25
+# Різниця, меншу за цю, вважаємо шумом вимірювання навіть для швидких операцій
+MIN_REGRESSION_MS = 0.05
+
+_FIRST_NAMES = ('Олександр', 'Марія', 'Іван', 'Олена', 'Андрій', 'Наталія', 'Дмитро', 'Ірина',
+                'Сергій', 'Тетяна', 'Богдан', 'Оксана', 'Юрій', 'Світлана', 'Тарас', 'Галина')
+_LATIN_NAMES = ('oleksandr', 'maria', 'ivan', 'olena', 'andrii', 'natalia', 'dmytro', 'iryna',
+                'serhii', 'tetiana', 'bohdan', 'oksana', 'yurii', 'svitlana', 'taras', 'halyna')
+# Склади однакової довжини - різні номери дають різні прізвища
+_SYLLABLES = ('ба', 'ве', 'ги', 'до', 'ко', 'ле', 'ми', 'но', 'по', 'ра', 'си', 'ту', 'фе',
+              'ха', 'че', 'ши')
+# Жоден суфікс не є закінченням іншого, тож прізвища не збігаються
+_SURNAME_SUFFIXES = ('нко', 'чук', 'вич', 'ський')
+_DOMAINS = ('gmail.com', 'ukr.net', 'i.ua', 'meta.ua', 'example.com')
+_OPERATOR_CODES = ('50', '63', '66', '67', '68', '73', '93', '95', '96', '97', '98', '99')
+_CITIES = ('Київ', 'Львів', 'Одеса', 'Харків', 'Дніпро', 'Полтава', 'Ужгород', 'Чернігів')
+_STREETS = ('Шевченка', 'Франка', 'Лесі Українки', 'Грушевського', 'Соборна', 'Садова')
+_TAGS = ('робота', 'дім', 'покупки', 'ідеї', 'навчання', 'спорт', 'подорожі', 'книги',
+         'фінанси', 'здоров_я', 'проєкт', 'термінове', 'сім_я', 'музика', 'кіно', 'python')
+_WORDS = ('зустріч', 'план', 'список', 'завдання', 'дзвінок', 'лист', 'звіт', 'купити',
+          'перевірити', 'відправити', 'прочитати', 'підготувати', 'важливо', 'завтра',
+          'тиждень', 'бюджет', 'квитки', 'документи', 'нагадування', 'обговорити')
+# Запити до розпізнавача: точні, з помилками та невідомі
+_COMMAND_INPUTS = ('додати контакт', 'новий контакт', 'знайти контакт', 'показати всі контакти',
+                   'видалити контакт', 'додати нотатку', 'пошук нотаток', 'дні народження',
+                   'допомога', 'вихід', 'дадати кантакт', 'знайди кантакт', 'покажи нотатки',
+                   'add contact', 'show contacts', 'help', 'exit', 'щось незрозуміле')
+_BIRTHDAY_START = date(1950, 1, 1)
+_BIRTHDAY_RANGE = (date(2005, 12, 31) - _BIRTHDAY_START).days
+
+
+def _surname(number: int) -> str:
+    """Будує унікальне прізвище з номера: склади в системі числення за основою 16"""
+    syllables = []
+    number, suffix = divmod(number, len(_SURNAME_SUFFIXES))
+    while True:
+        number, digit = divmod(number, len(_SYLLABLES))
+        syllables.append(_SYLLABLES[digit])
+        if not number:
+            break
+    return ''.join(syllables).capitalize() + _SURNAME_SUFFIXES[suffix]
+
+
+def generate_contact_records(count: int, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Генерує детерміновані записи контактів у форматі файлу contacts.json
+    
+    Імена унікальні, телефони мають коди українських операторів, дати
+    народження лежать між 1950 та 2005 роками - усі записи проходять валідацію.
+    
+    Args:
+        count (int): Кількість контактів
+        seed (int): Зерно генератора; однакове зерно дає однакові дані
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: Записи за ключем імені у нижньому регістрі
+    """
+    rng = random.Random(seed)
+    records = {}
+    for index in range(count):
+        first = index % len(_FIRST_NAMES)
+        name = f"{_FIRST_NAMES[first]} {_surname(index // len(_FIRST_NAMES))}"
+        phones = [f"+380{rng.choice(_OPERATOR_CODES)}{rng.randrange(10 ** 7):07d}"
+                  for _ in range(rng.randint(1, 2))]
+        emails = []
+        if rng.random() < 0.7:
+            emails.append(f"{_LATIN_NAMES[first]}.{index}@{rng.choice(_DOMAINS)}")
+        birthday = None
+        if rng.random() < 0.8:
+            day = _BIRTHDAY_START + timedelta(days=rng.randrange(_BIRTHDAY_RANGE))
+            birthday = day.strftime('%d.%m.%Y')
+        address = None
+        if rng.random() < 0.6:
+            address = (f"м. {rng.choice(_CITIES)}, вул. {rng.choice(_STREETS)}, "
+                       f"{rng.randint(1, 200)}")
+        records[name.lower()] = {
+            'name': name,
+            'phones': phones,
+            'emails': emails,
+            'email': emails[0] if emails else None,
+            'birthday': birthday,
+            'address': address
+        }
+    return records
+
+
+def generate_note_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Генерує детерміновані записи нотаток у форматі файлу notes.json
+    
+    Args:
+        count (int): Кількість нотаток
+        seed (int): Зерно генератора; однакове зерно дає однакові дані
+        
+    Returns:
+        List[Dict[str, Any]]: Записи нотаток з ідентифікаторами від 1
+    """
+    rng = random.Random(seed + 1)
+    start = datetime(2020, 1, 1)
+    records = []
+    for index in range(count):
+        created = start + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        updated = created + timedelta(minutes=rng.randrange(30 * 24 * 60))
+        title = f"{' '.join(rng.choices(_WORDS, k=2)).capitalize()} {index + 1}"
+        records.append({
+            'id': index + 1,
+            'title': title,
+            'content': ' '.join(rng.choices(_WORDS, k=rng.randint(5, 30))),
+            'tags': sorted(set(rng.choices(_TAGS, k=rng.randint(0, 4)))),
+            'created_at': created.isoformat(),
+            'updated_at': updated.isoformat()
+        })
+    return records
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    """Повертає перцентиль відсортованої вибірки за найближчим рангом"""
+    rank = max(1, math.ceil(len(samples) * fraction))
+    return samples[rank - 1]
+
+
+def _peak_kb(call: Callable[[], Any]) -> float:
+    """Вимірює пікове виділення пам'яті Python під час одного виклику, у КБ"""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(operation: str, size: int, calls: Sequence[Callable[[], Any]], items: int = 1,
+            memory: bool = True) -> Dict[str, Any]:
+    """
+    Виконує виклики по одному та підсумовує їхню тривалість
+    
+    Args:
+        operation (str): Назва операції у звіті
+        size (int): Розмір набору даних
+        calls (Sequence[Callable[[], Any]]): Виклики, кожен вимірюється окремо
+        items (int): Скільки записів обробляє один виклик (для пропускної здатності)
+        memory (bool): Чи вимірювати пікову пам'ять окремим повтором першого виклику
+        
+    Returns:
+        Dict[str, Any]: Результат: затримки в мс, записів (або викликів) за секунду
+            та пік пам'яті в КБ
+    """
+    durations = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    total = sum(durations)
+    return {
+        'size': size,
+        'operation': operation,
+        'calls': len(durations),
+        'p50_ms': round(_percentile(durations, 0.50) * 1000, 4),
+        'p95_ms': round(_percentile(durations, 0.95) * 1000, 4),
+        'p99_ms': round(_percentile(durations, 0.99) * 1000, 4),
+        'mean_ms': round(total / len(durations) * 1000, 4),
+        'throughput': round(items * len(durations) / total, 1) if total else 0.0,
+        'peak_kb': round(_peak_kb(calls[0]), 1) if memory else None
+    }
+
+
+def run_size(size: int, seed: int = 0, memory: bool = True,
+             repeats: int = QUERY_REPEATS) -> List[Dict[str, Any]]:
+    """
+    Вимірює всі операції на наборі з size контактів і size нотаток
+    
+    Завантаження вимірюється з файлів, збережених самими менеджерами, тобто
+    у звичайному робочому стані. Перший пошук будує індекси й не враховується
+    в затримці запитів.
+    
+    Args:
+        size (int): Кількість контактів і нотаток
+        seed (int): Зерно генератора даних і запитів
+        memory (bool): Чи вимірювати пікову пам'ять
+        repeats (int): Кількість запитів для кожної швидкої операції
+        
+    Returns:
+        List[Dict[str, Any]]: Результати операцій (див. measure)
+    """
+    data_dir = tempfile.mkdtemp(prefix='pa-bench-')
+    try:
+        storage = FileStorage(data_dir)
+        storage.save_data('contacts', generate_contact_records(size, seed))
+        storage.save_data('notes', generate_note_records(size, seed))
+        # Одне завантаження з валідацією та збереження - далі файли довірені
+        contacts = ContactManager(storage)
+        contacts.save_contacts()
+        notes = NoteManager(storage)
+        notes.save_notes()
+        
+        rounds = max(1, min(5, 200000 // size))
+        managers = {}
+
+        def load(kind: str) -> None:
+            managers.pop(kind, None)  # Попередня копія не має займати пам'ять
+            manager = ContactManager(storage) if kind == 'contacts' else NoteManager(storage)
+            if kind == 'contacts':
+                manager.load_contacts()
+            else:
+                manager.load_notes()
+            managers[kind] = manager
+        
+        results = [
+            measure('load_data', size, [lambda: storage.load_data('contacts')] * rounds,
+                    size, memory),
+            measure('load_contacts', size, [lambda: load('contacts')] * rounds, size, memory),
+            measure('load_notes', size, [lambda: load('notes')] * rounds, size, memory),
+        ]
+        contacts, notes = managers['contacts'], managers['notes']
+        results.append(measure('save_contacts', size, [contacts.save_contacts] * rounds,
+                               size, memory))
+        results.append(measure('save_notes', size, [notes.save_notes] * rounds, size, memory))
+        
+        rng = random.Random(seed)
+        all_contacts = contacts.get_all_contacts()
+        queries = []
+        for _ in range(repeats):
+            contact = rng.choice(all_contacts)
+            queries.append(rng.choice((
+                contact.name.value.split()[1][:5].lower(),
+                contact.phones[0].value[-6:],
+                rng.choice(_CITIES).lower(),
+            )))
+        contacts.search_contacts(queries[0])
+        results.append(measure('search_contacts', size,
+                               [lambda q=q: contacts.search_contacts(q) for q in queries],
+                               memory=memory))
+        
+        words = [' '.join(rng.choices(_WORDS, k=rng.randint(1, 2))) for _ in range(repeats)]
+        notes.search_notes(words[0])
+        results.append(measure('search_notes', size,
+                               [lambda q=q: notes.search_notes(q) for q in words],
+                               memory=memory))
+        
+        tag_queries = [(rng.sample(_TAGS, rng.randint(1, 3)), rng.random() < 0.5)
+                       for _ in range(repeats)]
+        notes.find_notes_by_tags(*tag_queries[0])
+        results.append(measure('find_notes_by_tags', size,
+                               [lambda q=q: notes.find_notes_by_tags(*q) for q in tag_queries],
+                               memory=memory))
+        
+        days = [rng.choice((1, 7, 30, 365)) for _ in range(repeats)]
+        contacts.get_upcoming_birthdays(days[0])
+        results.append(measure('get_upcoming_birthdays', size,
+                               [lambda d=d: contacts.get_upcoming_birthdays(d) for d in days],
+                               memory=memory))
+        
+        matcher = CommandMatcher()
+        inputs = [rng.choice(_COMMAND_INPUTS) for _ in range(repeats)]
+        results.append(measure('find_best_command', size,
+                               [lambda i=i: matcher.find_best_command(i) for i in inputs],
+                               memory=memory))
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, seed: int = 0, memory: bool = True,
+                   repeats: int = QUERY_REPEATS) -> Dict[str, Any]:
+    """
+    Запускає бенчмарки для кожного розміру набору даних
+    
+    Args:
+        sizes (Sequence[int]): Розміри наборів даних
+        seed (int): Зерно генератора
+        memory (bool): Чи вимірювати пікову пам'ять
+        repeats (int): Кількість запитів для кожної швидкої операції
+        
+    Returns:
+        Dict[str, Any]: Звіт з описом середовища та результатами
+    """
+    results = []
+    for size in sizes:
+        results.extend(run_size(size, seed, memory, repeats))
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeats': repeats,
+        'results': results
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Форматує звіт у вигляді таблиці
+    
+    Args:
+        report (Dict[str, Any]): Звіт run_benchmarks
+        
+    Returns:
+        str: Таблиця результатів
+    """
+    header = (f"{'Розмір':>8}  {'Операція':<24}{'викл.':>6}{'p50, мс':>11}{'p95, мс':>11}"
+              f"{'p99, мс':>11}{'за секунду':>13}{'пік, КБ':>11}")
+    lines = [f"Python {report['python']}, {report['platform']}", header, '-' * len(header)]
+    for result in report['results']:
+        peak = f"{result['peak_kb']:.0f}" if result['peak_kb'] is not None else '-'
+        lines.append(f"{result['size']:>8}  {result['operation']:<24}{result['calls']:>6}"
+                     f"{result['p50_ms']:>11.3f}{result['p95_ms']:>11.3f}{result['p99_ms']:>11.3f}"
+                     f"{result['throughput']:>13.0f}{peak:>11}")
+    return '\n'.join(lines)
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    operations: Sequence[str] = GATED_OPERATIONS) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Порівнює медіанні затримки звіту з базовими
+    
+    Операція вважається регресією, якщо її p50 зріс більше ніж на threshold
+    і водночас більше ніж на MIN_REGRESSION_MS. Операції без базового
+    значення показуються, але перевірку не зупиняють.
+    
+    Args:
+        report (Dict[str, Any]): Поточний звіт run_benchmarks
+        baseline (Dict[str, Any]): Збережений базовий звіт
+        threshold (float): Допустиме відносне уповільнення (0.25 - на 25%)
+        operations (Sequence[str]): Операції, що перевіряються
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], bool]: Рядки порівняння та чи немає регресій
+    """
+    baseline_p50 = {(result['size'], result['operation']): result['p50_ms']
+                    for result in baseline['results']}
+    rows = []
+    passed = True
+    for result in report['results']:
+        if result['operation'] not in operations:
+            continue
+        before = baseline_p50.get((result['size'], result['operation']))
+        after = result['p50_ms']
+        if before is None:
+            change, status = None, 'новий'
+        else:
+            change = (after - before) / before if before else 0.0
+            regressed = after > before * (1 + threshold) and after - before > MIN_REGRESSION_MS
+            status = 'РЕГРЕСІЯ' if regressed else 'ok'
+            passed = passed and not regressed
+        rows.append({
+            'size': result['size'],
+            'operation': result['operation'],
+            'baseline_ms': before,
+            'current_ms': after,
+            'change': change,
+            'status': status
+        })
+    return rows, passed
+
+
+def format_comparison(rows: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> str:
+    """
+    Форматує порівняння з базовими значеннями у вигляді таблиці
+    
+    Args:
+        rows (List[Dict[str, Any]]): Рядки compare_reports
+        threshold (float): Поріг, з яким порівнювали
+        
+    Returns:
+        str: Таблиця змін медіанної затримки
+    """
+    header = (f"{'Розмір':>8}  {'Операція':<24}{'база, мс':>11}{'зараз, мс':>11}"
+              f"{'зміна':>10}  статус")
+    lines = [f"Порівняння p50 з базовими значеннями (поріг +{threshold:.0%})", header,
+             '-' * (len(header) + 4)]
+    for row in rows:
+        before = f"{row['baseline_ms']:.3f}" if row['baseline_ms'] is not None else '-'
+        change = f"{row['change']:+.1%}" if row['change'] is not None else '-'
+        lines.append(f"{row['size']:>8}  {row['operation']:<24}{before:>11}"
+                     f"{row['current_ms']:>11.3f}{change:>10}  {row['status']}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входу командного рядка"""
+    parser = argparse.ArgumentParser(description='Бенчмарки масштабування на синтетичних даних')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help='Розміри наборів даних (за замовчуванням 1000 10000)')
+    parser.add_argument('--seed', type=int, help='Зерно генератора даних (за замовчуванням 0)')
+    parser.add_argument('--repeats', type=int,
+                        help=f'Кількість запитів для швидких операцій (за замовчуванням {QUERY_REPEATS})')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Не вимірювати пікову пам\'ять (швидше на великих наборах)')
+    parser.add_argument('--json', metavar='ФАЙЛ', help='Зберегти звіт у JSON ("-" - у stdout)')
+    parser.add_argument('--save-baseline', metavar='ФАЙЛ', nargs='?', const=str(BASELINE_FILE),
+                        help='Зберегти звіт як базові значення')
+    parser.add_argument('--compare', metavar='ФАЙЛ', nargs='?', const=str(BASELINE_FILE),
+                        help='Порівняти з базовими значеннями; код виходу 1 при регресії')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Допустиме відносне уповільнення для --compare (за замовчуванням 0.25)')
+    args = parser.parse_args(argv)
+    
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"Не вдалося прочитати базові значення {args.compare}: {e}", file=sys.stderr)
+            return 2
+        # Без явних параметрів повторюємо умови, за яких записано базу
+        if args.sizes is None:
+            args.sizes = sorted({result['size'] for result in baseline['results']})
+        if args.seed is None:
+            args.seed = baseline.get('seed', 0)
+        if args.repeats is None:
+            args.repeats = baseline.get('repeats', QUERY_REPEATS)
+    
+    report = run_benchmarks(args.sizes or list(DEFAULT_SIZES),
+                            args.seed if args.seed is not None else 0,
+                            not args.no_memory,
+                            args.repeats if args.repeats is not None else QUERY_REPEATS)
+    content = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.json == '-':
+        print(content)
+    else:
+        print(format_report(report))
+        if args.json:
+            Path(args.json).write_text(content, encoding='utf-8')
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(content + '\n', encoding='utf-8')
+        print(f"Базові значення збережено у {args.save_baseline}")
+    
+    if baseline is not None:
+        rows, passed = compare_reports(report, baseline, args.threshold)
+        print()
+        print(format_comparison(rows, args.threshold))
+        if not passed:
+            print("\n❌ Виявлено регресію продуктивності")
+            return 1
+        print("\n✅ Регресій не виявлено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
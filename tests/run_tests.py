@@ -11,10 +11,13 @@ sys.path.insert(0, str(dev_path))
 
 # Імпортуємо всі тестові класи
 from test_models import TestFields, TestContact, TestNote
-from test_managers import TestContactManager, TestNoteManager
-from test_utils import TestCommandMatcher, TestValidators
-from test_cli import TestPersonalAssistantCLI, TestCLIIntegration
-from test_storage import TestFileStorage
+from test_managers import (TestContactManager, TestNoteManager, TestDirtyTracking,
+                           TestBatch, TestJournaledPersistence, TestWriteBehind, TestBenchmark)
+from test_utils import (TestCommandMatcher, TestValidators, TestStartupReport, TestMetrics,
+                        TestProfiling)
+from test_cli import TestPersonalAssistantCLI, TestCLIIntegration, TestDaemon, TestBatchMode
+from test_storage import (TestFileStorage, TestFileStorageJournal, TestFileStorageManifest,
+                          TestFileStorageDurability, TestJsonStream, TestSqliteStorage)
 
 
 def create_test_suite():
@@ -29,17 +32,32 @@ def create_test_suite():
     # Додаємо тести для менеджерів
     suite.addTest(unittest.makeSuite(TestContactManager))
     suite.addTest(unittest.makeSuite(TestNoteManager))
+    suite.addTest(unittest.makeSuite(TestDirtyTracking))
+    suite.addTest(unittest.makeSuite(TestBatch))
+    suite.addTest(unittest.makeSuite(TestJournaledPersistence))
+    suite.addTest(unittest.makeSuite(TestWriteBehind))
+    suite.addTest(unittest.makeSuite(TestBenchmark))
     
     # Додаємо тести для утиліт
     suite.addTest(unittest.makeSuite(TestCommandMatcher))
     suite.addTest(unittest.makeSuite(TestValidators))
+    suite.addTest(unittest.makeSuite(TestStartupReport))
+    suite.addTest(unittest.makeSuite(TestMetrics))
+    suite.addTest(unittest.makeSuite(TestProfiling))
     
     # Додаємо тести для CLI
     suite.addTest(unittest.makeSuite(TestPersonalAssistantCLI))
     suite.addTest(unittest.makeSuite(TestCLIIntegration))
+    suite.addTest(unittest.makeSuite(TestDaemon))
+    suite.addTest(unittest.makeSuite(TestBatchMode))
     
     # Додаємо тести для сховища
     suite.addTest(unittest.makeSuite(TestFileStorage))
+    suite.addTest(unittest.makeSuite(TestFileStorageJournal))
+    suite.addTest(unittest.makeSuite(TestFileStorageManifest))
+    suite.addTest(unittest.makeSuite(TestFileStorageDurability))
+    suite.addTest(unittest.makeSuite(TestJsonStream))
+    suite.addTest(unittest.makeSuite(TestSqliteStorage))
     
     return suite
 
@@ -90,10 +108,13 @@ def run_specific_module(module_name, verbosity=2):
     """Запускає тести для конкретного модуля"""
     module_map = {
         'models': [TestFields, TestContact, TestNote],
-        'managers': [TestContactManager, TestNoteManager],
-        'utils': [TestCommandMatcher, TestValidators],
-        'cli': [TestPersonalAssistantCLI, TestCLIIntegration],
-        'storage': [TestFileStorage]
+        'managers': [TestContactManager, TestNoteManager, TestDirtyTracking,
+                     TestBatch, TestJournaledPersistence, TestWriteBehind, TestBenchmark],
+        'utils': [TestCommandMatcher, TestValidators, TestStartupReport, TestMetrics,
+                  TestProfiling],
+        'cli': [TestPersonalAssistantCLI, TestCLIIntegration, TestDaemon, TestBatchMode],
+        'storage': [TestFileStorage, TestFileStorageJournal, TestFileStorageManifest,
+                    TestFileStorageDurability, TestJsonStream, TestSqliteStorage]
     }
     
     if module_name not in module_map:
@@ -128,4 +149,4 @@ if __name__ == "__main__":
     if args.module:
         run_specific_module(args.module, verbosity)
     else:
-        run_all_tests(verbosity)
\ No newline at end of file
+        run_all_tests(verbosity)
\ No newline at end of file
@@ -4,7 +4,12 @@
 import unittest
 import tempfile
 import shutil
+import socket
 import sys
+import threading
+import io
+import os
+import json
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -13,6 +18,12 @@ dev_path = Path(__file__).parent.parent
 sys.path.insert(0, str(dev_path))
 
 from cli.interface import PersonalAssistantCLI
+from cli.daemon import AssistantDaemon, default_socket_path, ping, send_command, stop_daemon
+from cli.batch import BatchProcessor
+from managers.contact_manager import ContactManager
+from managers.note_manager import NoteManager
+from storage.file_storage import FileStorage
+from utils.metrics import metrics
 
 
 class TestPersonalAssistantCLI(unittest.TestCase):
@@ -30,6 +41,36 @@ class TestPersonalAssistantCLI(unittest.TestCase):
         self.assertIsInstance(self.cli.running, bool)
         self.assertTrue(self.cli.running)
     
+    def test_lazy_initialization(self):
+        """Тест відкладеного завантаження даних і розпізнавача команд"""
+        cli = PersonalAssistantCLI()
+        self.assertFalse(cli.contact_manager.loaded)
+        self.assertFalse(cli.note_manager.loaded)
+        self.assertIsNone(cli._command_matcher)
+        
+        self.assertEqual(cli.process_command('help'), cli._get_help_text())
+        self.assertIs(cli.command_matcher, cli.command_matcher)
+    
+    def test_exit_without_changes_writes_nothing(self):
+        """Тест, що вихід без змін не завантажує і не переписує файли"""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        storage = FileStorage(test_dir)
+        storage.save_data('contacts', {})
+        with patch('cli.interface.FileStorage', return_value=storage):
+            cli = PersonalAssistantCLI()
+        before = sorted(path.name for path in Path(test_dir).iterdir())
+        
+        with patch('builtins.input', side_effect=['help', 'exit']), \
+                patch('builtins.print'), \
+                patch.object(storage, 'save_data') as save_data:
+            cli.run()
+        
+        self.assertFalse(cli.contact_manager.loaded)
+        self.assertFalse(cli.note_manager.loaded)
+        save_data.assert_not_called()
+        self.assertEqual(sorted(path.name for path in Path(test_dir).iterdir()), before)
+    
     def test_exit_commands(self):
         """Тест команд виходу"""
         exit_commands = ['exit', 'quit', 'вихід', 'stop']
@@ -50,6 +91,26 @@ class TestPersonalAssistantCLI(unittest.TestCase):
             self.assertIsInstance(result, str)
             self.assertGreater(len(result), 50)  # Довідка має бути детальною
     
+    def test_statistics_command_shows_metrics(self):
+        """Тест команди статистики з метриками часу операцій"""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        cli = PersonalAssistantCLI()
+        cli.storage = FileStorage(test_dir)
+        cli.contact_manager = ContactManager(cli.storage)
+        cli.note_manager = NoteManager(cli.storage)
+        
+        result = cli.process_command('статистика')
+        self.assertIn('Контактів: 0', result)
+        self.assertNotIn('Час операцій', result)
+        
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+        result = cli.process_command('статистика')
+        self.assertIn('Час операцій', result)
+        self.assertIn('contacts.get_statistics', result)
+    
     def test_empty_command(self):
         """Тест порожніх команд"""
         result = self.cli.process_command("")
@@ -205,5 +266,191 @@ class TestCLIIntegration(unittest.TestCase):
         self.assertIsNotNone(show_result)
 
 
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Потрібні Unix-сокети")
+class TestDaemon(unittest.TestCase):
+    """Тести для сервера, що тримає дані завантаженими"""
+    
+    def setUp(self):
+        """Запускаємо сервер у окремому потоці з тимчасовим сховищем"""
+        self.test_dir = tempfile.mkdtemp()
+        self.socket_path = str(Path(self.test_dir) / 'assistant.sock')
+        
+        cli = PersonalAssistantCLI()
+        cli.storage = FileStorage(self.test_dir)
+        cli.contact_manager = ContactManager(cli.storage)
+        cli.note_manager = NoteManager(cli.storage)
+        
+        self.daemon = AssistantDaemon(self.socket_path, cli)
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+        for _ in range(100):
+            if ping(self.socket_path):
+                break
+            self.thread.join(0.02)
+    
+    def tearDown(self):
+        """Зупиняємо сервер і прибираємо тимчасові файли"""
+        stop_daemon(self.socket_path)
+        self.thread.join(5)
+        shutil.rmtree(self.test_dir)
+    
+    def test_commands_share_loaded_state(self):
+        """Тест виконання команд з відповідями на підказки"""
+        result = send_command('додай нотатку', ['Нотатка з сервера', 'сервер'], self.socket_path)
+        self.assertIn('створено', result.lower())
+        
+        prompts = []
+        
+        def ask(prompt):
+            prompts.append(prompt)
+            return 'сервер'
+        
+        result = send_command('пошук нотаток', socket_path=self.socket_path, ask=ask)
+        self.assertEqual(prompts, ["Введіть текст для пошуку: "])
+        self.assertIn('Нотатка з сервера', result)
+        
+        # exit завершує лише сесію клієнта
+        self.assertEqual(send_command('exit', socket_path=self.socket_path), 'goodbye')
+        self.assertTrue(ping(self.socket_path))
+        
+        saved = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual(len(saved), 1)
+    
+    def test_missing_answer(self):
+        """Тест команди, на підказку якої клієнт не відповів"""
+        result = send_command('пошук нотаток', socket_path=self.socket_path)
+        self.assertIn('помилка', result.lower())
+    
+    def test_stop(self):
+        """Тест зупинки сервера"""
+        self.assertTrue(stop_daemon(self.socket_path))
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(Path(self.socket_path).exists())
+        with self.assertRaises(ConnectionError):
+            send_command('help', socket_path=self.socket_path)
+    
+    def test_stalled_client_times_out(self):
+        """Тест, що клієнт, який нічого не надсилає, не блокує інших"""
+        self.daemon.request_timeout = 0.2
+        stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(stalled.close)
+        stalled.connect(self.socket_path)
+        
+        self.assertEqual(send_command('exit', socket_path=self.socket_path), 'goodbye')
+        self.assertIn(b'error', stalled.recv(1024))
+    
+    def test_foreign_socket_rejected(self):
+        """Тест, що клієнт не підключається до сокета іншого користувача"""
+        with patch('cli.daemon.os.getuid', return_value=os.getuid() + 1):
+            with self.assertRaises(PermissionError):
+                send_command('help', socket_path=self.socket_path)
+            self.assertFalse(ping(self.socket_path))
+    
+    def test_default_socket_path(self):
+        """Тест розташування сокета за замовчуванням"""
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.test_dir}):
+            self.assertEqual(default_socket_path(), os.path.join(self.test_dir, 'personal-assistant.sock'))
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': ''}):
+            directory = os.path.dirname(default_socket_path())
+            self.assertEqual(os.path.basename(directory), f"personal-assistant-{os.getuid()}")
+
+
+class TestBatchMode(unittest.TestCase):
+    """Тести для пакетного режиму JSON lines"""
+    
+    def setUp(self):
+        """Створюємо обробник з тимчасовим сховищем"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir)
+        self.processor = BatchProcessor.from_storage(self.storage)
+    
+    def tearDown(self):
+        """Прибираємо тимчасові файли"""
+        shutil.rmtree(self.test_dir)
+    
+    def run_lines(self, lines):
+        """Виконує рядки та повертає розібрані рядки виводу"""
+        output = io.StringIO()
+        self.processor.run(io.StringIO('\n'.join(lines)), output)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+    
+    def test_operations_and_errors(self):
+        """Тест результатів операцій та помилок в окремих рядках"""
+        results = self.run_lines([
+            '{"op": "add_contact", "name": "Іван", "phones": ["0501234567"], "ref": 7}',
+            '{"op": "add_note", "title": "Звіт", "content": "квартальний", "tags": ["робота"]}',
+            '',
+            '{"op": "add_note", "title": "Звіт"}',
+            '{"op": "find_notes_by_tags", "expression": "робота AND NOT архів"}',
+            '{"op": "edit_note", "id": 1, "content": "річний"}',
+            '{"op": "невідома"}',
+            'не json',
+            '{"op": "remove_contact"}',
+        ])
+        
+        self.assertEqual([result.get('line') for result in results[:-1]], [1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(results[0]['ref'], 7)
+        self.assertEqual(results[0]['result']['phones'], ['+380501234567'])
+        self.assertEqual(results[1]['result']['id'], 1)
+        self.assertFalse(results[2]['ok'])
+        self.assertEqual([note['title'] for note in results[3]['result']], ['Звіт'])
+        self.assertEqual(results[4]['result']['content'], 'річний')
+        self.assertEqual([result['ok'] for result in results[5:8]], [False, False, False])
+        self.assertIn('name', results[7]['error'])
+        self.assertEqual(results[-1], {'summary': {'processed': 8, 'failed': 4}})
+    
+    def test_single_final_save(self):
+        """Тест, що дані записуються один раз після всіх операцій"""
+        names = [f'Контакт {first}{second}' for first in 'абвгд' for second in 'абвгдежзик']
+        lines = [json.dumps({'op': 'add_contact', 'name': name}) for name in names]
+        lines.append(json.dumps({'op': 'add_note', 'title': 'Нотатка'}))
+        
+        with patch.object(self.storage, 'save_data', wraps=self.storage.save_data) as save_data:
+            results = list(self.processor.process(lines))
+        
+        self.assertTrue(all(result['ok'] for result in results))
+        self.assertEqual(sorted(call.args[0] for call in save_data.call_args_list),
+                         ['contacts', 'notes'])
+        self.assertEqual(len(ContactManager(FileStorage(self.test_dir))), 50)
+        self.assertEqual(len(NoteManager(FileStorage(self.test_dir))), 1)
+    
+    def test_failed_operation_changes_discarded(self):
+        """Тест, що зміни операції з помилкою не потрапляють у збереження"""
+        with patch.object(NoteManager, 'remove_note_by_id', side_effect=RuntimeError("збій")):
+            results = self.run_lines([
+                '{"op": "add_contact", "name": "Іван", "phones": ["0501234567"]}',
+                '{"op": "update_contact", "name": "Іван", "phones": ["0671234567", "123"]}',
+                '{"op": "add_note", "title": "Звіт"}',
+                '{"op": "remove_note", "id": 1}',
+                '{"op": "add_note", "title": "План"}',
+            ])
+        
+        self.assertEqual([result.get('ok') for result in results[:-1]],
+                         [True, False, True, False, True])
+        self.assertEqual(results[3]['error'], 'збій')
+        contact = ContactManager(FileStorage(self.test_dir)).find_contact("Іван")
+        self.assertEqual([phone.value for phone in contact.phones], ['+380501234567'])
+        notes = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual([note.title for note in notes], ['Звіт', 'План'])
+    
+    def test_edit_note_validates_fields(self):
+        """Тест, що редагування нотатки перевіряє заголовок і теги"""
+        results = self.run_lines([
+            '{"op": "add_note", "title": "Звіт", "tags": ["робота"]}',
+            '{"op": "edit_note", "id": 1, "title": ""}',
+            '{"op": "edit_note", "id": 1, "tags": "Bad Tag!"}',
+            '{"op": "edit_note", "id": 1, "tags": ["план", "Bad Tag!"]}',
+            '{"op": "add_note", "title": "План", "tags": "план"}',
+            '{"op": "edit_note", "id": 1, "title": " Річний звіт ", "tags": ["Звіт"]}',
+        ])
+        
+        self.assertEqual([result.get('ok') for result in results[:-1]],
+                         [True, False, False, False, False, True])
+        self.assertEqual(results[2]['error'], "Параметр 'tags' має бути списком рядків")
+        note = NoteManager(FileStorage(self.test_dir)).get_note_by_id(1)
+        self.assertEqual((note.title, note.tags), ("Річний звіт", ["звіт"]))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
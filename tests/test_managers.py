@@ -5,7 +5,10 @@ import unittest
 import tempfile
 import shutil
 import sys
+import time
 from pathlib import Path
+from datetime import date
+from unittest.mock import patch
 
 # Додаємо dev_implementation до шляху
 dev_path = Path(__file__).parent.parent
@@ -13,9 +16,13 @@ sys.path.insert(0, str(dev_path))
 
 from managers.contact_manager import ContactManager
 from managers.note_manager import NoteManager
+from managers.write_behind import WriteBehind
 from models.contact import Contact
 from models.note import Note
 from storage.file_storage import FileStorage
+from storage.sqlite_storage import SqliteStorage
+from tests.benchmark import (compare_reports, generate_contact_records, generate_note_records,
+                             run_size)
 
 
 class TestContactManager(unittest.TestCase):
@@ -89,6 +96,63 @@ class TestContactManager(unittest.TestCase):
         found = self.manager.find_contact("Іван Петров")
         self.assertIsNone(found)
     
+    def test_search_contacts_index_matches_scan(self):
+        """Тест що пошук через індекс збігається з повним переглядом полів"""
+        data = [
+            ("Іван Петренко", "0501234567", "ivan@example.com", "Київ, вул. Шевченка 1"),
+            ("Петро Іваненко", "0671112233", "petro@test.ua", None),
+            ("Марія Коваленко", "0935556677", None, "Львів, пл. Ринок 10"),
+        ]
+        for name, phone, email, address in data:
+            contact = Contact(name)
+            contact.add_phone(phone)
+            if email:
+                contact.add_email(email)
+            if address:
+                contact.set_address(address)
+            self.manager.add_contact(contact)
+        
+        def scan(query):
+            return [c.name.value for c in self.manager if c.matches_search(query)]
+        
+        for query in ["іван", "ПЕТР", "050", "5556", "example", ".ua", "вул", "ко",
+                      "ринок 10", "+38067", "xyz"]:
+            found = [c.name.value for c in self.manager.search_contacts(query)]
+            self.assertEqual(found, scan(query), query)
+        
+        # Індекс оновлюється після змін
+        self.manager.update_contact("Петро Іваненко", address="Одеса, Дерибасівська 5")
+        self.manager.remove_contact("Іван Петренко")
+        self.assertEqual([c.name.value for c in self.manager.search_contacts("одеса")],
+                         ["Петро Іваненко"])
+        self.assertEqual(self.manager.search_contacts("шевченка"), [])
+    
+    def test_find_contacts_by_phone(self):
+        """Тест пошуку за повним номером, префіксом та останніми цифрами"""
+        for name, phones in [("Іван", ["0501234567", "0671110000"]),
+                             ("Петро", ["+380504444567"]),
+                             ("Марія", ["380931112233"])]:
+            contact = Contact(name)
+            for phone in phones:
+                contact.add_phone(phone)
+            self.manager.add_contact(contact)
+        
+        def names(contacts):
+            return sorted(contact.name.value for contact in contacts)
+        
+        self.assertEqual(names(self.manager.find_contacts_by_phone("050-123-45-67")), ["Іван"])
+        self.assertEqual(names(self.manager.find_contacts_by_phone_prefix("050")),
+                         ["Іван", "Петро"])
+        self.assertEqual(names(self.manager.find_contacts_by_phone_prefix("+38093")), ["Марія"])
+        self.assertEqual(names(self.manager.find_contacts_by_phone_suffix("4567")),
+                         ["Іван", "Петро"])
+        self.assertEqual(self.manager.find_contacts_by_phone_prefix("12"), [])
+        
+        self.manager.update_contact("Петро", phones=["0939990000"])
+        self.assertEqual(names(self.manager.find_contacts_by_phone_suffix("4567")), ["Іван"])
+        self.assertEqual(names(self.manager.find_contacts_by_phone_prefix("093")),
+                         ["Марія", "Петро"])
+    
     def test_get_all_contacts(self):
         """Тест отримання всіх контактів"""
         contact1 = Contact("Іван")
@@ -108,6 +172,90 @@ class TestContactManager(unittest.TestCase):
         
         upcoming = self.manager.get_upcoming_birthdays(365)  # На рік вперед
         self.assertIsInstance(upcoming, list)
+    
+    def test_upcoming_birthdays_across_year_boundary(self):
+        """Тест найближчих днів народження через межу року та 29 лютого"""
+        for name, birthday in [("Новорічний", "02.01.1990"), ("Грудневий", "30.12.1985"),
+                               ("Високосний", "29.02.2000"), ("Березневий", "01.03.1991"),
+                               ("Без дати", None)]:
+            contact = Contact(name)
+            if birthday:
+                contact.set_birthday(birthday)
+            self.manager.add_contact(contact)
+        
+        class FakeDate(date):
+            @classmethod
+            def today(cls):
+                return cls(2023, 12, 29)
+        
+        with patch('managers.contact_manager.date', FakeDate):
+            names = [c.name.value for c in self.manager.get_upcoming_birthdays(7)]
+            self.assertEqual(names, ["Грудневий", "Новорічний"])
+            
+            names = [c.name.value for c in self.manager.get_upcoming_birthdays(365)]
+            self.assertEqual(names, ["Грудневий", "Новорічний", "Високосний", "Березневий"])
+            self.assertEqual(self.manager.get_upcoming_birthdays(-1), [])
+            
+            # Зміна дати оновлює індекс
+            self.manager.update_contact("Березневий", birthday="31.12.1991")
+            names = [c.name.value for c in self.manager.get_upcoming_birthdays(2)]
+            self.assertEqual(names, ["Грудневий", "Березневий"])
+        
+        class LateFebruary(date):
+            @classmethod
+            def today(cls):
+                return cls(2023, 2, 27)
+        
+        # У невисокосний рік 29 лютого святкують 28-го
+        with patch('managers.contact_manager.date', LateFebruary):
+            names = [c.name.value for c in self.manager.get_upcoming_birthdays(1)]
+            self.assertEqual(names, ["Високосний"])
+    
+    def test_get_contacts_by_birthday(self):
+        """Тест пошуку контактів за днем і місяцем народження"""
+        for name, birthday in [("Іван", "15.05.1990"), ("Петро", "15.05.1985"),
+                               ("Марія", "16.05.1990")]:
+            contact = Contact(name)
+            contact.set_birthday(birthday)
+            self.manager.add_contact(contact)
+        
+        self.assertEqual([c.name.value for c in self.manager.get_contacts_by_birthday("15.05")],
+                         ["Іван", "Петро"])
+        self.assertEqual(self.manager.get_contacts_by_birthday("01.01"), [])
+        self.assertEqual(self.manager.get_contacts_by_birthday("не дата"), [])
+        
+        self.manager.remove_contact("Іван")
+        self.assertEqual([c.name.value for c in self.manager.get_contacts_by_birthday("15.05")],
+                         ["Петро"])
+    
+    def test_deferred_loading(self):
+        """Тест завантаження контактів лише при першому зверненні"""
+        self.manager.add_contact(Contact("Іван Петров"))
+        
+        with patch.object(self.storage, 'stream_trusted', wraps=self.storage.stream_trusted) as load_data:
+            manager = ContactManager(self.storage)
+            self.assertFalse(manager.loaded)
+            load_data.assert_not_called()
+            
+            self.assertIsNotNone(manager.find_contact("іван петров"))
+            self.assertTrue(manager.loaded)
+            self.assertEqual(len(manager), 1)
+            load_data.assert_called_once_with('contacts')
+    
+    def test_streamed_load_recovers_from_backup(self):
+        """Тест що файл, пошкоджений посеред потоку, відновлюється з резервної копії"""
+        self.manager.add_contact(Contact("Іван Петров"))
+        self.manager.add_contact(Contact("Петро Іванов"))
+        self.manager.flush()
+        self.manager.save_contacts()  # Попередня версія стає резервною копією
+        
+        contacts_file = self.storage.get_file_path('contacts')
+        content = contacts_file.read_text(encoding='utf-8')
+        contacts_file.write_text(content[:len(content) // 2 + 10], encoding='utf-8')
+        
+        manager = ContactManager(self.storage)
+        self.assertEqual({c.name.value for c in manager.get_all_contacts()},
+                         {"Іван Петров", "Петро Іванов"})
 
 
 class TestNoteManager(unittest.TestCase):
@@ -152,6 +300,46 @@ class TestNoteManager(unittest.TestCase):
         results = self.manager.search_notes("завдання")
         self.assertEqual(len(results), 1)
     
+    def test_search_notes_ranking_and_updates(self):
+        """Тест ранжування результатів пошуку та оновлення індексу"""
+        self.manager.create_note("Список покупок", "Купити м’ята, хліб")
+        self.manager.create_note("Python", "Нотатки про Python та його бібліотеки",
+                                 ["python", "навчання"])
+        self.manager.create_note("Зустріч", "Обговорити Python проєкт")
+        
+        titles = [note.title for _, note in self.manager.search_notes("python")]
+        self.assertEqual(titles, ["Python", "Зустріч"])
+        
+        # Пошук за початком слова та з різними апострофами
+        self.assertEqual([i for i, _ in self.manager.search_notes("бібліот")], [2])
+        self.assertEqual([i for i, _ in self.manager.search_notes("м'ята")], [1])
+        self.assertEqual([i for i, _ in self.manager.search_notes("навчання")], [2])
+        
+        self.manager.edit_note(3, content="Обговорити бюджет")
+        self.assertEqual([i for i, _ in self.manager.search_notes("python")], [2])
+        
+        self.manager.remove_note(1)
+        results = self.manager.search_notes("бюджет")
+        self.assertEqual([(i, note.title) for i, note in results], [(2, "Зустріч")])
+        
+        # Регістрозалежний пошук перевіряє точне входження
+        self.assertEqual(len(self.manager.search_notes("Python", case_sensitive=True)), 1)
+        self.assertEqual(self.manager.search_notes("PYTHON", case_sensitive=True), [])
+    
+    def test_search_notes_substring_fallback(self):
+        """Тест що частина слова знаходиться підрядком, а слова запиту - будь-яке з них"""
+        self.manager.create_note("Зустріч", "Обговорити бюджет", ["проєкт"])
+        self.manager.create_note("Покупки", "Купити хліб")
+        
+        # Індекс слів не знаходить середину слова - працює пошук підрядка
+        self.assertEqual([i for i, _ in self.manager.search_notes("тріч")], [1])
+        self.assertEqual([i for i, _ in self.manager.search_notes("єкт")], [1])
+        self.assertEqual(self.manager.search_notes("ТРІЧ", case_sensitive=True), [])
+        
+        # Запит з кількох слів знаходить нотатки з будь-яким із них
+        self.assertEqual(sorted(i for i, _ in self.manager.search_notes("бюджет хліб")), [1, 2])
+        self.assertEqual(self.manager.search_notes("відпустка"), [])
+    
     def test_find_notes_by_tags(self):
         """Тест пошуку нотаток за тегами"""
         self.manager.create_note("Нотатка 1", "Зміст", ["робота", "важливо"])
@@ -165,6 +353,51 @@ class TestNoteManager(unittest.TestCase):
         results = self.manager.find_notes_by_tags(["робота", "важливо"], match_all=True)
         self.assertEqual(len(results), 1)
     
+    def test_find_notes_by_tag_expression(self):
+        """Тест булевих виразів над тегами та оновлення індексу тегів"""
+        self.manager.create_note("Звіт", "Зміст", ["робота", "важливо"])
+        self.manager.create_note("Відпустка", "Зміст", ["особисте", "важливо"])
+        self.manager.create_note("Старий звіт", "Зміст", ["робота", "архів"])
+        
+        def indexes(results):
+            return [index for index, _ in results]
+        
+        self.assertEqual(indexes(self.manager.find_notes_by_tags(["важливо"], exclude_tags=["робота"])), [2])
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression("робота AND NOT архів")), [1])
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression("(робота | особисте) !важливо")), [3])
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression("НЕ робота АБО архів")), [2, 3])
+        self.assertEqual(self.manager.find_notes_by_tag_expression("невідомий"), [])
+        
+        with self.assertRaises(ValueError):
+            self.manager.find_notes_by_tag_expression("робота AND (важливо")
+        
+        # Біти видалених нотаток звільняються, порядок результатів зберігається
+        removed = []  # Тримаємо нотатки, щоб id() нових не збігались з видаленими
+        for i in range(50):
+            removed.append(self.manager.create_note(f"Тимчасова {i}", "Зміст", ["тимчасове", "робота"]))
+            self.manager.find_notes_by_tag_expression("тимчасове")
+            self.manager.remove_note_by_title(f"тимчасова {i}")
+        self.assertLessEqual(len(self.manager._tag_index._keys), 8)
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression("робота")), [1, 3])
+        self.assertEqual(self.manager.find_notes_by_tag_expression("тимчасове"), [])
+        
+        # Теги, що збігаються з операторами, беруться в лапки
+        self.manager.create_note("Сполучники", "Зміст", ["та", "не"])
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression('"та"')), [4])
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression('"не" та NOT робота')), [4])
+        with self.assertRaises(ValueError):
+            self.manager.find_notes_by_tag_expression("та")
+        
+        # Індекс оновлюється після змін тегів і видалення нотаток
+        self.manager.add_tag_to_note(2, "робота")
+        self.manager.remove_tag_from_note(1, "важливо")
+        self.manager.update_note(3, tags=[])
+        self.assertEqual(indexes(self.manager.find_notes_by_tags(["робота", "важливо"], match_all=True)), [2])
+        self.assertEqual(indexes(self.manager.find_notes_by_tags(["архів"])), [])
+        
+        self.manager.remove_note(1)
+        self.assertEqual(indexes(self.manager.find_notes_by_tag_expression("робота")), [1])
+    
     def test_remove_note(self):
         """Тест видалення нотатки"""
         self.manager.create_note("Нотатка для видалення", "Зміст")
@@ -175,6 +408,89 @@ class TestNoteManager(unittest.TestCase):
         note = self.manager.get_note(1)
         self.assertIsNone(note)
     
+    def test_stable_note_ids(self):
+        """Тест стабільних ID нотаток та пошуку за заголовком"""
+        first = self.manager.create_note("Перша", "Зміст")
+        second = self.manager.create_note("Друга", "Зміст")
+        third = self.manager.create_note("Третя", "Зміст")
+        self.assertEqual([first.id, second.id, third.id], [1, 2, 3])
+        
+        # ID не зсуваються після видалення інших нотаток
+        self.assertTrue(self.manager.remove_note_by_id(first.id))
+        self.assertFalse(self.manager.remove_note_by_id(first.id))
+        self.assertIs(self.manager.get_note_by_id(third.id), third)
+        self.assertEqual(self.manager.get_note_index(third.id), 2)
+        self.assertIsNone(self.manager.get_note_by_id(first.id))
+        
+        self.assertTrue(self.manager.edit_note_by_id(second.id, title="Оновлена"))
+        self.assertIs(self.manager.find_note_by_title("оновлена"), second)
+        self.assertIsNone(self.manager.find_note_by_title("Друга"))
+        self.assertFalse(self.manager.add_note(Note("Оновлена")))
+        self.assertEqual(self.manager.create_note("Четверта").id, 4)
+        
+        # ID зберігаються у файлі
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual(reloaded.get_note_by_id(third.id).title, "Третя")
+        self.assertTrue(reloaded.remove_note_by_title("ОНОВЛЕНА"))
+        self.assertEqual([note.id for note in reloaded], [3, 4])
+    
+    def test_deleted_newest_note_id_not_reused(self):
+        """Тест що ID видаленої найновішої нотатки не видається після перезапуску"""
+        for title in ["Перша", "Друга", "Третя"]:
+            self.manager.create_note(title)
+        self.assertTrue(self.manager.remove_note_by_id(3))
+        
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual(reloaded.create_note("Четверта").id, 4)
+        self.assertTrue(reloaded.remove_note_by_id(4))
+        self.assertTrue(reloaded.remove_note_by_id(2))
+        
+        journaled = NoteManager(FileStorage(self.test_dir, journal=True))
+        self.assertEqual(journaled.create_note("П'ята").id, 5)
+        
+        # Службовий файл межі ID не показується серед файлів даних
+        storage = FileStorage(self.test_dir)
+        self.assertEqual(storage.list_data_files(), ['notes.json'])
+        self.assertIn('.note_ids.json', storage.list_data_files(include_internal=True))
+    
+    def test_note_indexes_after_removals(self):
+        """Тест що індекси нотаток лишаються правильними після видалень і додавань"""
+        with self.manager.batch():
+            for i in range(20):
+                self.manager.create_note(f"Нотатка {i}", tags=["робота"] if i % 2 else None)
+            self.manager.get_note_index(1)
+            for note_id in (5, 1, 20, 12):
+                self.assertTrue(self.manager.remove_note_by_id(note_id))
+            self.manager.create_note("Нова")
+            self.assertTrue(self.manager.remove_note_by_title("нотатка 7"))
+            self.assertTrue(self.manager.remove_note(3))
+        
+        for index, note in enumerate(self.manager, 1):
+            self.assertEqual(self.manager.get_note_index(note.id), index)
+        self.assertEqual(self.manager.find_notes_by_tags(["робота"]),
+                         [(i, note) for i, note in enumerate(self.manager, 1) if note.tags])
+    
+    def test_note_ids_assigned_to_old_format(self):
+        """Тест призначення ID нотаткам, збереженим без них"""
+        self.storage.save_data('notes', [{'title': 'Стара'}, {'title': 'Ще одна', 'id': 7},
+                                         {'title': 'Дубль', 'id': 7}])
+        manager = NoteManager(self.storage)
+        self.assertEqual([note.id for note in manager], [8, 7, 9])
+        self.assertEqual([item.get('id') for item in self.storage.load_data('notes')], [8, 7, 9])
+    
+    def test_deferred_loading(self):
+        """Тест завантаження нотаток лише при першому зверненні"""
+        self.manager.create_note("Перша")
+        
+        with patch.object(self.storage, 'stream_trusted', wraps=self.storage.stream_trusted) as load_data:
+            manager = NoteManager(self.storage)
+            self.assertFalse(manager.loaded)
+            load_data.assert_not_called()
+            
+            self.assertEqual(manager.create_note("Друга").id, 2)
+            self.assertEqual([note.title for note in manager], ["Перша", "Друга"])
+            load_data.assert_called_once_with('notes')
+    
     def test_get_all_notes(self):
         """Тест отримання всіх нотаток"""
         self.manager.create_note("Нотатка 1", "Зміст 1")
@@ -195,5 +511,333 @@ class TestNoteManager(unittest.TestCase):
         self.assertIn("тег3", all_tags)
 
 
+class TestDirtyTracking(unittest.TestCase):
+    """Тести для інкрементального збереження змінених записів"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_contact_update_serializes_only_changed(self):
+        """Тест що оновлення контакту серіалізує лише цей контакт"""
+        manager = ContactManager(self.storage)
+        for name in ["Іван", "Петро", "Марія"]:
+            manager.add_contact(Contact(name))
+        
+        with patch.object(Contact, 'to_dict', autospec=True,
+                          side_effect=Contact.to_dict) as to_dict:
+            manager.update_contact("Петро", address="Львів, вул. Франка 5")
+        
+        self.assertEqual(to_dict.call_count, 1)
+        reloaded = ContactManager(FileStorage(self.test_dir))
+        self.assertEqual(reloaded.find_contact("Петро").address.value, "Львів, вул. Франка 5")
+    
+    def test_note_edit_serializes_only_changed(self):
+        """Тест що редагування нотатки серіалізує лише цю нотатку"""
+        manager = NoteManager(self.storage)
+        for title in ["Перша", "Друга", "Третя"]:
+            manager.create_note(title, "Зміст")
+        
+        with patch.object(Note, 'to_dict', autospec=True,
+                          side_effect=Note.to_dict) as to_dict:
+            manager.add_tag_to_note(3, "важливо")
+        
+        self.assertEqual(to_dict.call_count, 1)
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertIn("важливо", reloaded.get_note(3).tags)
+    
+    def test_mark_dirty_after_direct_change(self):
+        """Тест збереження контакту, зміненого напряму через об'єкт"""
+        manager = ContactManager(self.storage)
+        manager.add_contact(Contact("Іван"))
+        manager.find_contact("Іван").add_phone("0501234567")
+        manager.mark_dirty("Іван")
+        manager.flush()
+        
+        reloaded = ContactManager(FileStorage(self.test_dir))
+        self.assertEqual(reloaded.find_contact("Іван").phones[0].value, "+380501234567")
+
+
+class TestBatch(unittest.TestCase):
+    """Тести для групових змін через batch()"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_contacts_saved_once(self):
+        """Тест що batch() зберігає контакти один раз при виході"""
+        manager = ContactManager(self.storage)
+        
+        with patch.object(self.storage, 'save_data', wraps=self.storage.save_data) as save:
+            with manager.batch():
+                for name in ["Іван", "Петро", "Марія"]:
+                    manager.add_contact(Contact(name))
+                manager.update_contact("Петро", address="Одеса, вул. Дерибасівська 1")
+                manager.remove_contact("Марія")
+        
+        self.assertEqual(save.call_count, 1)
+        reloaded = ContactManager(FileStorage(self.test_dir))
+        self.assertEqual(sorted(c.name.value for c in reloaded), ["Іван", "Петро"])
+    
+    def test_contacts_rollback_on_error(self):
+        """Тест відкату контактів у пам'яті при винятку"""
+        manager = ContactManager(self.storage)
+        contact = Contact("Іван")
+        contact.add_phone("0501234567")
+        manager.add_contact(contact)
+        
+        with self.assertRaises(RuntimeError):
+            with manager.batch():
+                manager.add_contact(Contact("Петро"))
+                manager.update_contact("Іван", phones=["0671234567"])
+                manager.remove_contact("Іван")
+                raise RuntimeError("збій імпорту")
+        
+        self.assertEqual([c.name.value for c in manager], ["Іван"])
+        self.assertEqual(manager.find_contact("Іван").phones[0].value, "+380501234567")
+        self.assertNotIn("Петро", manager)
+    
+    def test_notes_batch_and_rollback(self):
+        """Тест групового збереження та відкату нотаток"""
+        manager = NoteManager(self.storage)
+        
+        with manager.batch():
+            manager.create_note("Перша", "Зміст 1")
+            manager.create_note("Друга", "Зміст 2")
+            manager.add_tag_to_note(1, "робота")
+        
+        with self.assertRaises(ValueError):
+            with manager.batch():
+                manager.remove_note(2)
+                manager.edit_note(1, content="Змінено")
+                manager.add_tag_to_note(1, "невалідний тег!")
+        
+        self.assertEqual([note.title for note in manager], ["Перша", "Друга"])
+        self.assertEqual(manager.get_note(1).content, "Зміст 1")
+        self.assertEqual(manager.get_note(1).tags, ["робота"])
+        
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual([note.title for note in reloaded], ["Перша", "Друга"])
+    
+    def test_savepoint_rolls_back_only_its_changes(self):
+        """Тест що savepoint() відкочує лише власні зміни, а batch() зберігає решту"""
+        storage = FileStorage(self.test_dir, journal=True)
+        contacts = ContactManager(storage)
+        notes = NoteManager(storage)
+        for name in ["Іван", "Петро", "Марія"]:
+            contacts.add_contact(Contact(name))
+        for title in ["Перша", "Друга", "Третя"]:
+            notes.create_note(title)
+        
+        with contacts.batch(), notes.batch():
+            contacts.add_contact(Contact("Олена"))
+            notes.edit_note(3, content="Змінено в пакеті")
+            with self.assertRaises(ValueError):
+                with contacts.savepoint(), notes.savepoint():
+                    contacts.remove_contact("Петро")
+                    contacts.add_contact(Contact("Тарас"))
+                    contacts.update_contact("Іван", phones=["0501234567", "невалідний"])
+                    notes.remove_note(1)
+                    notes.create_note("Четверта")
+                    notes.edit_note(2, content="Змінено в savepoint")
+                    raise ValueError("збій операції")
+            notes.create_note("П'ята")
+        
+        for manager in (contacts, ContactManager(FileStorage(self.test_dir, journal=True))):
+            self.assertEqual([c.name.value for c in manager], ["Іван", "Петро", "Марія", "Олена"])
+            self.assertEqual(manager.find_contact("Іван").phones, [])
+        for manager in (notes, NoteManager(FileStorage(self.test_dir, journal=True))):
+            self.assertEqual([note.title for note in manager],
+                             ["Перша", "Друга", "Третя", "П'ята"])
+            self.assertEqual([note.content for note in manager],
+                             ["", "", "Змінено в пакеті", ""])
+
+
+class TestJournaledPersistence(unittest.TestCase):
+    """Тести для менеджерів поверх журнального сховища"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir, journal=True)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_contacts_roundtrip(self):
+        """Тест відновлення контактів із журналу"""
+        manager = ContactManager(self.storage)
+        for name in ["Іван Петренко", "Марія Коваленко", "Олег Бондар"]:
+            contact = Contact(name)
+            contact.add_phone("0501234567")
+            manager.add_contact(contact)
+        manager.remove_contact("Марія Коваленко")
+        manager.update_contact("Олег Бондар", address="Київ, вул. Хрещатик 1")
+        
+        reloaded = ContactManager(FileStorage(self.test_dir))
+        self.assertEqual(len(reloaded), 2)
+        self.assertNotIn("Марія Коваленко", reloaded)
+        self.assertEqual(reloaded.find_contact("Олег Бондар").address.value,
+                         "Київ, вул. Хрещатик 1")
+    
+    def test_notes_roundtrip(self):
+        """Тест відновлення нотаток із журналу"""
+        manager = NoteManager(self.storage)
+        manager.create_note("Перша", "Зміст 1")
+        manager.create_note("Друга", "Зміст 2")
+        manager.create_note("Третя", "Зміст 3")
+        manager.remove_note(1)
+        manager.add_tag_to_note(2, "важливо")
+        
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual([note.title for note in reloaded], ["Друга", "Третя"])
+        self.assertIn("важливо", reloaded.get_note(2).tags)
+
+    
+    def test_managers_on_sqlite_storage(self):
+        """Тест роботи менеджерів поверх SqliteStorage"""
+        storage = SqliteStorage(self.test_dir)
+        contacts = ContactManager(storage)
+        notes = NoteManager(storage)
+        contacts.add_contact(Contact("Іван Петренко"))
+        contacts.add_contact(Contact("Марія Коваленко"))
+        contacts.remove_contact("Іван Петренко")
+        notes.create_note("Перша", "Зміст 1", ["робота"])
+        notes.create_note("Друга", "Зміст 2")
+        notes.remove_note(1)
+        storage.close()
+        
+        storage = SqliteStorage(self.test_dir)
+        self.assertEqual([c.name.value for c in ContactManager(storage)], ["Марія Коваленко"])
+        self.assertEqual([n.title for n in NoteManager(storage)], ["Друга"])
+        storage.close()
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Тести для фонового відкладеного запису"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir, journal=True)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_changes_coalesced_in_background(self):
+        """Тест що зміни кількох команд записуються у фоні одним викликом"""
+        write_behind = WriteBehind(self.storage, delay=0.3)
+        manager = ContactManager(self.storage, write_behind)
+        
+        with patch.object(self.storage, 'apply_changes', wraps=self.storage.apply_changes) as apply:
+            for name in ["Іван", "Петро", "Марія"]:
+                manager.add_contact(Contact(name))
+            manager.remove_contact("Петро")
+            
+            deadline = time.monotonic() + 10
+            while write_behind.pending and time.monotonic() < deadline:
+                time.sleep(0.05)
+            write_behind.close()
+        
+        self.assertEqual(apply.call_count, 1)
+        self.assertEqual(len(apply.call_args[0][1]), 4)
+        reloaded = ContactManager(FileStorage(self.test_dir))
+        self.assertEqual(sorted(c.name.value for c in reloaded), ["Іван", "Марія"])
+    
+    def test_explicit_flush_and_notes(self):
+        """Тест що flush() записує позиційні зміни нотаток одразу"""
+        write_behind = WriteBehind(self.storage, delay=60)
+        manager = NoteManager(self.storage, write_behind)
+        manager.create_note("Перша", "Зміст 1")
+        manager.create_note("Друга", "Зміст 2")
+        manager.remove_note(1)
+        manager.add_tag_to_note(1, "важливо")
+        self.assertEqual(len(NoteManager(FileStorage(self.test_dir))), 0)
+        
+        self.assertTrue(manager.flush())
+        reloaded = NoteManager(FileStorage(self.test_dir))
+        self.assertEqual([note.title for note in reloaded], ["Друга"])
+        self.assertEqual(reloaded.get_note(1).tags, ["важливо"])
+        write_behind.close()
+    
+    def test_failed_write_is_retried(self):
+        """Тест що невдалий запис лишає зміни в черзі"""
+        write_behind = WriteBehind(self.storage, delay=60)
+        manager = ContactManager(self.storage, write_behind)
+        manager.add_contact(Contact("Іван"))
+        
+        with patch.object(self.storage, 'apply_changes', return_value=False):
+            self.assertFalse(manager.flush())
+        self.assertTrue(write_behind.pending)
+        self.assertIsNotNone(write_behind.last_error)
+        
+        self.assertTrue(write_behind.close())
+        self.assertIn("Іван", ContactManager(FileStorage(self.test_dir)))
+
+
+class TestBenchmark(unittest.TestCase):
+    """Тести для генератора синтетичних даних і бенчмарків"""
+    
+    def test_generated_records_are_valid_and_deterministic(self):
+        """Тест що згенеровані записи проходять валідацію і повторюються"""
+        contacts = generate_contact_records(500, seed=3)
+        notes = generate_note_records(200, seed=3)
+        self.assertEqual(contacts, generate_contact_records(500, seed=3))
+        self.assertNotEqual(contacts, generate_contact_records(500, seed=4))
+        self.assertEqual(len(contacts), 500)
+        
+        for key, record in contacts.items():
+            contact = Contact.from_dict(record)
+            self.assertEqual(contact.to_dict(), record)
+            self.assertEqual(contact.name.value.lower(), key)
+        for record in notes:
+            self.assertEqual(Note.from_dict(record).to_dict(), record)
+    
+    def test_run_size_reports_every_operation(self):
+        """Тест що бенчмарк вимірює всі операції на малому наборі"""
+        results = run_size(50, memory=False, repeats=5)
+        
+        self.assertEqual([result['operation'] for result in results],
+                         ['load_data', 'load_contacts', 'load_notes', 'save_contacts', 'save_notes',
+                          'search_contacts', 'search_notes', 'find_notes_by_tags',
+                          'get_upcoming_birthdays', 'find_best_command'])
+        for result in results:
+            self.assertEqual(result['size'], 50)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertIsNone(result['peak_kb'])
+    
+    def test_compare_reports_flags_regressions(self):
+        """Тест що порівняння з базою зупиняється лише на помітному уповільненні"""
+        def report(**p50):
+            return {'results': [{'size': 1000, 'operation': operation, 'p50_ms': value}
+                                for operation, value in p50.items()]}
+        baseline = report(search_contacts=1.0, save_notes=10.0, find_best_command=0.02)
+        
+        rows, passed = compare_reports(
+            report(search_contacts=1.2, save_notes=9.0, find_best_command=0.06,
+                   load_data=3.0, load_notes=99.0),
+            baseline, threshold=0.25)
+        self.assertTrue(passed)
+        self.assertEqual([row['status'] for row in rows], ['ok', 'ok', 'ok', 'новий'])
+        
+        rows, passed = compare_reports(report(search_contacts=1.3), baseline, threshold=0.25)
+        self.assertFalse(passed)
+        self.assertEqual(rows[0]['status'], 'РЕГРЕСІЯ')
+        self.assertAlmostEqual(rows[0]['change'], 0.3)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
\ No newline at end of file
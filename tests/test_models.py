@@ -3,7 +3,9 @@
 """
 import unittest
 import sys
+from datetime import date
 from pathlib import Path
+from unittest.mock import patch
 
 # Додаємо dev_implementation до шляху
 dev_path = Path(__file__).parent.parent
@@ -110,6 +112,28 @@ class TestContact(unittest.TestCase):
         self.assertIsInstance(days, int)
         self.assertGreaterEqual(days, 0)
     
+    def test_days_to_birthday_memoized_per_day(self):
+        """Тест що дата розбирається один раз, а кеш скидається опівночі та при зміні дати"""
+        contact = Contact("Іван")
+        contact.set_birthday("10.03.1990")
+        self.assertIs(contact.birthday.to_date(), contact.birthday.to_date())
+        
+        with patch.object(Birthday, 'to_date', wraps=contact.birthday.to_date) as to_date:
+            self.assertEqual(contact.days_to_birthday(date(2024, 3, 1)), 9)
+            self.assertEqual(contact.days_to_birthday(date(2024, 3, 1)), 9)
+            self.assertEqual(to_date.call_count, 1)
+            
+            # Наступний день - значення обчислюється заново
+            self.assertEqual(contact.days_to_birthday(date(2024, 3, 2)), 8)
+            self.assertEqual(to_date.call_count, 2)
+        
+        contact.set_birthday("05.03.1990")
+        self.assertEqual(contact.days_to_birthday(date(2024, 3, 2)), 3)
+        contact.birthday.value = "03.03.1990"
+        self.assertEqual(contact.days_to_birthday(date(2024, 3, 2)), 1)
+        contact.remove_birthday()
+        self.assertIsNone(contact.days_to_birthday(date(2024, 3, 2)))
+    
     def test_contact_string_representation(self):
         """Тест строкового представлення контакту"""
         contact = Contact("Іван Петров")
@@ -120,6 +144,29 @@ class TestContact(unittest.TestCase):
         self.assertIn("Іван Петров", contact_str)
         self.assertIn("0501234567", contact_str)
         self.assertIn("ivan@example.com", contact_str)
+    
+    def test_compact_representation(self):
+        """Тест, що контакт і його поля не мають __dict__"""
+        contact = Contact("Іван")
+        contact.add_phone("0501234567")
+        contact.set_birthday("01.01.1990")
+        
+        for obj in (contact, contact.name, contact.phones[0], contact.birthday):
+            self.assertFalse(hasattr(obj, '__dict__'))
+        with self.assertRaises(AttributeError):
+            contact.nickname = "Ваня"
+    
+    def test_from_trusted_dict(self):
+        """Тест відновлення контакту з довірених даних без валідації"""
+        contact = Contact("Іван Петров")
+        contact.add_phone("0501234567")
+        contact.add_email("ivan@example.com")
+        contact.set_birthday("15.05.1990")
+        contact.set_address("м. Київ, вул. Хрещатик, 1")
+        
+        restored = Contact.from_trusted_dict(contact.to_dict())
+        self.assertEqual(restored.to_dict(), contact.to_dict())
+        self.assertEqual(restored.birthday.value, "15.05.1990")
 
 
 class TestNote(unittest.TestCase):
@@ -170,6 +217,23 @@ class TestNote(unittest.TestCase):
         self.assertIn("Тестова нотатка", note_str)
         # Перевіряємо що хоча б один з тегів присутній
         self.assertTrue("тест" in note_str or "важливо" in note_str)
+    
+    def test_compact_representation(self):
+        """Тест, що нотатка не має __dict__, а однакові теги - один рядок"""
+        first = Note.from_dict({'title': 'Перша', 'tags': ['Робота']})
+        second = Note.from_dict({'title': 'Друга', 'tags': [''.join(['робо', 'та'])]})
+        
+        self.assertFalse(hasattr(first, '__dict__'))
+        self.assertIs(first.tags[0], second.tags[0])
+    
+    def test_from_trusted_dict(self):
+        """Тест відновлення нотатки з довірених даних без валідації"""
+        note = Note("Звіт", "Зміст", ["Робота"])
+        note.id = 7
+        
+        restored = Note.from_trusted_dict(note.to_dict())
+        self.assertEqual(restored.to_dict(), note.to_dict())
+        self.assertEqual(restored.created_at, note.created_at)
 
 
 if __name__ == "__main__":
@@ -4,15 +4,20 @@
 import unittest
 import tempfile
 import shutil
+import io
 import json
+import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Додаємо dev_implementation до шляху
 dev_path = Path(__file__).parent.parent
 sys.path.insert(0, str(dev_path))
 
 from storage.file_storage import FileStorage
+from storage.json_stream import iter_json_records
+from storage.sqlite_storage import SqliteStorage
 
 
 class TestFileStorage(unittest.TestCase):
@@ -173,5 +178,330 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(len(loaded_data["items"]), 1000)
 
 
+class TestFileStorageJournal(unittest.TestCase):
+    """Тести для журнального режиму FileStorage"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir, journal=True, compact_threshold=5)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_changes_appended_to_journal(self):
+        """Тест що зміни дописуються в журнал без перезапису знімка"""
+        self.storage.save_data("contacts", {"іван": {"name": "Іван"}})
+        snapshot = (Path(self.test_dir) / "contacts.json").read_text(encoding="utf-8")
+        
+        self.storage.apply_changes("contacts", [("set", "петро", {"name": "Петро"})])
+        self.storage.apply_changes("contacts", [("delete", "іван", None)])
+        
+        self.assertEqual(
+            (Path(self.test_dir) / "contacts.json").read_text(encoding="utf-8"), snapshot
+        )
+        self.assertTrue(self.storage.get_journal_path("contacts").exists())
+        self.assertEqual(self.storage.load_data("contacts"), {"петро": {"name": "Петро"}})
+    
+    def test_list_changes_replay(self):
+        """Тест відтворення позиційних змін для списків"""
+        self.storage.apply_changes("notes", [("set", 0, {"title": "A"})])
+        self.storage.apply_changes("notes", [("set", 1, {"title": "B"})])
+        self.storage.apply_changes("notes", [("delete", 0, None)])
+        
+        self.assertEqual(self.storage.load_data("notes"), [{"title": "B"}])
+    
+    def test_compaction(self):
+        """Тест ущільнення журналу після досягнення порогу"""
+        for i in range(5):
+            self.storage.apply_changes("items", [("set", f"k{i}", i)])
+        
+        self.assertFalse(self.storage.get_journal_path("items").exists())
+        with open(Path(self.test_dir) / "items.json", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), {f"k{i}": i for i in range(5)})
+    
+    def test_torn_journal_tail_ignored(self):
+        """Тест що обірваний останній запис журналу ігнорується"""
+        self.storage.apply_changes("contacts", [("set", "a", 1)])
+        with open(self.storage.get_journal_path("contacts"), "a", encoding="utf-8") as file:
+            file.write('{"op":"set","key":"b"')
+        
+        self.assertEqual(self.storage.load_data("contacts"), {"a": 1})
+    
+    def test_changes_after_torn_tail_survive_reload(self):
+        """Тест що зміни після обірваного запису не дописуються до нього"""
+        self.storage.apply_changes("contacts", [("set", "a", 1)])
+        with open(self.storage.get_journal_path("contacts"), "a", encoding="utf-8") as file:
+            file.write('{"op":"set","key":"b"')
+        
+        storage = FileStorage(self.test_dir, journal=True, compact_threshold=5)
+        self.assertEqual(storage.load_data("contacts"), {"a": 1})
+        storage.apply_changes("contacts", [("set", "c", 3)])
+        storage.apply_changes("contacts", [("set", "d", 4)])
+        
+        reloaded = FileStorage(self.test_dir, journal=True, compact_threshold=5)
+        self.assertEqual(reloaded.load_data("contacts"), {"a": 1, "c": 3, "d": 4})
+
+
+class TestFileStorageManifest(unittest.TestCase):
+    """Тести для маніфесту довірених файлів FileStorage"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir, journal=True, compact_threshold=100)
+        self.storage.register_schema("contacts", 1)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_saved_file_is_trusted(self):
+        """Тест що файл, записаний самим сховищем, довірений до зовнішньої зміни"""
+        self.storage.save_data("contacts", {"іван": {"name": "Іван"}})
+        self.assertEqual(self.storage.load_trusted("contacts"), ({"іван": {"name": "Іван"}}, True))
+        
+        data_file = Path(self.test_dir) / "contacts.json"
+        data_file.write_text('{"іван": {"name": "Іван", "phones": ["123"]}}', encoding="utf-8")
+        data, trusted = FileStorage(self.test_dir).load_trusted("contacts")
+        self.assertFalse(trusted)
+        self.assertEqual(data["іван"]["phones"], ["123"])
+    
+    def test_journal_changes_keep_trust(self):
+        """Тест що дописи журналу зберігають довіру, а його зміна - ні"""
+        self.storage.save_data("contacts", {"іван": {"name": "Іван"}})
+        self.storage.apply_changes("contacts", [("set", "петро", {"name": "Петро"})])
+        self.assertTrue(self.storage.load_trusted("contacts")[1])
+        
+        with open(self.storage.get_journal_path("contacts"), "a", encoding="utf-8") as file:
+            file.write('{"op": "set", "key": "олег", "value": {"name": "Олег"}}\n')
+        data, trusted = self.storage.load_trusted("contacts")
+        self.assertFalse(trusted)
+        self.assertIn("олег", data)
+    
+    def test_schema_version_and_registration(self):
+        """Тест що інша версія схеми або незареєстрований файл не довірені"""
+        self.storage.save_data("contacts", {})
+        self.storage.save_data("notes", [])
+        
+        self.assertFalse(self.storage.load_trusted("notes")[1])
+        newer = FileStorage(self.test_dir)
+        newer.register_schema("contacts", 2)
+        self.assertFalse(newer.load_trusted("contacts")[1])
+
+
+class TestFileStorageDurability(unittest.TestCase):
+    """Тести для атомарного запису та рівнів durability FileStorage"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir, durability='dir')
+        self.path = Path(self.test_dir) / "contacts.json"
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_failed_write_keeps_previous_file(self):
+        """Тест що збій під час запису не пошкоджує основний файл"""
+        self.storage.save_data("contacts", {"a": 1})
+        
+        with patch("storage.file_storage.os.replace", side_effect=OSError("диск заповнено")):
+            self.assertFalse(self.storage.save_data("contacts", {"b": 2}))
+        
+        self.assertEqual(self.storage.load_data("contacts"), {"a": 1})
+        self.assertEqual([p.name for p in Path(self.test_dir).iterdir()], ["contacts.json"])
+    
+    def test_backup_and_recovery(self):
+        """Тест що резервна копія - попередня версія і не перезаписується при відновленні"""
+        self.storage.save_data("contacts", {"a": 1})
+        self.storage.save_data("contacts", {"b": 2})
+        backup_path = self.path.with_suffix(".json.backup")
+        self.assertEqual(json.loads(backup_path.read_text(encoding="utf-8")), {"a": 1})
+        
+        self.path.write_text('{"b": ', encoding="utf-8")
+        self.assertEqual(self.storage.load_data("contacts"), {"a": 1})
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {"a": 1})
+        self.assertEqual(json.loads(backup_path.read_text(encoding="utf-8")), {"a": 1})
+    
+    def test_durability_levels(self):
+        """Тест кількості fsync для кожного рівня durability"""
+        expected = {'none': 0, 'file': 1, 'dir': 2}
+        for durability, count in expected.items():
+            storage = FileStorage(self.test_dir, durability=durability)
+            with patch("storage.file_storage.os.fsync") as fsync:
+                storage.save_data("contacts", {"a": 1})
+            self.assertEqual(fsync.call_count, count, durability)
+        
+        with self.assertRaises(ValueError):
+            FileStorage(self.test_dir, durability='завжди')
+    
+    def test_group_commit(self):
+        """Тест що записи в group_commit синхронізуються один раз при виході"""
+        with patch("storage.file_storage.os.fsync") as fsync:
+            with self.storage.group_commit():
+                for i in range(5):
+                    self.storage.save_data("contacts", {"a": i})
+                    self.storage.save_data("notes", [i])
+                self.assertEqual(fsync.call_count, 0)
+                self.assertEqual(self.storage.load_data("contacts"), {"a": 4})
+            # По одному на кожен файл і один на директорію
+            self.assertEqual(fsync.call_count, 3)
+    
+    def test_group_commit_replaces_files_after_sync(self):
+        """Тест що group_commit підміняє файл лише після fsync нової версії"""
+        self.storage.save_data("contacts", {"a": 0})
+        path = Path(self.test_dir) / "contacts.json"
+        events = []
+        real_fsync, real_replace = os.fsync, os.replace
+        
+        def fsync(fd):
+            events.append('fsync')
+            real_fsync(fd)
+        
+        def replace(source, target):
+            events.append(Path(target).name)
+            real_replace(source, target)
+        
+        with patch("storage.file_storage.os.fsync", side_effect=fsync), \
+                patch("storage.file_storage.os.replace", side_effect=replace):
+            with self.storage.group_commit():
+                self.storage.save_data("contacts", {"a": 1})
+                self.storage.save_data("contacts", {"a": 2})
+                # До кінця групи на диску лишається попередня версія
+                self.assertEqual(json.loads(path.read_text(encoding='utf-8')), {"a": 0})
+                self.assertEqual(self.storage.load_data("contacts"), {"a": 2})
+            self.assertLess(events.index('fsync'), events.index('contacts.json'))
+        
+        self.assertEqual(json.loads(path.read_text(encoding='utf-8')), {"a": 2})
+        self.assertEqual(list(Path(self.test_dir).glob("*.tmp*")), [])
+
+
+class TestJsonStream(unittest.TestCase):
+    """Тести для потокового розбору JSON"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = FileStorage(self.test_dir)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_records_match_json_load(self):
+        """Тест що записи збігаються з json.load при будь-якому розмірі частини"""
+        data = {
+            "іван": {"name": "Іван", "phones": ["0501234567"], "birthday": None},
+            "ключ \"з\" лапками": [1.5e-3, -20, True, {"вкладений": "}]"}],
+            "число": 12345678901234567890,
+        }
+        content = json.dumps(data, ensure_ascii=False, indent=2)
+        for chunk_size in (1, 5, 64):
+            self.assertEqual(list(iter_json_records(io.StringIO(content), chunk_size)),
+                             list(data.items()))
+        self.assertEqual(list(iter_json_records(io.StringIO('[ {"a": 1} , [] ]'), 3)),
+                         [(0, {"a": 1}), (1, [])])
+        self.assertEqual(list(iter_json_records(io.StringIO(' {} '))), [])
+    
+    def test_corrupted_file(self):
+        """Тест що пошкоджений файл повертає записи до місця пошкодження"""
+        records = iter_json_records(io.StringIO('[{"a": 1}, {"b": 2}, {"c"'), 4)
+        self.assertEqual(next(records), (0, {"a": 1}))
+        self.assertEqual(next(records), (1, {"b": 2}))
+        with self.assertRaises(json.JSONDecodeError):
+            next(records)
+        
+        for content in ('', '[1 2]', '{1: 2}', '[1] [2]'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_records(io.StringIO(content)))
+    
+    def test_iter_records(self):
+        """Тест потокового читання файлів сховища, зокрема з журналом"""
+        self.storage.save_data("notes", [{"title": "A"}, {"title": "B"}])
+        self.assertEqual(list(self.storage.iter_records("notes")),
+                         [(0, {"title": "A"}), (1, {"title": "B"})])
+        self.assertEqual(list(self.storage.iter_records("missing")), [])
+        
+        journal = FileStorage(self.test_dir, journal=True)
+        journal.apply_changes("notes", [("delete", 0, None)])
+        self.assertEqual(list(journal.iter_records("notes")), [(0, {"title": "B"})])
+
+
+class TestSqliteStorage(unittest.TestCase):
+    """Тести для SqliteStorage"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = SqliteStorage(self.test_dir)
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        self.storage.close()
+        shutil.rmtree(self.test_dir)
+    
+    def test_save_and_load_data(self):
+        """Тест збереження та завантаження словників, списків і значень"""
+        contacts = {"іван": {"name": "Іван", "phones": ["+380501234567"]}}
+        notes = [{"title": "A", "tags": ["тег"]}, {"title": "B", "tags": []}]
+        
+        self.assertTrue(self.storage.save_data("contacts", contacts))
+        self.assertTrue(self.storage.save_data("notes", notes))
+        self.assertTrue(self.storage.save_data("version", 3))
+        
+        self.assertEqual(self.storage.load_data("contacts"), contacts)
+        self.assertEqual(self.storage.load_data("notes"), notes)
+        self.assertEqual(self.storage.load_data("version"), 3)
+        self.assertEqual(self.storage.load_data("missing"), {})
+    
+    def test_apply_changes(self):
+        """Тест upsert та видалення окремих записів"""
+        self.storage.save_data("contacts", {"a": 1, "b": 2})
+        self.storage.apply_changes("contacts", [("set", "a", 10), ("set", "c", 3),
+                                                ("delete", "b", None)])
+        self.assertEqual(self.storage.load_data("contacts"), {"a": 10, "c": 3})
+        
+        self.storage.apply_changes("notes", [("set", 0, "x"), ("set", 1, "y"),
+                                             ("set", 2, "z"), ("delete", 0, None),
+                                             ("set", 1, "z2")])
+        self.assertEqual(self.storage.load_data("notes"), ["y", "z2"])
+    
+    def test_array_delete_changes_one_row(self):
+        """Тест, що видалення елемента списку не перенумеровує наступні рядки"""
+        self.storage.save_data("notes", list(range(100)))
+        before = self.storage._connection.total_changes
+        self.assertTrue(self.storage.apply_changes("notes", [("delete", 0, None)]))
+        self.assertEqual(self.storage._connection.total_changes - before, 1)
+        
+        self.storage.apply_changes("notes", [("delete", 50, None), ("set", 98, "кінець"),
+                                             ("set", 0, "початок")])
+        expected = ["початок"] + list(range(2, 51)) + list(range(52, 100)) + ["кінець"]
+        self.assertEqual(self.storage.load_data("notes"), expected)
+        
+        # Порядок зберігається після повторного відкриття бази
+        self.storage.close()
+        self.storage = SqliteStorage(self.test_dir)
+        self.storage.apply_changes("notes", [("delete", 1, None)])
+        self.assertEqual(self.storage.load_data("notes"), expected[:1] + expected[2:])
+    
+    def test_storage_info_and_backup(self):
+        """Тест інформації про сховище та резервних копій"""
+        self.storage.save_data("contacts", {"a": 1})
+        info = self.storage.get_storage_info()
+        
+        self.assertEqual(info['files'], ["contacts.json"])
+        self.assertEqual(info['total_records'], 1)
+        self.assertEqual(self.storage.list_data_files(), ["contacts.json"])
+        
+        backup = self.storage.create_backup("contacts")
+        self.assertTrue(Path(backup).exists())
+        self.storage.save_data("contacts", {})
+        self.assertTrue(self.storage.restore_backup("contacts", backup))
+        self.assertEqual(self.storage.load_data("contacts"), {"a": 1})
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
\ No newline at end of file
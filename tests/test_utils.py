@@ -1,19 +1,35 @@
 """
 Тести для утиліт (CommandMatcher, validators)
 """
+import difflib
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import time
 import unittest
 import sys
+from types import SimpleNamespace
+from unittest.mock import patch
 from pathlib import Path
 
 # Додаємо dev_implementation до шляху
 dev_path = Path(__file__).parent.parent
 sys.path.insert(0, str(dev_path))
 
-from utils.command_matcher import CommandMatcher
+from utils.command_matcher import CommandMatcher, DeletionIndex, KeywordAutomaton, required_literal
 from utils.validators import (
     validate_input_not_empty, validate_positive_integer,
-    validate_yes_no, validate_tags_input
+    validate_yes_no, validate_tags_input, normalize_phone_prefix_for_search
 )
+from managers.contact_manager import ContactManager
+from managers.note_manager import NoteManager
+from models.contact import Contact
+from storage.file_storage import FileStorage
+from utils.metrics import Histogram, MetricsRegistry, metrics, timed
+from utils.profiling import SessionProfiler, allocation_report, format_allocation_report
+from utils.startup import format_report, parse_importtime
 
 
 class TestCommandMatcher(unittest.TestCase):
@@ -85,6 +101,91 @@ class TestCommandMatcher(unittest.TestCase):
         examples = self.matcher.get_command_examples("add_contact")
         self.assertIsInstance(examples, list)
         self.assertGreater(len(examples), 0)
+    
+    def test_keyword_automaton(self):
+        """Тест пошуку всіх ключових слів за один прохід"""
+        keywords = ['he', 'she', 'his', 'hers', 'тег', 'теги', 'з тегом']
+        automaton = KeywordAutomaton(keywords)
+        
+        for text in ['ushers', 'нотатки з тегом', 'теги his', 'нічого']:
+            expected = {keyword for keyword in keywords if keyword in text}
+            self.assertEqual(automaton.find_all(text), expected)
+    
+    def test_overlapping_patterns(self):
+        """Тест перекритих збігів шаблонів різних команд"""
+        suggestions = dict(self.matcher.suggest_commands("всі нотатки з тегом робота", 5))
+        self.assertEqual(suggestions['show_notes'], 0.9)
+        self.assertEqual(suggestions['notes_by_tags'], 0.9)
+    
+    def test_rebuild_index_after_new_command(self):
+        """Тест перекомпіляції після додавання власної команди"""
+        self.matcher.command_patterns['backup'] = {
+            'keywords': ['резервна', 'копія', 'backup'],
+            'patterns': [r'резервн\w*\s+копі\w*'],
+        }
+        self.matcher.rebuild_index()
+        
+        self.assertEqual(self.matcher.find_best_command("зроби резервну копію"), ('backup', 0.9))
+    
+    def test_patterns_matching_at_same_position(self):
+        """Тест що збіги шаблонів двох команд з однієї позиції не губляться"""
+        self.matcher.command_patterns['quick_add'] = {
+            'keywords': [],
+            'patterns': [r'дода\w*'],
+        }
+        self.matcher.rebuild_index()
+        
+        suggestions = dict(self.matcher.suggest_commands("додати контакт", 5))
+        self.assertEqual(suggestions['add_contact'], 0.9)
+        self.assertEqual(suggestions['quick_add'], 0.9)
+        self.assertEqual(self.matcher.find_best_command("додати контакт"), ('add_contact', 0.9))
+    
+    def test_suggestions_scored_only_for_candidates(self):
+        """Тест, що нечітка оцінка рахується лише для кандидатів зі словника видалень"""
+        with patch('utils.command_matcher.difflib.SequenceMatcher', wraps=difflib.SequenceMatcher) as scorer:
+            self.assertEqual(self.matcher.suggest_commands("birthdy")[0][0], 'birthdays')
+            self.assertLess(scorer.call_count, len(self.matcher.all_commands))
+            scorer.reset_mock()
+            self.assertEqual(self.matcher.suggest_commands("абсолютно невідома команда"), [])
+            self.assertEqual(scorer.call_count, 0)
+        
+        suggestions = [command for command, _ in self.matcher.suggest_commands("delete_note", 5)]
+        self.assertEqual(suggestions[:2], ['delete_note', 'delete_contact'])
+    
+    def test_required_literal(self):
+        """Тест виділення обов'язкового фрагмента шаблону для попереднього відбору"""
+        self.assertEqual(required_literal(r'показати\s+(?:всі\s+)?контакти'), 'показати')
+        self.assertEqual(required_literal(r'colou?r'), 'colo')
+        self.assertEqual(required_literal(r'x{2}yz'), 'yz')
+        self.assertIsNone(required_literal(r'help|exit'))
+        self.assertIsNone(required_literal(r'\w+'))
+    
+    def test_deletion_index(self):
+        """Тест словника видалень для пошуку слів з помилками"""
+        index = DeletionIndex(max_distance=2)
+        for term in ['додати', 'видалити', 'вихід', 'help']:
+            index.add(term)
+        
+        self.assertEqual(index.lookup('додати'), [('додати', 0)])
+        self.assertEqual(index.lookup('доадти'), [('додати', 1)])  # Перестановка
+        self.assertEqual(index.lookup('вдалити'), [('видалити', 1)])
+        self.assertEqual(index.lookup('hlp'), [('help', 1)])
+        self.assertEqual(index.lookup('абсолютно'), [])
+        self.assertEqual(DeletionIndex.distance('контакт', 'нотатка', 2), 3)
+    
+    def test_typo_correction_with_custom_aliases(self):
+        """Тест виправлення помилок у власних псевдонімах"""
+        command, confidence = self.matcher.find_best_command("допомгоа")
+        self.assertEqual(command, "help")
+        self.assertGreaterEqual(confidence, 0.5)
+        
+        self.matcher.add_alias("Календар", "birthdays")
+        self.assertEqual(self.matcher.find_best_command("календар"), ("birthdays", 1.0))
+        command, _ = self.matcher.find_best_command("калндар")
+        self.assertEqual(command, "birthdays")
+        
+        with self.assertRaises(ValueError):
+            self.matcher.add_alias("щось", "unknown_command")
 
 
 class TestValidators(unittest.TestCase):
@@ -148,6 +249,14 @@ class TestValidators(unittest.TestCase):
         """Тест валідації тегів - валідні дані"""
         result = validate_tags_input("тег1, тег2, тег3")
         self.assertEqual(result, ["тег1", "тег2", "тег3"])
+    
+    def test_normalize_phone_prefix_for_search(self):
+        """Тест нормалізації початку номера телефону"""
+        self.assertEqual(normalize_phone_prefix_for_search("050"), "+38050")
+        self.assertEqual(normalize_phone_prefix_for_search("38067"), "+38067")
+        self.assertEqual(normalize_phone_prefix_for_search("+38093"), "+38093")
+        self.assertEqual(normalize_phone_prefix_for_search("050-123-45-67"), "+380501234567")
+        self.assertEqual(normalize_phone_prefix_for_search("12"), "")
         
         result = validate_tags_input("тег1,тег2,тег3")
         self.assertEqual(result, ["тег1", "тег2", "тег3"])
@@ -169,5 +278,161 @@ class TestValidators(unittest.TestCase):
         self.assertEqual(result, ["тег1", "тег2", "тег3"])
 
 
+class TestStartupReport(unittest.TestCase):
+    """Тести для звіту про час запуску"""
+    
+    def test_parse_importtime(self):
+        """Тест розбору виводу python -X importtime"""
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _typing",
+            "import time:      3400 |       3520 |   typing",
+            "import time:      5000 |       8520 | cli.interface",
+            "не рядок імпорту",
+        ])
+        modules = parse_importtime(output)
+        self.assertEqual([(m['module'], m['depth']) for m in modules],
+                         [('_typing', 2), ('typing', 1), ('cli.interface', 0)])
+        self.assertEqual(modules[2]['self_us'], 5000)
+        self.assertEqual(modules[2]['cumulative_us'], 8520)
+    
+    def test_format_report(self):
+        """Тест форматування звіту"""
+        report = {
+            'phases': [{'phase': 'імпорт', 'ms': 30.0, 'startup': True},
+                       {'phase': 'завантаження', 'ms': 12.5, 'startup': False}],
+            'imports': parse_importtime("import time:      5000 |       8520 | cli.interface"),
+            'import_ms': 5.0,
+            'startup_ms': 30.0,
+        }
+        text = format_report(report)
+        self.assertIn("(відкладено)", text)
+        self.assertIn("30.0 мс  холодний старт", text)
+        self.assertIn("cli.interface", text)
+
+
+class TestMetrics(unittest.TestCase):
+    """Тести для реєстру метрик"""
+    
+    def tearDown(self):
+        """Повертає спільний реєстр у вимкнений стан"""
+        metrics.disable()
+        metrics.reset()
+    
+    def test_histogram_percentiles(self):
+        """Тест перцентилів та підсумку гістограми"""
+        histogram = Histogram(window=100)
+        for value in range(1, 201):
+            histogram.observe(float(value))
+        
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 200)
+        self.assertEqual(summary['min'], 1.0)
+        self.assertEqual(summary['max'], 200.0)
+        # Перцентилі рахуються за останніми 100 значеннями
+        self.assertEqual(summary['p50'], 150.0)
+        self.assertEqual(summary['p99'], 199.0)
+        self.assertEqual(Histogram().summary()['p95'], 0.0)
+    
+    def test_registry_counters_and_dump(self):
+        """Тест лічильників, таймера та JSON-дампу"""
+        registry = MetricsRegistry()
+        with registry.timer('disabled'):
+            pass
+        registry.enable()
+        with registry.timer('block'):
+            pass
+        registry.increment('bytes', 10)
+        registry.increment('bytes', 5)
+        
+        snapshot = json.loads(registry.dump())
+        self.assertEqual(snapshot['counters'], {'bytes': 15})
+        self.assertEqual(list(snapshot['histograms']), ['block'])
+        self.assertIn('block', registry.format_table())
+        
+        registry.reset()
+        self.assertEqual(registry.format_table(), "Метрик ще немає")
+    
+    def test_timed_methods_wrapped_only_when_enabled(self):
+        """Тест що timed() не обгортає метод, поки метрики вимкнені"""
+        class Service:
+            @timed('service.work')
+            def work(self, value):
+                if value < 0:
+                    raise ValueError(value)
+                return value * 2
+        
+        original = Service.__dict__['work']
+        self.assertFalse(hasattr(original, '__wrapped__'))
+        self.assertEqual(Service().work(2), 4)
+        self.assertEqual(metrics.snapshot()['histograms'], {})
+        
+        metrics.enable()
+        self.assertEqual(Service().work(3), 6)
+        with self.assertRaises(ValueError):
+            Service().work(-1)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['histograms']['service.work']['count'], 2)
+        self.assertEqual(snapshot['counters']['service.work.errors'], 1)
+        
+        metrics.disable()
+        self.assertIs(Service.__dict__['work'], original)
+
+
+class TestProfiling(unittest.TestCase):
+    """Тести для профілювання сесії та трасування виділень пам'яті"""
+    
+    def setUp(self):
+        """Налаштування для кожного тесту"""
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Очищення після кожного тесту"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_session_profiler_writes_pstats_and_collapsed_stacks(self):
+        """Тест що профіль читається pstats, а стеки мають формат flamegraph"""
+        def busy_loop():
+            deadline = time.perf_counter() + 0.2
+            while time.perf_counter() < deadline:
+                sum(range(100))
+        
+        profiler = SessionProfiler(os.path.join(self.test_dir, 'session'), interval=0.002)
+        profiler.start()
+        busy_loop()
+        pstats_path, collapsed_path = profiler.stop()
+        
+        functions = {name for _, _, name in pstats.Stats(pstats_path).stats}
+        self.assertIn('busy_loop', functions)
+        self.assertIn('busy_loop', profiler.summary())
+        
+        with open(collapsed_path, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any('busy_loop (test_utils.py:' in line for line in lines))
+    
+    def test_allocation_report_for_loads(self):
+        """Тест звіту про виділення пам'яті при завантаженні даних"""
+        storage = FileStorage(self.test_dir)
+        contacts = ContactManager(storage)
+        for index in range(50):
+            contact = Contact(f"Контакт {'а' * (index + 1)}")
+            contact.add_phone("0501234567")
+            contacts.add_contact(contact)
+        cli = SimpleNamespace(contact_manager=ContactManager(storage),
+                              note_manager=NoteManager(storage))
+        
+        report = allocation_report(cli, limit=3)
+        
+        self.assertEqual([phase['phase'] for phase in report], ['load_contacts', 'load_notes'])
+        self.assertEqual(len(cli.contact_manager), 50)
+        self.assertGreater(report[0]['retained_kb'], 0)
+        self.assertLessEqual(len(report[0]['sites']), 3)
+        self.assertIn("load_contacts: утримано", format_allocation_report(report))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
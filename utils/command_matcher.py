@@ -3,9 +3,263 @@
 """
 
 import difflib
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Pattern, Set, Tuple, Optional
 import re
 
+try:
+    from utils.metrics import timed
+except ImportError:
+    from dev_implementation.utils.metrics import timed
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Повертає найдовший фрагмент тексту, без якого шаблон не може збігтися
+    
+    Розглядаються лише символи поза групами, класами символів та
+    альтернаціями; символ з квантором, що допускає нуль повторень, фрагмент
+    обриває. Розбір консервативний: якщо обов'язковий фрагмент не вдається
+    виділити, повертається None.
+    
+    Args:
+        pattern (str): Регулярний вираз
+        
+    Returns:
+        Optional[str]: Фрагмент у нижньому регістрі або None
+    """
+    runs, run = [], ''
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        literal = None
+        if char == '\\' and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            # \w, \s, \b тощо - класи та межі; решта - екрановані символи
+            literal = None if escaped.isalnum() else escaped
+        elif char == '[':
+            # Клас символів: пропускаємо до закриваючої дужки
+            i += 2 if pattern[i + 1:i + 2] == ']' else 1
+            while i < len(pattern) and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+        elif char == '{':
+            # Межі повторень квантора
+            i = pattern.find('}', i) + 1 or len(pattern)
+        else:
+            i += 1
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == '|':
+                if not depth:
+                    return None  # Альтернація верхнього рівня - фрагмент не обов'язковий
+            elif char not in '.^$*+?}':
+                literal = char
+        
+        if literal is not None and not depth:
+            if pattern[i:i + 1] in ('?', '*', '{'):
+                literal = None  # Символ може бути відсутнім
+            else:
+                run += literal
+                if pattern[i:i + 1] != '+':
+                    continue
+        if run:
+            runs.append(run)
+            run = ''
+    if run:
+        runs.append(run)
+    return max(runs, key=len).lower() if runs else None
+
+
+class KeywordAutomaton:
+    """
+    Автомат Ахо-Корасік для пошуку всіх ключових слів за один прохід тексту
+    
+    Знаходить ті самі входження, що й перевірка `keyword in text` для кожного
+    слова окремо, але час роботи залежить лише від довжини тексту та
+    кількості знайдених слів, а не від розміру словника.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Будує автомат для вказаних ключових слів
+        
+        Args:
+            keywords (Iterable[str]): Ключові слова (вже у нижньому регістрі)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        
+        for keyword in keywords:
+            if keyword:
+                self._insert(keyword)
+        self._link()
+
+    def _insert(self, keyword: str) -> None:
+        """Додає слово до бору"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if keyword not in self._output[state]:
+            self._output[state] += (keyword,)
+
+    def _link(self) -> None:
+        """Обчислює суфіксні посилання обходом бору в ширину"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Повертає множину ключових слів, що входять у текст
+        
+        Args:
+            text (str): Текст для пошуку (вже у нижньому регістрі)
+            
+        Returns:
+            Set[str]: Знайдені ключові слова
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class DeletionIndex:
+    """
+    Словник видалень у стилі SymSpell для пошуку слів з помилками
+    
+    Для кожного слова словника заздалегідь зберігаються всі варіанти з
+    видаленими max_distance символами. Кандидати для запиту - це слова, що
+    мають спільний варіант видалення із запитом, тому пошук не залежить від
+    розміру словника; кандидати перевіряються відстанню Дамерау-Левенштейна.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        """
+        Ініціалізує порожній словник
+        
+        Args:
+            max_distance (int): Максимальна відстань редагування
+        """
+        self.max_distance = max_distance
+        self._deletes: Dict[str, List[str]] = {}
+        self._terms: Dict[str, int] = {}
+        self._max_length = 0
+
+    def _variants(self, word: str) -> Set[str]:
+        """Повертає слово та всі його варіанти з видаленими символами"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+            variants |= frontier
+        return variants
+
+    def add(self, term: str) -> None:
+        """
+        Додає слово до словника
+        
+        Args:
+            term (str): Слово (вже у нижньому регістрі)
+        """
+        if not term or term in self._terms:
+            return
+        
+        self._terms[term] = len(self._terms)
+        self._max_length = max(self._max_length, len(term))
+        for variant in self._variants(term):
+            self._deletes.setdefault(variant, []).append(term)
+
+    @staticmethod
+    def distance(first: str, second: str, limit: int) -> int:
+        """
+        Обчислює відстань Дамерау-Левенштейна (з перестановками сусідніх символів)
+        
+        Args:
+            first (str): Перший рядок
+            second (str): Другий рядок
+            limit (int): Межа, після якої точна відстань не потрібна
+            
+        Returns:
+            int: Відстань або limit + 1, якщо вона більша за межу
+        """
+        if abs(len(first) - len(second)) > limit:
+            return limit + 1
+        
+        previous_row = None
+        row = list(range(len(second) + 1))
+        for i in range(1, len(first) + 1):
+            before_previous, previous_row = previous_row, row
+            row = [i] + [0] * len(second)
+            for j in range(1, len(second) + 1):
+                cost = 0 if first[i - 1] == second[j - 1] else 1
+                row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+                if (i > 1 and j > 1 and first[i - 1] == second[j - 2]
+                        and first[i - 2] == second[j - 1]):
+                    row[j] = min(row[j], before_previous[j - 2] + 1)
+            if min(row) > limit:
+                return limit + 1
+        return min(row[-1], limit + 1)
+
+    def lookup(self, word: str) -> List[Tuple[str, int]]:
+        """
+        Знаходить слова словника в межах максимальної відстані
+        
+        Args:
+            word (str): Слово для пошуку
+            
+        Returns:
+            List[Tuple[str, int]]: Пари (слово, відстань) від найближчих; при
+            однаковій відстані - в порядку додавання
+        """
+        if not word or len(word) > self._max_length + self.max_distance:
+            return []
+        
+        candidates = set()
+        for variant in self._variants(word):
+            candidates.update(self._deletes.get(variant, ()))
+        
+        found = []
+        for term in candidates:
+            term_distance = self.distance(word, term, self.max_distance)
+            if term_distance <= self.max_distance:
+                found.append((term, term_distance))
+        found.sort(key=lambda item: (item[1], self._terms[item[0]]))
+        return found
+
+    def __len__(self) -> int:
+        """Повертає кількість слів у словнику"""
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        """Перевіряє, чи є слово у словнику"""
+        return term in self._terms
+
 
 class CommandMatcher:
     """
@@ -213,7 +467,7 @@ class CommandMatcher:
             'вихід': 'exit',
             'quit': 'exit'
         }
-
+        
         # Автоматично заповнюємо description та examples для всіх команд
         for cmd_name, cmd_config in self.command_patterns.items():
             if 'description' not in cmd_config:
@@ -227,7 +481,178 @@ class CommandMatcher:
             "description": config["description"],
             "examples": config["examples"]
         } for cmd, config in self.command_patterns.items()}
+        
+        self.rebuild_index()
 
+    def rebuild_index(self) -> None:
+        """
+        Компілює шаблони та ключові слова всіх команд для розпізнавання за один прохід
+        
+        Шаблони кожної команди компілюються в один регулярний вираз, а їх
+        обов'язкові фрагменти тексту та ключові слова - в автомати Ахо-Корасік.
+        Викликається при створенні; після зміни command_patterns потрібно
+        викликати повторно.
+        """
+        self._command_order = list(self.command_patterns)
+        
+        # Регулярний вираз команди та фрагмент -> команди, чиї шаблони без
+        # нього не збігаються; команди з шаблоном без такого фрагмента
+        # перевіряються завжди
+        self._command_regexes: List[Optional[Pattern[str]]] = []
+        self._literal_commands: Dict[str, List[int]] = {}
+        self._unfiltered_commands: List[int] = []
+        for position, command in enumerate(self._command_order):
+            patterns = self.command_patterns[command]['patterns']
+            if not patterns:
+                self._command_regexes.append(None)
+                continue
+            self._command_regexes.append(re.compile(
+                '|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE
+            ))
+            literals = [required_literal(pattern) for pattern in patterns]
+            if all(literals):
+                for literal in set(literals):
+                    self._literal_commands.setdefault(literal, []).append(position)
+            else:
+                self._unfiltered_commands.append(position)
+        self._literal_automaton = KeywordAutomaton(self._literal_commands)
+        
+        # Ключове слово -> позиції команд (з повторами, як у списках keywords)
+        self._keyword_commands: Dict[str, List[int]] = {}
+        self._keyword_counts: List[int] = []
+        for position, command in enumerate(self._command_order):
+            keywords = self.command_patterns[command]['keywords']
+            self._keyword_counts.append(len(keywords))
+            for keyword in keywords:
+                self._keyword_commands.setdefault(keyword.lower(), []).append(position)
+        self._keyword_automaton = KeywordAutomaton(self._keyword_commands)
+        
+        # Словники видалень для виправлення помилок у назвах команд і псевдонімах
+        self._command_index = DeletionIndex()
+        for command in self.all_commands:
+            self._command_index.add(command)
+        self._alias_index = DeletionIndex()
+        for alias in self.command_aliases:
+            self._alias_index.add(alias)
+        
+        # Назви команд і їх частини (add, contact) -> позиції команд; з цього
+        # словника suggest_commands бере кандидатів для нечіткої оцінки
+        self._name_commands: Dict[str, List[int]] = {}
+        self._name_index = DeletionIndex()
+        for position, command in enumerate(self._command_order):
+            for name in dict.fromkeys([command] + command.split('_')):
+                self._name_commands.setdefault(name, []).append(position)
+                self._name_index.add(name)
+
+    def add_alias(self, alias: str, command: str) -> None:
+        """
+        Додає псевдонім команди без повної перекомпіляції
+        
+        Args:
+            alias (str): Псевдонім (наприклад, слово з предметної області)
+            command (str): Назва команди
+            
+        Raises:
+            ValueError: Якщо команда невідома або псевдонім порожній
+        """
+        alias = self._normalize_text(alias)
+        if not alias:
+            raise ValueError("Псевдонім не може бути порожнім")
+        if command not in self.command_patterns:
+            raise ValueError(f"Невідома команда: {command}")
+        
+        self.command_aliases[alias] = command
+        self._alias_index.add(alias)
+
+    @staticmethod
+    def _closest(index: DeletionIndex, text: str) -> Tuple[Optional[str], float]:
+        """
+        Знаходить найближче слово словника та оцінку схожості
+        
+        Спершу шукається весь текст; якщо збігу немає, шукаються окремі слова
+        тексту, а їх схожість зменшується на 20%, бо збігається лише частина вводу.
+        
+        Args:
+            index (DeletionIndex): Словник видалень
+            text (str): Нормалізований текст
+            
+        Returns:
+            Tuple[Optional[str], float]: Слово та схожість 1 - відстань / довжина
+            (або None і 0.0, якщо схожість менша за 0.5)
+        """
+        best_term, best_score = None, 0.0
+        words = text.split()
+        queries = [(text, 1.0)] + ([(word, 0.8) for word in words] if len(words) > 1 else [])
+        
+        for query, weight in queries:
+            for term, term_distance in index.lookup(query):
+                score = (1.0 - term_distance / max(len(query), len(term))) * weight
+                if score > best_score:
+                    best_term, best_score = term, score
+            if best_score >= 0.5:
+                break
+        
+        if best_score < 0.5:
+            return None, 0.0
+        return best_term, best_score
+
+    def _match_patterns(self, text: str) -> Set[int]:
+        """
+        Знаходить усі команди, шаблони яких зустрічаються в тексті
+        
+        Автомат за один прохід відбирає команди, обов'язкові фрагменти шаблонів
+        яких є в тексті; регулярні вирази перевіряються лише для них.
+        
+        Args:
+            text (str): Нормалізований текст
+            
+        Returns:
+            Set[int]: Позиції команд у порядку реєстрації
+        """
+        candidates = set(self._unfiltered_commands)
+        for literal in self._literal_automaton.find_all(text.lower()):
+            candidates.update(self._literal_commands[literal])
+        return {position for position in candidates
+                if self._command_regexes[position].search(text)}
+
+    def _fuzzy_candidates(self, text: str) -> Set[int]:
+        """
+        Знаходить команди, назва або частина назви яких близька до тексту
+        
+        Args:
+            text (str): Нормалізований текст
+            
+        Returns:
+            Set[int]: Позиції команд, назва чи частина назви яких у межах
+            відстані редагування словника від тексту (з підкресленнями замість
+            пробілів) або його слів, розділених пробілами чи підкресленнями
+        """
+        candidates: Set[int] = set()
+        for query in {text.replace(' ', '_'), *text.replace('_', ' ').split()}:
+            for name, _ in self._name_index.lookup(query):
+                candidates.update(self._name_commands[name])
+        return candidates
+
+    def _match_keywords(self, text: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Рахує збіги ключових слів для кожної команди
+        
+        Args:
+            text (str): Нормалізований текст
+            
+        Returns:
+            Dict[int, Tuple[int, int]]: Позиція команди -> (кількість збігів, кількість
+            збігів довгих ключових слів)
+        """
+        counts: Dict[int, Tuple[int, int]] = {}
+        for keyword in self._keyword_automaton.find_all(text):
+            important = 1 if len(keyword) >= 4 else 0
+            for position in self._keyword_commands[keyword]:
+                matches, important_matches = counts.get(position, (0, 0))
+                counts[position] = (matches + 1, important_matches + important)
+        return counts
+
+    @timed('commands.find_best_command')
     def find_best_command(self, user_input: str) -> Tuple[Optional[str], float]:
         """
         Знаходить найкращу відповідність команди для введеного тексту
@@ -251,68 +676,47 @@ class CommandMatcher:
         best_command = None
         best_score = 0.0
         
-        # 2. Пошук за регулярними виразами
-        for command, config in self.command_patterns.items():
-            for pattern in config['patterns']:
-                if re.search(pattern, user_input, re.IGNORECASE):
-                    return command, 0.9
+        # 2. Пошук за регулярними виразами (при кількох збігах - команда, зареєстрована раніше)
+        pattern_matches = self._match_patterns(user_input)
+        if pattern_matches:
+            return self._command_order[min(pattern_matches)], 0.9
         
         # 3. Пошук за ключовими словами (покращена логіка)
-        for command, config in self.command_patterns.items():
-            keyword_matches = 0
-            important_keywords = 0
-            
-            for keyword in config['keywords']:
-                if keyword.lower() in user_input:
-                    keyword_matches += 1
-                    # Важливі слова (довші ключові слова отримують більшу вагу)
-                    if len(keyword) >= 4:
-                        important_keywords += 1
+        for position, (keyword_matches, important_keywords) in sorted(self._match_keywords(user_input).items()):
+            # Важливі слова (довші ключові слова) отримують більшу вагу.
+            # Покращена формула: базовий рахунок + бонус за важливі слова
+            base_score = min(0.8, keyword_matches * 0.4)  # До 0.8 за базові збіги
+            importance_bonus = important_keywords * 0.3   # Бонус за важливі слова
+            score = min(1.0, base_score + importance_bonus)
             
-            if keyword_matches > 0:
-                # Покращена формула: базовий рахунок + бонус за важливі слова
-                base_score = min(0.8, keyword_matches * 0.4)  # До 0.8 за базові збіги
-                importance_bonus = important_keywords * 0.3   # Бонус за важливі слова
-                score = min(1.0, base_score + importance_bonus)
-                
-                if score > best_score:
-                    best_score = score
-                    best_command = command
+            if score > best_score:
+                best_score = score
+                best_command = self._command_order[position]
         
         # 4. Нечіткий пошук за назвами команд
         if best_score < 0.5:
-            fuzzy_matches = difflib.get_close_matches(
-                user_input, self.all_commands, n=1, cutoff=0.5
-            )
-            if fuzzy_matches:
-                fuzzy_score = difflib.SequenceMatcher(
-                    None, user_input, fuzzy_matches[0]
-                ).ratio()
-                
-                if fuzzy_score > best_score:
-                    best_score = fuzzy_score
-                    best_command = fuzzy_matches[0]
+            fuzzy_command, fuzzy_score = self._closest(self._command_index, user_input)
+            if fuzzy_score > best_score:
+                best_score = fuzzy_score
+                best_command = fuzzy_command
         
         # 5. Нечіткий пошук за псевдонімами
         if best_score < 0.5:
-            fuzzy_aliases = difflib.get_close_matches(
-                user_input, list(self.command_aliases.keys()), n=1, cutoff=0.5
-            )
-            if fuzzy_aliases:
-                fuzzy_score = difflib.SequenceMatcher(
-                    None, user_input, fuzzy_aliases[0]
-                ).ratio()
-                
-                if fuzzy_score > best_score:
-                    best_score = fuzzy_score
-                    best_command = self.command_aliases[fuzzy_aliases[0]]
+            fuzzy_alias, fuzzy_score = self._closest(self._alias_index, user_input)
+            if fuzzy_score > best_score:
+                best_score = fuzzy_score
+                best_command = self.command_aliases[fuzzy_alias]
         
         return best_command, best_score
 
+    @timed('commands.suggest_commands')
     def suggest_commands(self, user_input: str, max_suggestions: int = 3) -> List[Tuple[str, float]]:
         """
         Пропонує кілька можливих команд для введеного тексту
         
+        Оцінюються лише команди, знайдені шаблонами, ключовими словами або
+        словником видалень за назвою, а не всі зареєстровані команди.
+        
         Args:
             user_input (str): Текст, введений користувачем
             max_suggestions (int): Максимальна кількість пропозицій
@@ -325,22 +729,23 @@ class CommandMatcher:
         
         user_input = user_input.lower().strip()
         suggestions = []
+        pattern_matches = self._match_patterns(user_input)
+        keyword_matches_by_command = self._match_keywords(user_input)
+        candidates = pattern_matches | keyword_matches_by_command.keys() | self._fuzzy_candidates(user_input)
         
-        # Збираємо всі можливі збіги
-        for command, config in self.command_patterns.items():
+        # Оцінюємо кандидатів у порядку реєстрації команд
+        for position in sorted(candidates):
+            command = self._command_order[position]
             score = 0.0
             
             # Перевіряємо регулярні вирази
-            for pattern in config['patterns']:
-                if re.search(pattern, user_input, re.IGNORECASE):
-                    score = max(score, 0.9)
-                    break
+            if position in pattern_matches:
+                score = max(score, 0.9)
             
             # Перевіряємо ключові слова
-            keyword_matches = sum(1 for keyword in config['keywords'] 
-                                if keyword.lower() in user_input)
+            keyword_matches = keyword_matches_by_command.get(position, (0, 0))[0]
             if keyword_matches > 0:
-                keyword_score = keyword_matches / len(config['keywords'])
+                keyword_score = keyword_matches / self._keyword_counts[position]
                 score = max(score, keyword_score * 0.8)
             
             # Нечіткий пошук по назві команди
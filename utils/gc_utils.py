@@ -0,0 +1,28 @@
+"""
+Допоміжні засоби для масового створення об'єктів
+"""
+
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Тимчасово вимикає циклічний збирач сміття
+    
+    Під час завантаження створюються сотні тисяч довгоживучих об'єктів,
+    і збирач раз у раз обходить їх усі, не знаходячи сміття. Лічильники
+    посилань працюють як завжди, тому пам'ять звільняється й у блоці.
+    
+    Yields:
+        None
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
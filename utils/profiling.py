@@ -0,0 +1,193 @@
+"""
+Профілювання сесії та трасування виділень пам'яті при завантаженні даних
+
+SessionProfiler записує профіль cProfile (файл .pstats для pstats, snakeviz
+тощо) і одночасно вибірково знімає стек головного потоку, з якого будується
+файл .collapsed у форматі згорнутих стеків для flamegraph.pl / speedscope.
+Вибірки показують настінний час, тому очікування вводу в інтерактивній сесії
+теж потрапляє у flamegraph.
+"""
+
+import cProfile
+import io
+import linecache
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Інтервал між вибірками стеку в секундах
+DEFAULT_INTERVAL = 0.005
+
+
+def _frame_label(code: Any) -> str:
+    """Підпис кадру для згорнутого стеку: функція (файл:рядок)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SessionProfiler:
+    """
+    Профілювальник сесії: cProfile плюс вибірка стеків для flamegraph
+    
+    Профілюється потік, що викликав start(); вибірки знімає окремий фоновий
+    потік, який сам у профіль не потрапляє.
+    """
+
+    def __init__(self, output: str = 'profile', interval: float = DEFAULT_INTERVAL):
+        """
+        Ініціалізує профілювальник
+        
+        Args:
+            output (str): Префікс вихідних файлів (<output>.pstats, <output>.collapsed)
+            interval (float): Інтервал вибірки стеку в секундах
+        """
+        self.output = output
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._profile = cProfile.Profile()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Починає профілювання поточного потоку"""
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='profiler-sampler', daemon=True)
+        self._thread.start()
+        self._profile.enable()
+
+    def stop(self) -> Tuple[str, str]:
+        """
+        Зупиняє профілювання та записує результати
+        
+        Returns:
+            Tuple[str, str]: Шляхи до файлів .pstats та .collapsed
+            
+        Raises:
+            OSError: Якщо файли не вдалося записати
+        """
+        self._profile.disable()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        
+        pstats_path = f"{self.output}.pstats"
+        collapsed_path = f"{self.output}.collapsed"
+        self._profile.dump_stats(pstats_path)
+        with open(collapsed_path, 'w', encoding='utf-8') as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f"{stack} {count}\n")
+        return pstats_path, collapsed_path
+
+    def summary(self, limit: int = 15) -> str:
+        """
+        Повертає найдорожчі функції за сумарним часом
+        
+        Args:
+            limit (int): Кількість функцій у таблиці
+            
+        Returns:
+            str: Таблиця pstats, відсортована за cumulative
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue().strip()
+
+    def _sample(self) -> None:
+        """Цикл фонового потоку: знімає стек профільованого потоку"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.samples[';'.join(reversed(labels))] += 1
+
+
+def _load_allocations(load: Any, limit: int) -> Dict[str, Any]:
+    """
+    Виконує завантаження під tracemalloc і повертає найбільші місця виділень
+    
+    Args:
+        load (Any): Функція завантаження без аргументів
+        limit (int): Кількість місць у результаті
+        
+    Returns:
+        Dict[str, Any]: Утримана пам'ять ('retained_kb'), пік ('peak_kb') і
+            місця виділень ('sites') з розміром, кількістю та рядком коду
+    """
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, __file__),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(ignored)
+        tracemalloc.reset_peak()
+        load()
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot().filter_traces(ignored)
+    finally:
+        tracemalloc.stop()
+    
+    differences = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff > 0]
+    sites = []
+    for stat in differences[:limit]:
+        frame = stat.traceback[0]
+        sites.append({
+            'file': frame.filename,
+            'line': frame.lineno,
+            'code': linecache.getline(frame.filename, frame.lineno).strip(),
+            'size_kb': stat.size_diff / 1024,
+            'count': stat.count_diff,
+        })
+    return {
+        'retained_kb': sum(stat.size_diff for stat in differences) / 1024,
+        'peak_kb': peak / 1024,
+        'sites': sites,
+    }
+
+
+def allocation_report(cli: Any, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Трасує виділення пам'яті при завантаженні контактів і нотаток
+    
+    Args:
+        cli (Any): PersonalAssistantCLI, чиї менеджери ще не завантажені
+        limit (int): Кількість місць виділень для кожного етапу
+        
+    Returns:
+        List[Dict[str, Any]]: Етапи з назвою ('phase') та результатом трасування
+    """
+    return [
+        dict(phase='load_contacts', **_load_allocations(cli.contact_manager.load_contacts, limit)),
+        dict(phase='load_notes', **_load_allocations(cli.note_manager.load_notes, limit)),
+    ]
+
+
+def format_allocation_report(report: List[Dict[str, Any]]) -> str:
+    """
+    Форматує звіт про виділення пам'яті для виводу в консоль
+    
+    Args:
+        report (List[Dict[str, Any]]): Результат allocation_report()
+        
+    Returns:
+        str: Текст звіту
+    """
+    lines = ["🧠 ВИДІЛЕННЯ ПАМ'ЯТІ ПРИ ЗАВАНТАЖЕННІ"]
+    for phase in report:
+        lines += ["", f"{phase['phase']}: утримано {phase['retained_kb']:.1f} КБ, "
+                      f"пік {phase['peak_kb']:.1f} КБ",
+                  f"  {'КБ':>10} {'блоків':>8} | місце"]
+        for site in phase['sites']:
+            location = f"{os.path.basename(site['file'])}:{site['line']}"
+            lines.append(f"  {site['size_kb']:>10.1f} {site['count']:>8} | {location}  {site['code']}")
+    return '\n'.join(lines)
@@ -0,0 +1,727 @@
+"""
+Модуль з індексами для швидкого пошуку за частковим збігом
+"""
+
+import calendar
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+class TrigramIndex:
+    """
+    Інвертований індекс триграм для пошуку підрядків
+    
+    Кожен документ має ключ і кілька текстових полів. Запит довжиною від трьох
+    символів розбивається на триграми, кандидати отримуються перетином
+    списків документів для кожної триграми, а потім перевіряються звичайним
+    входженням підрядка, тому результат збігається з лінійним пошуком.
+    Результати повертаються в порядку першого додавання документів.
+    """
+    
+    N = 3
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._postings: Dict[str, Set[int]] = {}
+        self._docs: Dict[int, Tuple[Hashable, Tuple[str, ...]]] = {}
+        self._ids: Dict[Hashable, int] = {}
+        self._next_id = 0
+
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        """Повертає множину триграм рядка"""
+        return {text[i:i + cls.N] for i in range(len(text) - cls.N + 1)}
+
+    def add(self, key: Hashable, fields: Iterable[str]) -> None:
+        """
+        Додає документ або оновлює поля вже доданого документа
+        
+        Оновлений документ зберігає свою позицію в порядку результатів.
+        
+        Args:
+            key (Hashable): Ключ документа
+            fields (Iterable[str]): Текстові поля документа (вже у нижньому регістрі)
+        """
+        fields = tuple(field for field in fields if field)
+        
+        doc_id = self._ids.get(key)
+        if doc_id is None:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._ids[key] = doc_id
+        else:
+            self._unlink(doc_id)
+        
+        self._docs[doc_id] = (key, fields)
+        for field in fields:
+            for gram in self._grams(field):
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Видаляє документ з індексу
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        doc_id = self._ids.pop(key, None)
+        if doc_id is not None:
+            self._unlink(doc_id)
+            del self._docs[doc_id]
+
+    def _unlink(self, doc_id: int) -> None:
+        """Прибирає документ зі списків триграм"""
+        _, fields = self._docs[doc_id]
+        for field in fields:
+            for gram in self._grams(field):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[gram]
+
+    def search(self, query: str) -> List[Hashable]:
+        """
+        Знаходить документи, одне з полів яких містить запит
+        
+        Args:
+            query (str): Підрядок для пошуку (вже у нижньому регістрі)
+            
+        Returns:
+            List[Hashable]: Ключі знайдених документів у порядку додавання
+        """
+        if len(query) < self.N:
+            # Короткі запити не мають триграм - перевіряємо всі документи
+            return [key for key, fields in self._docs.values()
+                    if any(query in field for field in fields)]
+        
+        postings = []
+        for gram in self._grams(query):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+        
+        found = []
+        for doc_id in sorted(candidates):
+            key, fields = self._docs[doc_id]
+            if any(query in field for field in fields):
+                found.append(key)
+        return found
+
+    def __len__(self) -> int:
+        """Повертає кількість документів в індексі"""
+        return len(self._docs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Перевіряє, чи є документ з вказаним ключем"""
+        return key in self._ids
+
+
+class PhoneIndex:
+    """
+    Відсортовані масиви телефонних номерів для пошуку за префіксом і закінченням
+    
+    Номери зберігаються у двох відсортованих списках: прямому та з
+    перевернутими рядками. Пошук за префіксом або за останніми цифрами -
+    це бінарний пошук діапазону в одному з них, тобто O(log N + k).
+    """
+    
+    # Символ, більший за будь-яку цифру, для верхньої межі діапазону
+    _UPPER = '\U0010ffff'
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._forward: List[Tuple[str, Hashable]] = []
+        self._backward: List[Tuple[str, Hashable]] = []
+        self._phones: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def add(self, key: Hashable, phones: Iterable[str]) -> None:
+        """
+        Додає номери документа або замінює раніше додані
+        
+        Args:
+            key (Hashable): Ключ документа
+            phones (Iterable[str]): Нормалізовані номери телефонів
+        """
+        self.remove(key)
+        phones = tuple(phone for phone in phones if phone)
+        if not phones:
+            return
+        
+        self._phones[key] = phones
+        for phone in phones:
+            insort(self._forward, (phone, key))
+            insort(self._backward, (phone[::-1], key))
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Видаляє номери документа з індексу
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        for phone in self._phones.pop(key, ()):
+            self._discard(self._forward, (phone, key))
+            self._discard(self._backward, (phone[::-1], key))
+
+    @staticmethod
+    def _discard(entries: List[Tuple[str, Hashable]], entry: Tuple[str, Hashable]) -> None:
+        """Видаляє елемент з відсортованого списку"""
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    @classmethod
+    def _range(cls, entries: List[Tuple[str, Hashable]], prefix: str) -> List[Hashable]:
+        """Повертає ключі для всіх рядків, що починаються з префікса"""
+        start = bisect_left(entries, (prefix,))
+        end = bisect_left(entries, (prefix + cls._UPPER,))
+        return list(dict.fromkeys(key for _, key in entries[start:end]))
+
+    def find_exact(self, phone: str) -> List[Hashable]:
+        """
+        Знаходить документи з точно таким номером
+        
+        Args:
+            phone (str): Нормалізований номер телефону
+            
+        Returns:
+            List[Hashable]: Ключі знайдених документів
+        """
+        start = bisect_left(self._forward, (phone,))
+        found = []
+        while start < len(self._forward) and self._forward[start][0] == phone:
+            found.append(self._forward[start][1])
+            start += 1
+        return found
+
+    def find_prefix(self, prefix: str) -> List[Hashable]:
+        """
+        Знаходить документи з номером, що починається з префікса
+        
+        Args:
+            prefix (str): Початок нормалізованого номера
+            
+        Returns:
+            List[Hashable]: Ключі знайдених документів у порядку номерів
+        """
+        if not prefix:
+            return []
+        return self._range(self._forward, prefix)
+
+    def find_suffix(self, suffix: str) -> List[Hashable]:
+        """
+        Знаходить документи з номером, що закінчується на вказані цифри
+        
+        Args:
+            suffix (str): Останні цифри номера
+            
+        Returns:
+            List[Hashable]: Ключі знайдених документів
+        """
+        if not suffix:
+            return []
+        return self._range(self._backward, suffix[::-1])
+
+    def __len__(self) -> int:
+        """Повертає кількість документів з номерами"""
+        return len(self._phones)
+
+
+class BirthdayIndex:
+    """
+    Відсортований індекс днів народження за (місяць, день)
+    
+    Запит на діапазон дат розбивається щонайбільше на два діапазони
+    всередині календарного року (через межу року), кожен з яких
+    знаходиться бінарним пошуком за O(log N + k). День народження
+    29 лютого в невисокосний рік припадає на 28 лютого.
+    """
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._entries: List[Tuple[int, int, int, Hashable]] = []
+        self._by_key: Dict[Hashable, Tuple[int, int, int, Hashable]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+
+    def add(self, key: Hashable, month: int, day: int) -> None:
+        """
+        Додає або оновлює день народження документа
+        
+        Документи з однаковою датою повертаються в порядку першого додавання.
+        
+        Args:
+            key (Hashable): Ключ документа
+            month (int): Місяць народження
+            day (int): День народження
+        """
+        self.remove(key)
+        
+        order = self._order.get(key)
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+            self._order[key] = order
+        
+        entry = (month, day, order, key)
+        self._by_key[key] = entry
+        insort(self._entries, entry)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Видаляє день народження документа з індексу
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        entry = self._by_key.pop(key, None)
+        if entry is not None:
+            position = bisect_left(self._entries, entry)
+            del self._entries[position]
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Видаляє документ разом з його позицією в порядку додавання
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        self.remove(key)
+        self._order.pop(key, None)
+
+    def _between_days(self, start: Tuple[int, int], end: Tuple[int, int]) -> List[Hashable]:
+        """Повертає ключі з (місяць, день) у межах [start, end] включно"""
+        low = bisect_left(self._entries, start)
+        high = bisect_right(self._entries, (end[0], end[1], float('inf')))
+        return [entry[3] for entry in self._entries[low:high]]
+
+    def on_day(self, month: int, day: int) -> List[Hashable]:
+        """
+        Знаходить документи з точною датою народження (без урахування року)
+        
+        Args:
+            month (int): Місяць
+            day (int): День
+            
+        Returns:
+            List[Hashable]: Ключі документів у порядку додавання
+        """
+        return self._between_days((month, day), (month, day))
+
+    def between(self, start: date, end: date) -> List[Hashable]:
+        """
+        Знаходить документи з днем народження між двома датами включно
+        
+        Args:
+            start (date): Перша дата діапазону
+            end (date): Остання дата діапазону
+            
+        Returns:
+            List[Hashable]: Ключі документів у хронологічному порядку
+        """
+        if end < start:
+            return []
+        if (end - start).days >= 365:
+            # Діапазон охоплює цілий рік - підходять усі дні народження
+            first_day = start.month, start.day
+            head = self._between_days(first_day, (12, 31))
+            tail = [entry[3] for entry in self._entries if (entry[0], entry[1]) < first_day]
+            return head + tail
+        
+        found = []
+        year = start.year
+        segment_start = (start.month, start.day)
+        while True:
+            segment_end = (end.month, end.day) if year == end.year else (12, 31)
+            if segment_end == (2, 28) and not calendar.isleap(year):
+                segment_end = (2, 29)  # 29 лютого святкують 28-го
+            found.extend(self._between_days(segment_start, segment_end))
+            if year == end.year:
+                return found
+            year += 1
+            segment_start = (1, 1)
+
+    def __len__(self) -> int:
+        """Повертає кількість документів в індексі"""
+        return len(self._by_key)
+
+
+class FullTextIndex:
+    """
+    Інвертований індекс слів з ранжуванням результатів за BM25
+    
+    Текст розбивається на слова з урахуванням українського апострофа
+    (м'ята, п’ять) і переводиться в нижній регістр. Кожне поле документа
+    має вагу, на яку множиться частота його слів, тому збіг у заголовку
+    важить більше, ніж у змісті. Слово запиту збігається з усіма словами
+    індексу, що з нього починаються ("нотат" знаходить "нотатки").
+    """
+    
+    K1 = 1.2
+    B = 0.75
+    
+    _WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+    _APOSTROPHES = ('\u2019', '\u02bc', '\u2018', '`')
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._docs: Dict[int, Tuple[Hashable, Dict[str, float], float]] = {}
+        self._ids: Dict[Hashable, int] = {}
+        self._next_id = 0
+        self._total_length = 0.0
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """
+        Розбиває текст на слова в нижньому регістрі
+        
+        Args:
+            text (str): Текст для розбиття
+            
+        Returns:
+            List[str]: Список слів
+        """
+        # str.replace значно швидший за str.translate для не-ASCII тексту
+        for apostrophe in cls._APOSTROPHES:
+            if apostrophe in text:
+                text = text.replace(apostrophe, "'")
+        return cls._WORD.findall(text.lower())
+
+    def add(self, key: Hashable, fields: Iterable[Tuple[str, float]]) -> None:
+        """
+        Додає документ або оновлює поля вже доданого документа
+        
+        Args:
+            key (Hashable): Ключ документа
+            fields (Iterable[Tuple[str, float]]): Пари (текст поля, вага поля)
+        """
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for text, weight in fields:
+            terms = self.tokenize(text)
+            length += weight * len(terms)
+            for term, count in Counter(terms).items():
+                frequencies[term] = frequencies.get(term, 0.0) + weight * count
+        
+        doc_id = self._ids.get(key)
+        if doc_id is None:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._ids[key] = doc_id
+        else:
+            self._unlink(doc_id)
+        
+        self._docs[doc_id] = (key, frequencies, length)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                insort(self._terms, term)
+            posting[doc_id] = frequency
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Видаляє документ з індексу
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        doc_id = self._ids.pop(key, None)
+        if doc_id is not None:
+            self._unlink(doc_id)
+            del self._docs[doc_id]
+
+    def _unlink(self, doc_id: int) -> None:
+        """Прибирає документ зі списків слів"""
+        _, frequencies, length = self._docs[doc_id]
+        self._total_length -= length
+        for term in frequencies:
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def _expand(self, word: str) -> List[str]:
+        """Повертає слова індексу, що починаються з вказаного"""
+        start = bisect_left(self._terms, word)
+        end = bisect_left(self._terms, word + '\U0010ffff')
+        return self._terms[start:end]
+
+    def search(self, query: str) -> List[Tuple[Hashable, float]]:
+        """
+        Знаходить документи, що містять хоча б одне слово запиту
+        
+        Args:
+            query (str): Пошуковий запит
+            
+        Returns:
+            List[Tuple[Hashable, float]]: Пари (ключ, оцінка) від найрелевантніших;
+            документи з однаковою оцінкою йдуть у порядку додавання
+        """
+        if not self._docs:
+            return []
+        
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count or 1.0
+        scores: Dict[int, float] = {}
+        
+        for word in dict.fromkeys(self.tokenize(query)):
+            # Для слова запиту береться найкращий збіг серед його розширень
+            best: Dict[int, float] = {}
+            for term in self._expand(word):
+                posting = self._postings[term]
+                idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, frequency in posting.items():
+                    length = self._docs[doc_id][2]
+                    norm = self.K1 * (1 - self.B + self.B * length / average_length)
+                    score = idf * frequency * (self.K1 + 1) / (frequency + norm)
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self._docs[doc_id][0], score) for doc_id, score in ranked]
+
+    def __len__(self) -> int:
+        """Повертає кількість документів в індексі"""
+        return len(self._docs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Перевіряє, чи є документ з вказаним ключем"""
+        return key in self._ids
+
+
+class TagIndex:
+    """
+    Індекс тег -> документи на цілочисельних бітових множинах
+    
+    Кожен документ отримує номер біта в порядку додавання, а кожен тег -
+    число, в якому встановлені біти його документів. Тому AND, OR та NOT
+    над тегами - це побітові операції над цілими числами, а результати
+    повертаються в порядку додавання документів. Коли звільнених видаленням
+    бітів стає більше половини, біти перенумеровуються підряд, тож маски не
+    ростуть від постійних додавань і видалень.
+    
+    Вирази підтримують оператори AND/OR/NOT (або І/ТА, АБО, НЕ, а також
+    &, |, !), дужки та неявний AND між сусідніми тегами:
+    "робота AND (важливо OR терміново) AND NOT архів". Тег у подвійних
+    лапках ніколи не вважається оператором: "та" OR "не" шукає теги
+    "та" і "не".
+    """
+    
+    _TOKEN = re.compile(r'\s*(\(|\)|&|\||!|"[^"]*"|[^\s()&|!]+)')
+    _OPERATORS = {
+        'and': 'and', 'і': 'and', 'та': 'and', '&': 'and',
+        'or': 'or', 'або': 'or', '|': 'or',
+        'not': 'not', 'не': 'not', '!': 'not',
+    }
+
+    def __init__(self):
+        """Ініціалізує порожній індекс"""
+        self._masks: Dict[str, int] = {}
+        self._tags: Dict[Hashable, Tuple[str, ...]] = {}
+        self._bits: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._free = 0
+        self._all = 0
+
+    def add(self, key: Hashable, tags: Iterable[str]) -> None:
+        """
+        Додає документ або замінює теги вже доданого документа
+        
+        Args:
+            key (Hashable): Ключ документа
+            tags (Iterable[str]): Теги документа (вже у нижньому регістрі)
+        """
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = len(self._keys)
+            self._bits[key] = bit
+            self._keys.append(key)
+            self._all |= 1 << bit
+        else:
+            self._unlink(key, bit)
+        
+        tags = tuple(dict.fromkeys(tags))
+        self._tags[key] = tags
+        for tag in tags:
+            self._masks[tag] = self._masks.get(tag, 0) | (1 << bit)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Видаляє документ з індексу
+        
+        Args:
+            key (Hashable): Ключ документа
+        """
+        bit = self._bits.pop(key, None)
+        if bit is not None:
+            self._unlink(key, bit)
+            del self._tags[key]
+            self._keys[bit] = None
+            self._all &= ~(1 << bit)
+            self._free += 1
+            if self._free * 2 > len(self._keys):
+                self._compact()
+
+    def _compact(self) -> None:
+        """Перенумеровує біти документів підряд, зберігаючи порядок додавання"""
+        self._keys = [key for key in self._keys if key is not None]
+        self._bits = {key: bit for bit, key in enumerate(self._keys)}
+        self._free = 0
+        self._all = (1 << len(self._keys)) - 1
+        
+        # Маска кожного тегу збирається в байтах одним проходом, а не
+        # зсувами великих чисел на кожен документ
+        bits_by_tag: Dict[str, List[int]] = {}
+        for bit, key in enumerate(self._keys):
+            for tag in self._tags[key]:
+                bits_by_tag.setdefault(tag, []).append(bit)
+        self._masks = {}
+        for tag, bits in bits_by_tag.items():
+            buffer = bytearray(bits[-1] // 8 + 1)
+            for bit in bits:
+                buffer[bit >> 3] |= 1 << (bit & 7)
+            self._masks[tag] = int.from_bytes(buffer, 'little')
+
+    def _unlink(self, key: Hashable, bit: int) -> None:
+        """Прибирає біт документа з масок його тегів"""
+        for tag in self._tags[key]:
+            mask = self._masks[tag] & ~(1 << bit)
+            if mask:
+                self._masks[tag] = mask
+            else:
+                del self._masks[tag]
+
+    def _keys_of(self, mask: int) -> List[Hashable]:
+        """Повертає ключі документів, біти яких встановлені в масці"""
+        # Двійковий рядок у зворотному порядку: символ i відповідає біту i
+        bits = bin(mask)[:1:-1]
+        found = []
+        position = bits.find('1')
+        while position != -1:
+            found.append(self._keys[position])
+            position = bits.find('1', position + 1)
+        return found
+
+    def mask(self, tag: str) -> int:
+        """
+        Повертає бітову множину документів з тегом
+        
+        Args:
+            tag (str): Тег (вже у нижньому регістрі)
+            
+        Returns:
+            int: Маска документів
+        """
+        return self._masks.get(tag, 0)
+
+    def find(self, include: Iterable[str], match_all: bool = False,
+             exclude: Iterable[str] = ()) -> List[Hashable]:
+        """
+        Знаходить документи за списками тегів
+        
+        Args:
+            include (Iterable[str]): Теги, які шукаються
+            match_all (bool): Чи повинні бути всі теги (True) або хоча б один (False)
+            exclude (Iterable[str]): Теги, яких у документа не повинно бути
+            
+        Returns:
+            List[Hashable]: Ключі документів у порядку додавання
+        """
+        masks = [self.mask(tag) for tag in include]
+        if not masks:
+            return []
+        
+        result = masks[0]
+        for mask in masks[1:]:
+            result = result & mask if match_all else result | mask
+        for tag in exclude:
+            result &= ~self.mask(tag)
+        return self._keys_of(result)
+
+    def query(self, expression: str) -> List[Hashable]:
+        """
+        Знаходить документи за булевим виразом над тегами
+        
+        Args:
+            expression (str): Вираз, наприклад "робота AND NOT архів"
+            
+        Returns:
+            List[Hashable]: Ключі документів у порядку додавання
+            
+        Raises:
+            ValueError: Якщо вираз порожній або має синтаксичну помилку
+        """
+        tokens = self._TOKEN.findall(expression.lower())
+        if not tokens:
+            raise ValueError("Вираз для пошуку за тегами порожній")
+        
+        mask, position = self._parse_or(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"Неочікуваний елемент у виразі: '{tokens[position]}'")
+        return self._keys_of(mask)
+
+    def _parse_or(self, tokens: List[str], position: int) -> Tuple[int, int]:
+        """Розбирає диз'юнкцію: conj (OR conj)*"""
+        mask, position = self._parse_and(tokens, position)
+        while position < len(tokens) and self._OPERATORS.get(tokens[position]) == 'or':
+            right, position = self._parse_and(tokens, position + 1)
+            mask |= right
+        return mask, position
+
+    def _parse_and(self, tokens: List[str], position: int) -> Tuple[int, int]:
+        """Розбирає кон'юнкцію: unary ([AND] unary)*"""
+        mask, position = self._parse_not(tokens, position)
+        while position < len(tokens):
+            operator = self._OPERATORS.get(tokens[position])
+            if operator == 'and':
+                position += 1
+            elif operator == 'or' or tokens[position] == ')':
+                break
+            right, position = self._parse_not(tokens, position)
+            mask &= right
+        return mask, position
+
+    def _parse_not(self, tokens: List[str], position: int) -> Tuple[int, int]:
+        """Розбирає заперечення, дужки та окремі теги"""
+        if position >= len(tokens):
+            raise ValueError("Вираз для пошуку за тегами обривається")
+        
+        token = tokens[position]
+        operator = self._OPERATORS.get(token)
+        if operator == 'not':
+            mask, position = self._parse_not(tokens, position + 1)
+            return self._all & ~mask, position
+        if token == '(':
+            mask, position = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise ValueError("Не вистачає закривної дужки у виразі")
+            return mask, position + 1
+        if token == ')' or operator is not None:
+            raise ValueError(f"Неочікуваний елемент у виразі: '{token}'")
+        if len(token) > 1 and token[0] == token[-1] == '"':
+            token = token[1:-1]
+        return self.mask(token), position + 1
+
+    def __len__(self) -> int:
+        """Повертає кількість документів в індексі"""
+        return len(self._bits)
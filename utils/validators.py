@@ -222,6 +222,33 @@ def normalize_phone_for_search(phone: str) -> str:
     return phone
 
 
+def normalize_phone_prefix_for_search(prefix: str) -> str:
+    """
+    Нормалізує початок номера телефону до формату +380...
+    
+    Args:
+        prefix (str): Початок номера (наприклад, "050", "38067" або "+38093")
+        
+    Returns:
+        str: Нормалізований префікс або порожній рядок, якщо це не початок номера
+    """
+    cleaned = re.sub(r'[^\d+]', '', prefix)
+    
+    # Повний номер нормалізуємо так само, як і для звичайного пошуку
+    if len(cleaned) >= 10:
+        return normalize_phone_for_search(cleaned)
+    
+    if cleaned.startswith('+'):
+        return cleaned
+    if cleaned.startswith('380'):
+        return '+' + cleaned
+    if cleaned.startswith('0'):
+        return '+38' + cleaned
+    if cleaned and '+380'.startswith('+' + cleaned):
+        return '+' + cleaned  # "3" або "38" - початок коду країни
+    return ''
+
+
 def highlight_search_term(text: str, search_term: str, 
                          start_marker: str = "[", end_marker: str = "]") -> str:
     """